@@ -0,0 +1 @@
+"""Data Visualization Gallery 앱에서 쓰는 렌더링/데이터 보조 모듈."""
@@ -0,0 +1,296 @@
+"""대용량 데이터용 서버 측 집계 엔진.
+
+행이 수백만 개인 데이터를 plotnine / seaborn / plotly 에 그대로 넘기면 렌더링 비용이
+행 수에 비례해 커집니다. 여기의 함수들은 NumPy 벡터 연산으로 히스토그램 구간 집계,
+KDE 격자 계산, 박스/바이올린용 분위수, 화면 픽셀 격자 기준 산점도 솎아내기를 미리
+수행해, 플로팅 라이브러리에는 화면 크기에 비례하는 작은 표만 넘깁니다.
+
+행 수가 ``LARGE_ROWS`` 이하이면 차트는 기존처럼 원본 데이터를 그대로 사용합니다.
+"""
+
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+from .metrics import data_phase
+
+# 이 행 수를 넘으면 대용량 모드로 렌더링
+LARGE_ROWS = int(os.environ.get("GALLERY_LARGE_ROWS", 100_000))
+
+# 산점도 솎아내기 격자 (그룹마다 격자 칸 하나에 점 하나)
+SCATTER_GRID = (200, 150)
+
+
+def is_large(df):
+    return len(df) > LARGE_ROWS
+
+
+def _values(df, column):
+    return df[column].to_numpy(dtype=float)
+
+
+def _group_codes(df, group):
+    """그룹 열을 0..G-1 정수 코드와 (정렬된) 레이블로 변환. 결측 그룹은 -1."""
+    if group is None:
+        return np.zeros(len(df), dtype=np.intp), [None]
+    codes, labels = pd.factorize(df[group], sort=True)
+    return codes.astype(np.intp), list(labels)
+
+
+def _finite(values, codes):
+    keep = np.isfinite(values) & (codes >= 0)
+    return values[keep], codes[keep]
+
+
+def _with_group(frame, group, labels, codes):
+    if group is not None:
+        frame.insert(0, group, np.asarray(labels, dtype=object)[codes])
+    return frame
+
+
+def histogram_edges(values, bins):
+    """plotnine ``geom_histogram(bins=...)`` 과 같은 구간 경계 (양 끝 구간이 최솟값/최댓값 중심)."""
+    lo, hi = float(values.min()), float(values.max())
+    if hi == lo:
+        return np.array([lo - 0.5, hi + 0.5])
+    width = (hi - lo) / (bins - 1)
+    return lo - width / 2 + width * np.arange(bins + 1)
+
+
+@data_phase
+def histogram(df, x, *, group=None, bins=30):
+    """구간별 개수. 모든 그룹이 같은 구간 경계를 공유합니다.
+
+    반환 열: [group], xmin, xmax, x (구간 중심), count
+    """
+    codes, labels = _group_codes(df, group)
+    values, codes = _finite(_values(df, x), codes)
+    edges = histogram_edges(values, bins)
+    nbins = len(edges) - 1
+    idx = np.clip(np.searchsorted(edges, values, side="right") - 1, 0, nbins - 1)
+    counts = np.bincount(codes * nbins + idx, minlength=len(labels) * nbins)
+    group_idx = np.repeat(np.arange(len(labels)), nbins)
+    out = pd.DataFrame({
+        "xmin": np.tile(edges[:-1], len(labels)),
+        "xmax": np.tile(edges[1:], len(labels)),
+        "x": np.tile((edges[:-1] + edges[1:]) / 2, len(labels)),
+        "count": counts,
+    })
+    return _with_group(out, group, labels, group_idx)
+
+
+def bandwidth_nrd0(values):
+    """R 의 ``bw.nrd0`` (plotnine / ggplot2 의 기본 대역폭)."""
+    if len(values) < 2:
+        return 1.0
+    sd = values.std(ddof=1)
+    q75, q25 = np.percentile(values, [75, 25])
+    lo = min(sd, (q75 - q25) / 1.34)
+    if not lo > 0:
+        lo = sd or abs(values[0]) or 1.0
+    return 0.9 * lo * len(values) ** -0.2
+
+
+def bandwidth_scott(values):
+    """scipy ``gaussian_kde`` 의 Scott 대역폭 (seaborn ``kdeplot`` 의 기본값)."""
+    if len(values) < 2:
+        return 1.0
+    return (values.std(ddof=1) or 1.0) * len(values) ** -0.2
+
+
+BANDWIDTHS = {"nrd0": bandwidth_nrd0, "scott": bandwidth_scott}
+# 밀도 곡선의 격자 점 수 (plotnine stat_density / stat_ydensity 의 기본 n)
+KDE_POINTS = 1024
+
+
+def _binned_kde(values, codes, n_groups, lo, hi, bw, n):
+    """그룹별 가우시안 KDE 를 격자 위에서 한 번에 계산 (선형 구간 집계 + FFT 합성곱).
+
+    lo, hi, bw 는 그룹별 배열. 반환: (격자 [G, n], 밀도 [G, n], 그룹별 개수 [G])
+    """
+    delta = (hi - lo) / (n - 1)
+    delta[delta <= 0] = 1.0
+    # 선형 구간 집계: 각 점을 양 옆 격자점에 거리 비례로 나눔
+    pos = (values - lo[codes]) / delta[codes]
+    left = np.clip(np.floor(pos).astype(np.intp), 0, n - 2)
+    frac = np.clip(pos - left, 0.0, 1.0)
+    flat = codes * n + left
+    size = n_groups * n
+    weights = np.bincount(flat, weights=1 - frac, minlength=size)
+    weights += np.bincount(flat + 1, weights=frac, minlength=size)
+    weights = weights.reshape(n_groups, n)
+    counts = np.bincount(codes, minlength=n_groups).astype(float)
+
+    # 격자 단위 커널 (그룹마다 대역폭이 다름). 4 sigma 까지만 사용
+    half = int(min(n - 1, math.ceil(4 * np.max(bw / delta))))
+    offsets = np.arange(-half, half + 1)
+    scale = (bw / delta)[:, None]
+    kernel = np.exp(-0.5 * (offsets[None, :] / scale) ** 2) / (np.sqrt(2 * np.pi) * bw[:, None])
+
+    size = 1 << int(math.ceil(math.log2(n + 2 * half + 1)))
+    conv = np.fft.irfft(np.fft.rfft(weights, size) * np.fft.rfft(kernel, size), size)
+    density = conv[:, half:half + n]
+    np.maximum(density, 0, out=density)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        density /= counts[:, None]
+    density[counts == 0] = 0.0
+    grid = lo[:, None] + delta[:, None] * np.arange(n)[None, :]
+    return grid, density, counts
+
+
+@data_phase
+def kde(df, x, *, group=None, n=KDE_POINTS, bw=None, adjust=1.0, trim=False, cut=0.0, common_grid=True,
+        common_norm=False):
+    """그룹별 가우시안 밀도 곡선 (모든 그룹을 구간 집계 + FFT 한 번으로).
+
+    ``trim=False`` 이면 모든 그룹이 전체 범위의 같은 격자를 쓰고 (geom_density),
+    ``True`` 면 그룹마다 자기 범위 안에서만 계산합니다 (geom_violin).
+    ``common_grid=False`` 는 그룹마다 자기 범위를 ``cut`` x 대역폭만큼 넓힌 격자 (seaborn ``kdeplot``).
+    대역폭은 ``bw`` 가 숫자면 그대로, ``"nrd0"`` (기본, plotnine) / ``"scott"`` (seaborn) 이면 그룹별로 계산한 뒤
+    ``adjust`` 를 곱합니다. ``common_norm=True`` 이면 그룹 밀도의 합이 1 이 되도록 그룹 비율을 곱합니다.
+
+    반환 열: [group], x, density, scaled (그룹 최댓값 대비), n
+    """
+    codes, labels = _group_codes(df, group)
+    values, codes = _finite(_values(df, x), codes)
+    n_groups = len(labels)
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(n_groups + 1))
+    per_group = [values[order[bounds[g]:bounds[g + 1]]] for g in range(n_groups)]
+    if bw is None or isinstance(bw, str):
+        estimate = BANDWIDTHS[bw or "nrd0"]
+        bws = np.array([estimate(v) for v in per_group]) * adjust
+    else:
+        bws = np.full(n_groups, float(bw) * adjust)
+    if trim or not common_grid:
+        lo = np.array([v.min() if len(v) else 0.0 for v in per_group])
+        hi = np.array([v.max() if len(v) else 0.0 for v in per_group])
+    else:
+        lo = np.full(n_groups, values.min())
+        hi = np.full(n_groups, values.max())
+    if cut and not trim:
+        lo = lo - cut * (bws if not common_grid else bws.max())
+        hi = hi + cut * (bws if not common_grid else bws.max())
+    grid, density, counts = _binned_kde(values, codes, n_groups, lo, hi, bws, n)
+    if common_norm and len(values):
+        density *= (counts / len(values))[:, None]
+    peak = density.max(axis=1, keepdims=True)
+    peak[peak == 0] = 1.0
+    out = pd.DataFrame({
+        "x": grid.ravel(),
+        "density": density.ravel(),
+        "scaled": (density / peak).ravel(),
+        "n": np.repeat(counts, n),
+    })
+    return _with_group(out, group, labels, np.repeat(np.arange(n_groups), n))
+
+
+@data_phase
+def violin(df, y, *, group, n=KDE_POINTS, width=0.9):
+    """``geom_violin(stat='identity')`` 용 표 (scale='area', trim=True 와 같은 방식).
+
+    반환 열: group, y, density, violinwidth, width
+    """
+    out = kde(df, y, group=group, n=n, trim=True).rename(columns={"x": "y"})
+    peak = out["density"].max()
+    out["violinwidth"] = out["density"] / (peak if peak > 0 else 1.0)
+    out["width"] = width
+    return out
+
+
+@data_phase
+def box_stats(df, y, *, group):
+    """``geom_boxplot(stat='identity')`` 용 사분위수와 1.5 IQR 수염. 이상치 점은 제외.
+
+    반환 열: group, ymin, lower, middle, upper, ymax, n
+    """
+    codes, labels = _group_codes(df, group)
+    values, codes = _finite(_values(df, y), codes)
+    order = np.lexsort((values, codes))
+    values, codes = values[order], codes[order]
+    bounds = np.searchsorted(codes, np.arange(len(labels) + 1))
+    rows = []
+    for g, label in enumerate(labels):
+        v = values[bounds[g]:bounds[g + 1]]
+        if len(v) == 0:
+            continue
+        lower, middle, upper = np.quantile(v, [0.25, 0.5, 0.75])
+        iqr = upper - lower
+        # 정렬되어 있으므로 수염 끝은 이진 탐색으로
+        ymin = v[np.searchsorted(v, lower - 1.5 * iqr, side="left")]
+        ymax = v[np.searchsorted(v, upper + 1.5 * iqr, side="right") - 1]
+        rows.append((label, ymin, lower, middle, upper, ymax, len(v)))
+    return pd.DataFrame(rows, columns=[group, "ymin", "lower", "middle", "upper", "ymax", "n"])
+
+
+@data_phase
+def thin_scatter(df, x, y, *, group=None, grid=SCATTER_GRID):
+    """화면 격자 칸(그룹별)마다 첫 번째 행 하나만 남긴 부분 DataFrame.
+
+    남는 점의 수는 행 수가 아니라 격자 칸 수에 비례하고, 빈 칸이 생기지 않으므로
+    분포의 모양과 외곽의 점은 그대로 보입니다. 원본의 모든 열을 유지합니다.
+    ``x=None`` 이면 y 축으로만 나눕니다 (박스플롯 위 jitter 점 등).
+    """
+    codes, labels = _group_codes(df, group)
+    ys = _values(df, y)
+    xs = np.zeros_like(ys) if x is None else _values(df, x)
+    keep = np.isfinite(xs) & np.isfinite(ys) & (codes >= 0)
+    rows = np.flatnonzero(keep)
+    xs, ys, codes = xs[keep], ys[keep], codes[keep]
+    if len(rows) == 0:
+        return df.iloc[rows]
+    gw, gh = (1, grid[1]) if x is None else grid
+    cx = _cell(xs, gw)
+    cy = _cell(ys, gh)
+    cells = (codes.astype(np.int64) * gh + cy) * gw + cx
+    _, first = np.unique(cells, return_index=True)
+    return df.iloc[rows[np.sort(first)]]
+
+
+def _cell(values, cells):
+    lo, hi = values.min(), values.max()
+    span = hi - lo if hi > lo else 1.0
+    return np.minimum(((values - lo) / span * cells).astype(np.int64), cells - 1)
+
+
+@data_phase
+def linear_fit(df, x, y, *, group=None, n=80, level=0.95):
+    """그룹별 최소제곱 직선과 평균 예측의 신뢰구간 (``geom_smooth(method='lm', se=True)``).
+
+    합계만 구하면 되므로 전체 데이터에 대해 O(행 수) 한 번으로 끝납니다.
+    반환 열: [group], x, y, ymin, ymax
+    """
+    from scipy import stats
+
+    codes, labels = _group_codes(df, group)
+    xs, ys = _values(df, x), _values(df, y)
+    keep = np.isfinite(xs) & np.isfinite(ys) & (codes >= 0)
+    xs, ys, codes = xs[keep], ys[keep], codes[keep]
+    n_groups = len(labels)
+    count = np.bincount(codes, minlength=n_groups).astype(float)
+    mean_x = np.bincount(codes, weights=xs, minlength=n_groups) / count
+    mean_y = np.bincount(codes, weights=ys, minlength=n_groups) / count
+    dx = xs - mean_x[codes]
+    dy = ys - mean_y[codes]
+    sxx = np.bincount(codes, weights=dx * dx, minlength=n_groups)
+    sxy = np.bincount(codes, weights=dx * dy, minlength=n_groups)
+    syy = np.bincount(codes, weights=dy * dy, minlength=n_groups)
+    slope = sxy / sxx
+    intercept = mean_y - slope * mean_x
+    resid_var = np.maximum(syy - slope * sxy, 0) / np.maximum(count - 2, 1)
+    tcrit = stats.t.ppf((1 + level) / 2, np.maximum(count - 2, 1))
+
+    x_min = pd.Series(xs).groupby(codes).min().reindex(range(n_groups)).to_numpy()
+    x_max = pd.Series(xs).groupby(codes).max().reindex(range(n_groups)).to_numpy()
+    grid = x_min[:, None] + (x_max - x_min)[:, None] * np.linspace(0, 1, n)[None, :]
+    fit = intercept[:, None] + slope[:, None] * grid
+    se = np.sqrt(resid_var[:, None] * (1 / count[:, None] + (grid - mean_x[:, None]) ** 2 / sxx[:, None]))
+    out = pd.DataFrame({
+        "x": grid.ravel(),
+        "y": fit.ravel(),
+        "ymin": (fit - tcrit[:, None] * se).ravel(),
+        "ymax": (fit + tcrit[:, None] * se).ravel(),
+    })
+    return _with_group(out, group, labels, np.repeat(np.arange(n_groups), n))
@@ -0,0 +1,321 @@
+"""차트 결과를 내용 해시 URL 로 내려 주는 HTTP 경로.
+
+렌더링한 PNG/SVG 와 Plotly figure JSON 을 웹소켓 메시지에 그대로 싣지 않고, 내용의 해시를 이름으로
+``/charts/<해시>.<확장자>`` 에 올린 뒤 메시지에는 그 URL 만 보냅니다.
+
+- 같은 내용은 항상 같은 URL 이라 응답에 ``Cache-Control: public, max-age=31536000, immutable`` 과
+  ``ETag`` 를 붙입니다. 브라우저는 다시 방문해도 받지 않고, 앞단 프록시는 다른 사용자에게 그대로 내줍니다.
+- JSON / SVG 는 올릴 때 한 번만 gzip (``brotli`` 패키지가 있으면 brotli 도) 으로 압축해 두고
+  ``Accept-Encoding`` 에 맞춰 보냅니다. PNG 는 이미 압축된 형식이라 그대로 보냅니다.
+- 메모리에는 ``GALLERY_ARTIFACT_MAX_MB`` (기본 128) 만큼 최근 것만 두되, 살아 있는 세션의 출력마다 마지막으로
+  보낸 결과는 고정(pin)해 클라이언트가 받아 가기 전에 밀려나지 않게 합니다 (고정된 것은 한도를 넘어도 남김).
+  ``GALLERY_SHARED_CACHE`` 가 있으면
+  ``<디렉터리>/artifacts`` 에도 써서 같은 호스트의 다른 워커도 같은 URL 을 내줄 수 있게 합니다
+  (공유 디스크 캐시의 크기 한도와 정리에 함께 포함됩니다).
+
+``GALLERY_ARTIFACTS=0`` 이면 이전처럼 값을 메시지에 직접 싣습니다. 스트리밍 차트는 값이 계속 바뀌므로 올리지 않습니다.
+"""
+
+import base64
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+from starlette.responses import PlainTextResponse, Response
+from starlette.routing import Route
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ARTIFACTS = os.environ.get("GALLERY_ARTIFACTS", "1") != "0"
+# 페이지 기준 상대 경로 (앱이 하위 경로에 올라가 있어도 동작)
+PREFIX = "charts/"
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+CONTENT_TYPES = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+    "json": "application/json",
+}
+# 압축해서 보낼 형식
+COMPRESSIBLE = {"svg", "json"}
+# 이보다 작으면 압축하지 않음
+MIN_COMPRESS_BYTES = 1024
+
+
+def _encodings(data, ext):
+    """{인코딩: 바이트}. 원본은 "identity"."""
+    out = {"identity": data}
+    if ext in COMPRESSIBLE and len(data) >= MIN_COMPRESS_BYTES:
+        out["gzip"] = gzip.compress(data, compresslevel=6, mtime=0)
+        if brotli is not None:
+            out["br"] = brotli.compress(data, quality=5)
+    return out
+
+
+def _accepts(header, encoding):
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        if name.strip() == encoding:
+            return params.replace(" ", "") not in ("q=0", "q=0.0")
+    return False
+
+
+class ArtifactStore:
+    """내용 해시 → (확장자, {인코딩: 바이트}) 의 LRU (바이트 한도) + 선택적 디스크 공유."""
+
+    def __init__(self, max_bytes=128 * 1024 * 1024, directory=None):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # id(출력 값) → (값, 참조 값). 캐시 적중마다 같은 객체가 오므로 다시 해시하지 않음
+        self._published = OrderedDict()
+        # (세션, 출력) → 마지막으로 보낸 해시들, 해시 → 고정한 출력 수
+        self._pins = {}
+        self._pinned = {}
+        self.published = 0
+        self.requests = 0
+        self.not_modified = 0
+        self.disk_hits = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    # ---- 올리기 ----------------------------------------------------------------
+
+    def put(self, data, ext, keep=()):
+        """``data`` 를 올리고 URL 을 돌려줍니다. ``keep`` (함께 보낼 URL) 은 이번에 밀려나지 않습니다."""
+        digest = hashlib.sha256(data).hexdigest()[:24]
+        with self._lock:
+            if digest in self._entries:
+                self._entries.move_to_end(digest)
+                return f"{PREFIX}{digest}.{ext}"
+        encodings = _encodings(data, ext)
+        self._put_local(digest, ext, encodings, keep={_digest(url) for url in keep})
+        with self._lock:
+            self.published += 1
+        if self.directory:
+            self._write(digest, ext, encodings)
+        return f"{PREFIX}{digest}.{ext}"
+
+    def _put_local(self, digest, ext, encodings, keep=frozenset()):
+        nbytes = sum(len(body) for body in encodings.values())
+        with self._lock:
+            if digest in self._entries:
+                return
+            self._entries[digest] = (ext, encodings)
+            self._bytes += nbytes
+            if self._bytes > self.max_bytes:
+                self._evict(keep | {digest})
+
+    def _evict(self, keep):
+        # 오래된 것부터, 세션에 보낸 뒤 고정된 것과 방금 넣은 것은 건너뜀
+        for digest in list(self._entries):
+            if self._bytes <= self.max_bytes:
+                break
+            if digest in keep or digest in self._pinned:
+                continue
+            _, evicted = self._entries.pop(digest)
+            self._bytes -= sum(len(body) for body in evicted.values())
+
+    def _path(self, digest, ext, encoding):
+        suffix = "" if encoding == "identity" else f".{encoding}"
+        return os.path.join(self.directory, f"{digest}.{ext}{suffix}")
+
+    def _write(self, digest, ext, encodings):
+        for encoding, body in encodings.items():
+            path = self._path(digest, ext, encoding)
+            if os.path.exists(path):
+                continue
+            fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(body)
+                os.replace(tmp, path)
+            except OSError:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+
+    def _memo(self, value, publish, urls, owner=None):
+        key = id(value)
+        with self._lock:
+            found = self._published.get(key)
+            # 메모리에서 밀려난 결과는 다시 올림
+            if found is not None and found[0] is value and all(
+                _digest(url) in self._entries for url in urls(found[1]) if url
+            ):
+                self._published.move_to_end(key)
+                for url in urls(found[1]):
+                    if url:
+                        self._entries.move_to_end(_digest(url))
+                if owner is not None:
+                    self._pin(owner, urls(found[1]))
+                return found[1]
+        reference = publish()
+        with self._lock:
+            # 원래 값을 함께 보관해 id 가 재사용되지 않게 함
+            self._published[key] = (value, reference)
+            while len(self._published) > 256:
+                self._published.popitem(last=False)
+            if owner is not None:
+                self._pin(owner, urls(reference))
+        return reference
+
+    def pin(self, owner, urls):
+        """``owner`` (세션, 출력) 에 마지막으로 보낸 ``urls`` 를 고정합니다. 이전에 고정한 것은 풀립니다."""
+        with self._lock:
+            self._pin(owner, urls)
+
+    def _pin(self, owner, urls):
+        digests = tuple(_digest(url) for url in urls if url)
+        for digest in self._pins.pop(owner, ()):
+            self._unpin(digest)
+        for digest in digests:
+            self._pinned[digest] = self._pinned.get(digest, 0) + 1
+        self._pins[owner] = digests
+
+    def release(self, session):
+        """끝난 세션이 고정한 결과를 모두 풉니다 (다음에 넣을 때 한도에 맞춰 밀려남)."""
+        with self._lock:
+            for owner in [owner for owner in self._pins if owner[0] == session]:
+                for digest in self._pins.pop(owner):
+                    self._unpin(digest)
+
+    def _unpin(self, digest):
+        count = self._pinned.pop(digest) - 1
+        if count:
+            self._pinned[digest] = count
+
+    def image(self, value, owner=None):
+        """ImgData (data URI) → src 만 URL 로 바꾼 ImgData. ``owner`` 를 주면 결과를 그 출력에 고정합니다."""
+        src = value.get("src", "")
+        if not src.startswith("data:"):
+            return value
+
+        def publish():
+            header, _, payload = src.partition(",")
+            ext = "svg" if header.startswith("data:image/svg+xml") else "png"
+            data = base64.b64decode(payload) if ";base64" in header else payload.encode()
+            return {**value, "src": self.put(data, ext)}
+
+        return self._memo(value, publish, lambda ref: (ref["src"],), owner)
+
+    def plotly(self, value, owner=None):
+        """Plotly 값 {figure, template_id, template} → {url, template_id, template_url}."""
+
+        def publish():
+            template = value.get("template")
+            url = self.put(_json_bytes(value["figure"]), "json")
+            return {
+                "url": url,
+                "template_id": value["template_id"],
+                "template_url": None if template is None else self.put(_json_bytes(template), "json", keep=(url,)),
+            }
+
+        return self._memo(value, publish, lambda ref: (ref["url"], ref["template_url"]), owner)
+
+    # ---- 내려 주기 -------------------------------------------------------------
+
+    def get(self, digest):
+        """(확장자, {인코딩: 바이트}) 또는 None. 메모리에 없으면 공유 디렉터리에서 찾습니다."""
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None:
+                self._entries.move_to_end(digest)
+                return entry
+        if not self.directory:
+            return None
+        return self._read(digest)
+
+    def _read(self, digest):
+        for ext in CONTENT_TYPES:
+            try:
+                with open(self._path(digest, ext, "identity"), "rb") as f:
+                    data = f.read()
+            except OSError:
+                continue
+            encodings = {"identity": data}
+            for encoding in ("gzip", "br"):
+                try:
+                    with open(self._path(digest, ext, encoding), "rb") as f:
+                        encodings[encoding] = f.read()
+                except OSError:
+                    pass
+            self._put_local(digest, ext, encodings)
+            with self._lock:
+                self.disk_hits += 1
+            return ext, encodings
+        return None
+
+    def response(self, request, name):
+        digest, _, ext = name.partition(".")
+        with self._lock:
+            self.requests += 1
+        etag = f'"{digest}"'
+        headers = {"Cache-Control": CACHE_CONTROL, "ETag": etag, "Vary": "Accept-Encoding"}
+        if request.headers.get("if-none-match") in (etag, f"W/{etag}"):
+            with self._lock:
+                self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+        entry = self.get(digest)
+        if entry is None or entry[0] != ext:
+            return PlainTextResponse("unknown chart artifact\n", status_code=404)
+        _, encodings = entry
+        accept = request.headers.get("accept-encoding", "")
+        for encoding in ("br", "gzip"):
+            if encoding in encodings and _accepts(accept, encoding):
+                headers["Content-Encoding"] = encoding
+                return Response(encodings[encoding], media_type=CONTENT_TYPES[ext], headers=headers)
+        return Response(encodings["identity"], media_type=CONTENT_TYPES[ext], headers=headers)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "published": self.published,
+                "pinned": len(self._pinned),
+                "requests": self.requests,
+                "not_modified": self.not_modified,
+                "disk_hits": self.disk_hits,
+                "brotli": brotli is not None,
+                "directory": self.directory,
+            }
+
+
+def _digest(url):
+    return url[len(PREFIX):].partition(".")[0]
+
+
+def _json_bytes(obj):
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def _shared_directory():
+    directory = os.environ.get("GALLERY_SHARED_CACHE")
+    return os.path.join(directory, "artifacts") if directory else None
+
+
+artifacts = ArtifactStore(
+    max_bytes=int(os.environ.get("GALLERY_ARTIFACT_MAX_MB", 128)) * 1024 * 1024,
+    directory=_shared_directory(),
+)
+
+
+def serve_artifacts(app):
+    """Shiny 앱에 ``/charts/<해시>.<확장자>`` 경로를 추가합니다."""
+
+    async def artifact_endpoint(request):
+        return artifacts.response(request, request.path_params["name"])
+
+    # Shiny 의 "/" Mount 보다 앞에 둬야 함
+    app.starlette_app.router.routes[0:0] = [Route(f"/{PREFIX}{{name}}", artifact_endpoint, methods=["GET", "HEAD"])]
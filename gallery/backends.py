@@ -0,0 +1,116 @@
+"""플로팅 라이브러리 지연 로딩과 시작 시간 리포트.
+
+plotnine / plotly / seaborn / matplotlib 은 import 에만 수 초가 걸리므로 모듈 수준에서
+바로 import 하지 않고, ``backends.lazy(name)`` 이 돌려주는 대리 객체의 속성에 처음
+접근할 때(= 그 라이브러리가 필요한 차트를 처음 렌더링할 때) import 합니다.
+
+import / 데이터 준비 / 백엔드 로딩에 걸린 시간은 ``startup`` 에 기록되며
+``startup.report()`` 로 확인할 수 있습니다.
+"""
+
+import importlib
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupTimings:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.entries = []  # (분류, 이름, 초, 시작 후 경과 초)
+        self._lock = threading.Lock()
+
+    def record(self, kind, name, seconds):
+        with self._lock:
+            self.entries.append((kind, name, seconds, time.perf_counter() - self.started))
+
+    @contextmanager
+    def timed(self, kind, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(kind, name, time.perf_counter() - t0)
+
+    def report(self):
+        with self._lock:
+            entries = list(self.entries)
+        lines = [f"Startup report (pid {os.getpid()})"]
+        lines.append(f"  {'kind':<8} {'name':<32} {'ms':>9} {'at (ms)':>9}")
+        for kind, name, seconds, at in entries:
+            lines.append(f"  {kind:<8} {name:<32} {seconds * 1000:>9.1f} {at * 1000:>9.1f}")
+        by_kind = {}
+        for kind, _, seconds, _ in entries:
+            by_kind[kind] = by_kind.get(kind, 0.0) + seconds
+        lines.append("  " + ", ".join(f"{k}: {v * 1000:.1f} ms" for k, v in by_kind.items()))
+        return "\n".join(lines)
+
+
+startup = StartupTimings()
+
+
+class LazyModule:
+    """속성에 처음 접근할 때 실제 모듈을 import 하는 대리 객체."""
+
+    def __init__(self, registry, name):
+        self._registry = registry
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(self._registry.load(self._name), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._registry.is_loaded(self._name) else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+class BackendRegistry:
+    def __init__(self, timings):
+        self._timings = timings
+        self._specs = {}
+        self._modules = {}
+        self._lock = threading.RLock()
+
+    def register(self, name, *, setup=None, requires=()):
+        """``name`` 모듈을 등록합니다.
+
+        ``setup(module)`` 은 처음 import 한 직후 한 번 호출되고, ``requires`` 의 백엔드는
+        이 백엔드보다 먼저 로드됩니다.
+        """
+        self._specs[name] = (setup, tuple(requires))
+
+    def lazy(self, name):
+        if name not in self._specs:
+            self.register(name)
+        return LazyModule(self, name)
+
+    def is_loaded(self, name):
+        return name in self._modules
+
+    def load(self, name):
+        module = self._modules.get(name)
+        if module is not None:
+            return module
+        with self._lock:
+            if name in self._modules:
+                return self._modules[name]
+            setup, requires = self._specs.get(name, (None, ()))
+            for dependency in requires:
+                self.load(dependency)
+            already_imported = name in sys.modules
+            with self._timings.timed("backend", name if not already_imported else f"{name} (setup)"):
+                module = importlib.import_module(name)
+                if setup is not None:
+                    setup(module)
+            self._modules[name] = module
+            return module
+
+    def preload(self):
+        """등록된 모든 백엔드를 미리 로드 (워커를 미리 데워 둘 때)."""
+        for name in list(self._specs):
+            self.load(name)
+
+
+backends = BackendRegistry(startup)
@@ -0,0 +1,298 @@
+"""차트별 렌더링 벤치마크.
+
+    python -m gallery.bench --sizes 1e3 1e4 1e5 1e6 1e7 --repeat 3
+    python -m gallery.bench --only compare_ --sizes 1e3 1e5 --baseline benchmarks/<이전 결과>.json
+
+레지스트리의 plot / Plotly 차트를 세션 없이 렌더링하면서, ``house_data`` 와 같은 방식으로 만든
+합성 데이터(``penguins`` 는 재표본 + 잡음)의 행 수를 바꿔 가며 측정합니다. 합성 데이터는 크기마다
+한 번 Arrow 파일로 저장하고, 앱과 같은 방식(``GALLERY_DATA_DIR``, 메모리 맵)으로 읽습니다.
+(차트, 크기) 조합마다 새 프로세스에서 실행하므로 최대 RSS 가 다른 측정과 섞이지 않습니다.
+
+측정값: 벽시계 시간(첫 실행 / 최소 / 중앙값), 단계별 시간, 최대 RSS, 출력(전송) 크기.
+결과는 JSON 으로 저장되며 ``--baseline`` 과 비교해 느려지거나 커진 항목을 표시합니다.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from .datasets import write_frame
+from .scheduler import init_worker, worker_registry
+
+RESULTS_DIR = "benchmarks"
+# 합성 데이터로 바꾸는 데이터셋 (이 데이터셋을 쓰는 차트만 크기별로 측정)
+SCALED_DATASETS = ("penguins", "house_data")
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+PLOT_SIZE = (800, 400, 1)
+PENGUIN_NUMERIC = ("bill_length_mm", "bill_depth_mm", "flipper_length_mm", "body_mass_g")
+BACKENDS = ("ggplot", "seaborn", "plotly")
+
+
+# ---- 합성 데이터 --------------------------------------------------------------
+
+def synthetic_house_data(n, seed=123):
+    """앱의 ``house_data`` 와 같은 분포로 n 행 (도시 3개가 같은 비율)."""
+    rng = np.random.default_rng(seed)
+    per_city = -(-n // 3)
+    frame = pd.DataFrame({
+        "city": np.repeat(["A", "B", "C"], per_city),
+        "price": np.concatenate([
+            rng.normal(1500000, 400000, per_city),
+            rng.normal(2000000, 500000, per_city),
+            rng.normal(1800000, 450000, per_city),
+        ]),
+        "bathrooms": rng.choice([1, 2, 3, 4], 3 * per_city, replace=True),
+    })
+    return frame.iloc[:n].reset_index(drop=True)
+
+
+def synthetic_penguins(base, n, seed=123):
+    """원본 penguins 를 n 행으로 재표본하고 수치 열에 작은 잡음(표준편차의 5%)을 더합니다."""
+    rng = np.random.default_rng(seed)
+    frame = base.iloc[rng.integers(0, len(base), n)].reset_index(drop=True)
+    for col in PENGUIN_NUMERIC:
+        frame[col] = frame[col] + rng.normal(0, frame[col].std() * 0.05, n)
+    return frame
+
+
+def write_data(app, n, directory):
+    """n 행 합성 데이터를 ``directory`` 에 Arrow 파일로 저장합니다 (자식 프로세스의 ``GALLERY_DATA_DIR``)."""
+    os.makedirs(directory, exist_ok=True)
+    base = app.datasets.load("penguins")
+    write_frame(os.path.join(directory, "penguins.arrow"), synthetic_penguins(base, n))
+    write_frame(os.path.join(directory, "house_data.arrow"), synthetic_house_data(n))
+    return directory
+
+
+# ---- 측정 (자식 프로세스) ------------------------------------------------------
+
+def _max_rss_bytes():
+    # Linux 는 KiB, macOS 는 바이트
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def _backend(obj):
+    module = type(obj).__module__
+    if module.startswith("plotnine"):
+        return "plotnine"
+    if module.startswith("plotly"):
+        return "plotly"
+    return "matplotlib"
+
+
+def _measure(app_module, app_dir, chart_id, data_dir, repeat, conn):
+    from .figures import figures
+    from .render import _payload_size, timed_offline_render
+
+    try:
+        if data_dir is not None:
+            # 앱이 import 될 때 합성 데이터 파일을 메모리 맵으로 읽음
+            os.environ["GALLERY_DATA_DIR"] = data_dir
+        init_worker(app_module, app_dir)
+        app = sys.modules[app_module]
+        spec = worker_registry().get(chart_id)
+        # import 시간은 측정에서 제외
+        app.backends.preload()
+        rss_before = _max_rss_bytes()
+        size = PLOT_SIZE if spec.kind == "plot" else None
+
+        walls, best = [], None
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            result, phases = timed_offline_render(spec, size)
+            walls.append(time.perf_counter() - t0)
+            if best is None or walls[-1] <= min(walls):
+                best = phases
+        with figures.scope():
+            backend = _backend(spec.fn())
+        value = None if result is None else result[1]
+        conn.send({
+            "backend": backend,
+            "wall_first": walls[0],
+            "wall_min": min(walls),
+            "wall_median": statistics.median(walls),
+            "phases": best,
+            "peak_rss": _max_rss_bytes(),
+            "rss_growth": _max_rss_bytes() - rss_before,
+            "output_bytes": 0 if value is None else _payload_size(value),
+        })
+    except Exception as e:
+        conn.send({"error": f"{type(e).__name__}: {e}"})
+    finally:
+        conn.close()
+
+
+def run_one(app_module, app_dir, chart_id, data_dir=None, *, repeat=3, timeout=600):
+    """(차트, 데이터 디렉터리) 하나를 새 프로세스에서 측정합니다. ``data_dir`` 가 None 이면 앱의 원래 데이터."""
+    ctx = multiprocessing.get_context("spawn")
+    parent, child = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_measure, args=(app_module, app_dir, chart_id, data_dir, repeat, child))
+    proc.start()
+    child.close()
+    result = parent.recv() if parent.poll(timeout) else {"error": f"timeout after {timeout}s"}
+    proc.join(5)
+    if proc.is_alive():
+        proc.terminate()
+        proc.join()
+    return result
+
+
+# ---- 실행 / 저장 / 비교 --------------------------------------------------------
+
+def chart_type(chart_id):
+    """``compare_bar_plotly`` → ("bar", "plotly"). Library Comparison 차트가 아니면 (None, None)."""
+    parts = chart_id.split("_")
+    if len(parts) == 3 and parts[0] == "compare" and parts[2] in BACKENDS:
+        return parts[1], parts[2]
+    return None, None
+
+
+def _git_revision(app_dir):
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=app_dir,
+                             capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run_benchmarks(app_module, *, sizes=DEFAULT_SIZES, only=None, repeat=3, timeout=600,
+                   app_dir=None, progress=None):
+    app_dir = os.path.abspath(app_dir or os.getcwd())
+    init_worker(app_module, app_dir)
+    app = sys.modules[app_module]
+    specs = [spec for spec in worker_registry() if spec.kind in ("plot", "plotly")]
+    if only:
+        specs = [spec for spec in specs if any(spec.id.startswith(prefix) for prefix in only)]
+
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="gallery-bench-") as tmp:
+        data_dirs = {}
+        for spec in specs:
+            # 합성 데이터와 관계없는 차트는 한 번만
+            scales = any(app.datasets.owner(frame) in SCALED_DATASETS for frame in spec.data)
+            for n in (sizes if scales else (None,)):
+                if n is not None and n not in data_dirs:
+                    data_dirs[n] = write_data(app, n, os.path.join(tmp, str(n)))
+                result = run_one(app_module, app_dir, spec.id, data_dirs.get(n), repeat=repeat, timeout=timeout)
+                kind, library = chart_type(spec.id)
+                row = {"chart": spec.id, "tab": spec.tab, "rows": n, "chart_type": kind, **result}
+                if library is not None:
+                    row["library"] = library
+                rows.append(row)
+                if progress is not None:
+                    progress(row)
+
+    versions = {}
+    for name in ("matplotlib", "seaborn", "plotnine", "plotly", "pandas", "numpy"):
+        module = sys.modules.get(name)
+        if module is None:
+            try:
+                module = __import__(name)
+            except ImportError:
+                continue
+        versions[name] = getattr(module, "__version__", None)
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "revision": _git_revision(app_dir),
+        "python": platform.python_version(),
+        "machine": {"platform": platform.platform(), "cpus": os.cpu_count()},
+        "versions": versions,
+        "plot_size": list(PLOT_SIZE),
+        "repeat": repeat,
+        "results": rows,
+    }
+
+
+def cheapest_backends(results):
+    """Library Comparison 차트 종류와 행 수마다 가장 빠른 백엔드."""
+    best = {}
+    for row in results:
+        if row.get("chart_type") is None or "error" in row:
+            continue
+        key = (row["chart_type"], row["rows"])
+        if key not in best or row["wall_min"] < best[key]["wall_min"]:
+            best[key] = row
+    return {key: (row["library"], row["wall_min"]) for key, row in sorted(best.items())}
+
+
+def compare(current, baseline, *, threshold=0.2):
+    """기준 결과보다 ``threshold`` 이상 느려지거나 출력이 커진 항목 목록."""
+    before = {(row["chart"], row["rows"]): row for row in baseline["results"] if "error" not in row}
+    regressions = []
+    for row in current["results"]:
+        old = before.get((row["chart"], row["rows"]))
+        if old is None or "error" in row:
+            continue
+        for metric in ("wall_min", "output_bytes", "rss_growth"):
+            if old[metric] > 0 and row[metric] > old[metric] * (1 + threshold):
+                regressions.append((row["chart"], row["rows"], metric, old[metric], row[metric]))
+    return regressions
+
+
+def _format_row(row):
+    rows = "-" if row["rows"] is None else f"{row['rows']:,}"
+    if "error" in row:
+        return f"{row['chart']:<26} {rows:>12}  ERROR {row['error']}"
+    return (f"{row['chart']:<26} {rows:>12} {row['backend']:<10} "
+            f"{row['wall_min'] * 1000:9.1f} ms {row['wall_first'] * 1000:9.1f} ms "
+            f"{row['peak_rss'] / 2**20:8.1f} MiB {row['output_bytes'] / 1024:9.1f} KiB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m gallery.bench", description=__doc__.split("\n")[0])
+    parser.add_argument("--app", default="phython_shiny", help="차트 레지스트리(charts)가 있는 앱 모듈")
+    parser.add_argument("--sizes", nargs="+", type=lambda s: int(float(s)), default=list(DEFAULT_SIZES),
+                        help="합성 데이터 행 수 (예: 1e3 1e5)")
+    parser.add_argument("--only", nargs="+", help="이 접두사로 시작하는 차트만 (예: compare_ plot1)")
+    parser.add_argument("--repeat", type=int, default=3, help="(차트, 크기) 마다 렌더링 횟수")
+    parser.add_argument("--timeout", type=float, default=600, help="(차트, 크기) 하나의 제한 시간(초)")
+    parser.add_argument("--out", help=f"결과 JSON 경로 (기본: {RESULTS_DIR}/<시각>-<revision>.json)")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="회귀로 볼 증가 비율 (기본 0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    print(f"{'chart':<26} {'rows':>12} {'backend':<10} {'wall min':>12} {'first':>12} "
+          f"{'peak RSS':>12} {'output':>13}")
+    report = run_benchmarks(args.app, sizes=args.sizes, only=args.only, repeat=args.repeat,
+                            timeout=args.timeout, progress=lambda row: print(_format_row(row), flush=True))
+
+    out = args.out or os.path.join(
+        RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{report['revision'] or 'local'}.json"
+    )
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1)
+    print(f"\nsaved {out}")
+
+    cheapest = cheapest_backends(report["results"])
+    if cheapest:
+        print("\ncheapest backend per chart type")
+        for (kind, rows), (library, wall) in cheapest.items():
+            print(f"  {kind:<8} {rows:>12,} {library:<8} {wall * 1000:9.1f} ms")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, threshold=args.threshold)
+        print(f"\n{len(regressions)} regression(s) vs {args.baseline}")
+        for chart, rows, metric, old, new in regressions:
+            print(f"  {chart} rows={rows} {metric}: {old:.4g} -> {new:.4g}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
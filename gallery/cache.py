@@ -0,0 +1,323 @@
+"""프로세스 전역 렌더 캐시.
+
+모든 Shiny 세션이 하나의 캐시를 공유하므로, 같은 데이터/크기로 그린 차트는
+한 번만 렌더링됩니다. LRU + 바이트 크기 기준으로 오래된 항목을 내보냅니다.
+
+여러 앱 프로세스로 띄울 때(``python -m gallery.serve``)는 ``SharedStore`` 를 붙여, 한 워커가
+렌더링한 결과를 같은 호스트의 다른 워커가 디스크에서 읽어 씁니다. 디스크 쓰기(와 정리)는 별도 스레드에서
+하고, 세션의 렌더러는 ``aget`` 으로 디스크를 스레드에서 읽으므로 느린 디스크가 이벤트 루프를 막지 않습니다.
+"""
+
+import asyncio
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+
+class RenderCache:
+    """LRU + 바이트 한도를 가진 스레드 안전 캐시."""
+
+    def __init__(self, max_entries=512, max_bytes=128 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # 프로세스 간 공유 저장소 (attach 로 연결). 메모리에 없으면 여기서 찾음
+        self.store = None
+        # 공유 저장소에 쓰는 스레드 (처음 쓸 때 만듦)
+        self._writer = None
+
+    def attach(self, store):
+        self.store = store
+
+    def _get_local(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+        return None
+
+    def _found(self, key, found):
+        if found is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        value, nbytes = found
+        with self._lock:
+            self.hits += 1
+        self._put_local(key, value, nbytes)
+        return value
+
+    def get(self, key, *, shared=True):
+        """``shared=False`` 면 공유 저장소를 보지 않습니다 (디스크를 읽지 않음)."""
+        value = self._get_local(key)
+        if value is not None:
+            return value
+        store = self.store if shared else None
+        return self._found(key, None if store is None else store.get(key))
+
+    async def aget(self, key):
+        """``get`` 과 같지만 공유 저장소는 스레드에서 읽습니다 (이벤트 루프에서 사용)."""
+        value = self._get_local(key)
+        if value is not None:
+            return value
+        store = self.store
+        return self._found(key, None if store is None else await asyncio.to_thread(store.get, key))
+
+    def __contains__(self, key):
+        # 적중/미스 통계에 포함하지 않는 존재 확인
+        with self._lock:
+            if key in self._entries:
+                return True
+        return self.store is not None and key in self.store
+
+    def put(self, key, value, nbytes, *, shared=True):
+        """``shared=False`` 는 이 프로세스에서만 의미 있는 값 (예: 프로세스마다 다른 스트리밍 데이터)."""
+        self._put_local(key, value, nbytes)
+        if shared and self.store is not None:
+            with self._lock:
+                if self._writer is None:
+                    self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gallery-cache-writer")
+                writer = self._writer
+            writer.submit(self.store.put, key, value, nbytes)
+
+    def flush(self):
+        """공유 저장소에 쓰는 중인 항목을 모두 쓸 때까지 기다립니다."""
+        writer = self._writer
+        if writer is not None:
+            writer.submit(lambda: None).result()
+
+    def _put_local(self, key, value, nbytes):
+        # 한도보다 큰 항목은 캐시하지 않음 (다른 항목을 모두 밀어내지 않도록)
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, nbytes)
+            self._bytes += nbytes
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self._bytes -= evicted_bytes
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / total if total else 0.0,
+                "shared": None if self.store is None else self.store.stats(),
+            }
+
+
+class SharedStore:
+    """같은 호스트의 프로세스들이 공유하는 디스크 캐시.
+
+    키의 해시를 파일 이름으로 씁니다 (키에는 데이터 지문이 들어 있으므로 입력이 같으면 같은 파일).
+    파일은 임시 파일에 쓴 뒤 이름을 바꿔 넣으므로, 읽는 쪽은 완성된 값만 봅니다.
+    ``namespace`` (예: 앱 소스 해시) 가 다르면 다른 파일을 쓰므로 배포 간에 섞이지 않습니다.
+    전체 크기가 ``max_bytes`` 를 넘으면 가장 오래 쓰지 않은 파일부터 지웁니다.
+    파일 수/크기 통계는 디렉터리를 매번 훑지 않고 마지막 정리 때 본 값에 이후 쓴 것을 더한 근사치입니다.
+    """
+
+    def __init__(self, directory, *, namespace="", max_bytes=512 * 1024 * 1024, sweep_every=64):
+        self.directory = directory
+        self.namespace = namespace
+        self.max_bytes = max_bytes
+        self.sweep_every = sweep_every
+        self._puts = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        os.makedirs(directory, exist_ok=True)
+        # (파일 수, 바이트 수)
+        self._usage = self._scan()
+
+    def _path(self, key):
+        digest = hashlib.sha256(repr((self.namespace, key)).encode()).hexdigest()
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def __contains__(self, key):
+        return os.path.exists(self._path(key))
+
+    def get(self, key):
+        """(값, 바이트 수) 또는 None."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                nbytes, value = pickle.load(f)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            # 다른 프로세스가 지우는 중이거나 손상된 파일
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            # 최근 사용 시각 (정리할 때 기준)
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return value, nbytes
+
+    def put(self, key, value, nbytes):
+        path = self._path(key)
+        if os.path.exists(path):
+            return
+        try:
+            data = pickle.dumps((nbytes, value), protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            self.writes += 1
+            self._usage = (self._usage[0] + 1, self._usage[1] + len(data))
+            self._puts += 1
+            sweep = self._puts >= self.sweep_every
+            if sweep:
+                self._puts = 0
+        if sweep:
+            self.sweep()
+
+    def _files(self):
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.startswith(".tmp-"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                yield st.st_mtime, st.st_size, path
+
+    def _scan(self):
+        files = list(self._files())
+        return len(files), sum(size for _, size, _ in files)
+
+    def sweep(self):
+        """한도를 넘었으면 오래 쓰지 않은 파일부터 지워 한도의 80% 로 맞춥니다."""
+        files = sorted(self._files())
+        total = sum(size for _, size, _ in files)
+        removed = 0
+        if total > self.max_bytes:
+            for _, size, path in files:
+                if total <= self.max_bytes * 0.8:
+                    break
+                try:
+                    os.unlink(path)
+                except OSError:
+                    continue
+                total -= size
+                removed += 1
+        with self._lock:
+            self._usage = (len(files) - removed, total)
+        return removed
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "directory": self.directory,
+                "entries": self._usage[0],
+                "bytes": self._usage[1],
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+# 데이터 지문 (DataFrame 객체별로 한 번만 계산). DataFrame 은 해시 불가라 id 로 보관
+_fingerprints = {}
+_fingerprint_lock = threading.Lock()
+
+
+def frame_fingerprint(df):
+    """DataFrame 내용의 해시. 같은 객체는 다시 해시하지 않습니다."""
+    with _fingerprint_lock:
+        cached = _fingerprints.get(id(df))
+    if cached is not None and cached[0]() is df and cached[1] == df.shape:
+        return cached[2]
+    h = hashlib.sha1()
+    h.update(repr(list(df.columns)).encode())
+    h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return assign_fingerprint(df, h.hexdigest()[:16])
+
+
+def assign_fingerprint(df, digest):
+    """내용을 해시하지 않고 ``df`` 의 지문을 정합니다 (예: 원본 지문 + 필터 조건으로 만든 걸러진 DataFrame)."""
+    key = id(df)
+    with _fingerprint_lock:
+        _fingerprints[key] = (weakref.ref(df, lambda _: _fingerprints.pop(key, None)), df.shape, digest)
+    return digest
+
+
+def data_fingerprint(*frames):
+    """여러 입력 데이터를 하나의 지문으로 합칩니다."""
+    if not frames:
+        return "-"
+    return "+".join(frame_fingerprint(df) for df in frames)
+
+
+render_cache = RenderCache(
+    max_entries=int(os.environ.get("GALLERY_CACHE_MAX_ENTRIES", 512)),
+    max_bytes=int(os.environ.get("GALLERY_CACHE_MAX_MB", 128)) * 1024 * 1024,
+)
+
+
+def attach_shared_store(namespace=""):
+    """``GALLERY_SHARED_CACHE=<디렉터리>`` 가 있으면 렌더 캐시에 공유 저장소를 붙입니다."""
+    directory = os.environ.get("GALLERY_SHARED_CACHE")
+    if not directory:
+        return None
+    store = SharedStore(
+        directory,
+        namespace=namespace,
+        max_bytes=int(os.environ.get("GALLERY_SHARED_CACHE_MAX_MB", 512)) * 1024 * 1024,
+    )
+    render_cache.attach(store)
+    return store
@@ -0,0 +1,335 @@
+"""교차 필터: 데이터셋의 행을 차원(열)별 조건으로 거르고, 바뀐 필터에 걸린 차트만 다시 렌더링합니다.
+
+차원은 데이터셋마다 등록합니다 (``categorical`` = 값 목록에서 고르기, ``range`` = 최소/최대 구간).
+필터가 바뀔 때마다 전체 DataFrame 을 다시 훑지 않도록 차원마다 색인을 한 번만 만들어 둡니다.
+
+- 범주 차원: 값마다 행 비트맵 (``np.packbits`` 로 8행당 1바이트). 선택한 값들의 비트맵을 OR
+- 구간 차원: 값으로 정렬한 행 번호. ``searchsorted`` 로 구간의 양 끝만 찾아 그 사이 행을 켬
+- 데이터셋의 선택 행 = 조건이 걸린 차원 비트맵의 AND. 차원별 비트맵과 선택 행은 조건별로 보관
+
+필터 상태(``state``)는 ((차원 이름, 조건), ...) 튜플이고, 전체를 고른 차원은 빠집니다. 차트 함수는
+``filters.view(frame)`` 으로 현재 상태에 맞게 걸러진 DataFrame 을 받습니다. 상태는 렌더링하는 동안
+``applied(filters)`` 로 정해지므로 세션 안, 스레드, 렌더 워커 프로세스 어디서 그려도 같은 결과입니다.
+
+세션마다 ``filters.session(input)`` 은 데이터셋별 reactive 값을 두고, 입력이 바뀌어도 선택 행이 그대로면
+(예: 점이 없는 가격 구간으로 슬라이더를 옮김) 값을 바꾸지 않습니다. 렌더러는 차트가 쓰는 데이터셋의 값만
+읽으므로, 펭귄 필터를 바꾸면 주택 차트는 무효화되지 않습니다 (``gallery/render.py`` 의 ``filters=``).
+걸러진 DataFrame 은 (원본 지문, 상태) 로 지문을 정하므로, 파생 집계와 밀도 엔진도 상태별로 한 번만 계산합니다.
+"""
+
+import hashlib
+import math
+from abc import ABC, abstractmethod
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import numpy as np
+import pandas as pd
+from shiny import reactive, ui
+from shiny.types import SafeException
+
+from .cache import assign_fingerprint, frame_fingerprint
+
+# 렌더링 중인 필터 상태: ((데이터셋 이름, state), ...)
+_active = ContextVar("gallery_filters", default=())
+
+
+@contextmanager
+def applied(filters):
+    """``filters`` (``FilterSession.key`` 가 만든 튜플) 를 현재 렌더링의 필터 상태로 정합니다."""
+    token = _active.set(tuple(filters or ()))
+    try:
+        yield
+    finally:
+        _active.reset(token)
+
+
+def current(dataset):
+    """현재 렌더링에서 ``dataset`` 의 필터 상태 (필터가 없으면 ())."""
+    for name, state in _active.get():
+        if name == dataset:
+            return state
+    return ()
+
+
+class EmptySelection(SafeException):
+    """필터에 맞는 행이 없을 때. 출력에 이 메시지를 그대로 보여 줍니다."""
+
+
+class _LRU:
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self._entries[key] = value
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class _Dimension(ABC):
+    """차원 하나의 색인. 하위 클래스는 ``build`` (색인 만들기) 와 ``_mask`` (조건 → 비트맵) 를 구현합니다."""
+
+    def __init__(self, name, dataset, column, label, input_id):
+        self.name = name
+        self.dataset = dataset
+        self.column = column
+        self.label = label
+        self.input_id = input_id
+        self.rows = 0
+        self._index = None
+        # 조건 → 비트맵
+        self._masks = _LRU(16)
+
+    @abstractmethod
+    def build(self, values):
+        """열 값으로 색인을 만듭니다."""
+
+    @abstractmethod
+    def _mask(self, condition):
+        """조건에 맞는 행의 비트맵 (``np.packbits``)."""
+
+    def mask(self, condition):
+        cached = self._masks.get(condition)
+        if cached is None:
+            cached = self._masks.put(condition, self._mask(condition))
+        return cached
+
+
+class _Categorical(_Dimension):
+    kind = "categorical"
+
+    def build(self, values):
+        # NaN 은 코드 -1 이라 어느 비트맵에도 없음 (필터를 걸면 빠짐)
+        codes, labels = pd.factorize(values, sort=True)
+        self.rows = len(codes)
+        self.labels = np.asarray(labels).tolist()
+        self._index = [np.packbits(codes == code) for code in range(len(self.labels))]
+
+    def choices(self):
+        return {str(label): str(label) for label in self.labels}
+
+    def normalize(self, value):
+        """입력 값 (문자열 목록) → 조건 (고른 값 튜플). 모두 골랐으면 None."""
+        chosen = {str(v) for v in (value or ())}
+        condition = tuple(label for label in self.labels if str(label) in chosen)
+        return None if len(condition) == len(self.labels) else condition
+
+    def _mask(self, condition):
+        codes = [self.labels.index(label) for label in condition]
+        if not codes:
+            return np.zeros((self.rows + 7) // 8, dtype=np.uint8)
+        return np.bitwise_or.reduce([self._index[code] for code in codes])
+
+
+class _Range(_Dimension):
+    kind = "range"
+
+    def build(self, values):
+        values = np.asarray(values, dtype=float)
+        self.rows = len(values)
+        # NaN 은 정렬 끝으로 가므로 어떤 구간에도 들지 않음
+        self._index = self._order = np.argsort(values, kind="stable")
+        self._sorted = values[self._order]
+        finite = self._sorted[~np.isnan(self._sorted)]
+        self.bounds = (math.floor(finite[0]), math.ceil(finite[-1])) if len(finite) else (0, 0)
+
+    def normalize(self, value):
+        """입력 값 (최소, 최대) → 조건. 전체 범위를 덮으면 None."""
+        lo, hi = (float(v) for v in value)
+        if lo <= self.bounds[0] and hi >= self.bounds[1]:
+            return None
+        return (lo, hi)
+
+    def _mask(self, condition):
+        lo, hi = condition
+        start = np.searchsorted(self._sorted, lo, side="left")
+        stop = np.searchsorted(self._sorted, hi, side="right")
+        selected = np.zeros(self.rows, dtype=bool)
+        selected[self._order[start:stop]] = True
+        return np.packbits(selected)
+
+
+class CrossFilter:
+    def __init__(self, datasets, *, max_views=64):
+        self._datasets = datasets
+        self._dimensions = {}
+        self._lock = threading.Lock()
+        # (데이터셋, state) → 선택 행 번호
+        self._rows = _LRU(32)
+        # (id(frame), state) → (frame, 걸러진 frame)
+        self._views = _LRU(max_views)
+        # id(frame) → 데이터셋 이름
+        self._owners = {}
+        self.computations = 0
+        self.hits = 0
+
+    def _add(self, cls, dataset, column, label, name, input_id):
+        name = name or column
+        if name in self._dimensions:
+            raise ValueError(f"Filter dimension '{name}' is already defined")
+        self._dimensions[name] = cls(name, dataset, column, label or column, input_id or f"filter_{name}")
+        return self._dimensions[name]
+
+    def categorical(self, dataset, column, *, label=None, name=None, input_id=None):
+        """``column`` 값 목록에서 고르는 차원 (체크박스)."""
+        return self._add(_Categorical, dataset, column, label, name, input_id)
+
+    def range(self, dataset, column, *, label=None, name=None, input_id=None):
+        """``column`` 의 [최소, 최대] 구간 차원 (슬라이더)."""
+        return self._add(_Range, dataset, column, label, name, input_id)
+
+    def dimensions(self, dataset=None):
+        """색인을 만든 차원 목록 (색인은 처음 쓸 때 데이터셋마다 한 번 만듦)."""
+        dims = [dim for dim in self._dimensions.values() if dataset is None or dim.dataset == dataset]
+        with self._lock:
+            for dim in dims:
+                if dim._index is None:
+                    dim.build(self._datasets.load(dim.dataset)[dim.column].to_numpy())
+        return dims
+
+    def filtered_datasets(self):
+        return list(dict.fromkeys(dim.dataset for dim in self._dimensions.values()))
+
+    def normalize(self, dataset, values):
+        """{차원 이름: 입력 값} → state."""
+        state = []
+        for dim in self.dimensions(dataset):
+            condition = dim.normalize(values[dim.name])
+            if condition is not None:
+                state.append((dim.name, condition))
+        return tuple(state)
+
+    def rows(self, dataset, state):
+        """``state`` 에 맞는 행 번호 (필터가 없으면 None)."""
+        if not state:
+            return None
+        # 렌더 워커 프로세스에서는 normalize 없이 바로 불리므로 색인이 아직 없을 수 있음
+        self.dimensions(dataset)
+        with self._lock:
+            rows = self._rows.get((dataset, state))
+            if rows is not None:
+                self.hits += 1
+                return rows
+            masks = [self._dimensions[name].mask(condition) for name, condition in state]
+            selected = masks[0] if len(masks) == 1 else np.bitwise_and.reduce(masks)
+            rows = np.flatnonzero(np.unpackbits(selected, count=self._dimensions[state[0][0]].rows))
+            rows.flags.writeable = False
+            self.computations += 1
+            return self._rows.put((dataset, state), rows)
+
+    def owner(self, frame):
+        key = id(frame)
+        with self._lock:
+            if key in self._owners:
+                return self._owners[key][1]
+        name = self._datasets.owner(frame)
+        if name is not None:
+            with self._lock:
+                # frame 을 함께 보관해 id 가 다른 객체에 재사용되지 않게 함 (데이터셋과 그 열 일부만 등록됨)
+                self._owners[key] = (frame, name)
+        return name
+
+    def scoped(self, frame):
+        """(현재 상태로 걸러진 frame, 그 상태). ``DerivedData(view=...)`` 에 넘깁니다."""
+        dataset = self.owner(frame)
+        state = current(dataset) if dataset is not None else ()
+        if not state:
+            return frame, ()
+        rows = self.rows(dataset, state)
+        if len(rows) == 0:
+            raise EmptySelection("선택한 필터에 맞는 행이 없습니다.")
+        with self._lock:
+            cached = self._views.get((id(frame), state))
+        if cached is None:
+            view = frame.take(rows)
+            # 내용을 다시 해시하지 않고 (원본 지문, 상태) 로 지문을 정함
+            token = hashlib.sha1(repr(state).encode()).hexdigest()[:8]
+            assign_fingerprint(view, f"{frame_fingerprint(frame)}~{token}")
+            with self._lock:
+                cached = self._views.put((id(frame), state), (frame, view))
+        return cached[1], state
+
+    def view(self, frame):
+        """현재 렌더링의 필터 상태로 걸러진 ``frame`` (필터가 없으면 그대로)."""
+        return self.scoped(frame)[0]
+
+    def datasets_of(self, spec):
+        """차트가 쓰는 데이터셋 중 필터가 있는 것."""
+        filtered = self.filtered_datasets()
+        owners = (self.owner(frame) for frame in spec.data)
+        return tuple(sorted({name for name in owners if name in filtered}))
+
+    def controls(self):
+        """사이드바에 넣을 입력 위젯 (처음에는 모두 선택 / 전체 범위)."""
+        widgets = []
+        for dim in self.dimensions():
+            if dim.kind == "categorical":
+                choices = dim.choices()
+                widgets.append(ui.input_checkbox_group(dim.input_id, dim.label, choices, selected=list(choices)))
+            else:
+                widgets.append(ui.input_slider(dim.input_id, dim.label, *dim.bounds, value=dim.bounds))
+        return widgets
+
+    def session(self, input):
+        """현재 세션의 필터 입력을 읽는 ``FilterSession``."""
+        return FilterSession(self, input)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "dimensions": {
+                    name: {"dataset": dim.dataset, "kind": dim.kind, "indexed": dim._index is not None,
+                           "masks": len(dim._masks)}
+                    for name, dim in self._dimensions.items()
+                },
+                "selections": len(self._rows),
+                "views": len(self._views),
+                "hits": self.hits,
+                "computations": self.computations,
+            }
+
+
+class FilterSession:
+    """세션 하나의 필터 상태. 데이터셋마다 reactive 값을 하나씩 둡니다."""
+
+    def __init__(self, crossfilter, input):
+        self._filters = crossfilter
+        self._state = {dataset: reactive.value(()) for dataset in crossfilter.filtered_datasets()}
+        self._selection = {dataset: None for dataset in self._state}
+        for dataset in self._state:
+            self._watch(dataset, input)
+
+    def _watch(self, dataset, input):
+        dims = self._filters.dimensions(dataset)
+
+        @reactive.effect
+        def _():
+            state = self._filters.normalize(dataset, {dim.name: input[dim.input_id]() for dim in dims})
+            rows = self._filters.rows(dataset, state)
+            current = self._selection[dataset]
+            # 고른 행이 같으면 (예: 빈 가격 구간) 이 데이터셋의 출력을 무효화하지 않음
+            if rows is current or (rows is not None and current is not None and np.array_equal(rows, current)):
+                return
+            self._selection[dataset] = rows
+            self._state[dataset].set(state)
+
+    def key(self, spec):
+        """차트의 렌더링에 쓸 필터 상태 (reactive). 차트가 쓰는 데이터셋의 값만 읽습니다."""
+        return tuple(
+            (dataset, state)
+            for dataset in self._filters.datasets_of(spec)
+            if (state := self._state[dataset]())
+        )
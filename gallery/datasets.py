@@ -0,0 +1,189 @@
+"""데이터셋 레지스트리: 열 단위 파일(Arrow/Feather/Parquet)을 메모리 맵으로 읽고, 차트가 쓰는 열만 꺼냅니다.
+
+각 데이터셋은 이름과 만드는 함수(``@datasets.define(name)``)로 등록합니다. 데이터 디렉터리
+(``GALLERY_DATA_DIR``)에 ``<이름>.arrow`` / ``.feather`` / ``.parquet`` 파일이 있으면 함수 대신 파일을 읽습니다.
+
+- Arrow IPC (= 압축하지 않은 Feather v2) 파일은 메모리 맵으로 열고 복사 없이 DataFrame 으로 바꿉니다.
+  같은 호스트의 여러 Shiny 워커와 렌더 워커 프로세스가 같은 파일을 열면 운영체제 페이지 캐시를
+  공유하므로, 프로세스마다 데이터 사본을 따로 갖지 않습니다. 쓰지 않는 열은 읽히지도 않습니다.
+- Parquet 은 디코딩이 필요해 공유되지는 않지만, ``columns()`` 로 필요한 열만 읽습니다.
+- ``columns(name, cols)`` 는 열 일부만 가진 DataFrame 을 (열 조합마다 한 번) 만들어 돌려줍니다.
+  차트의 ``data=`` 에 넘기면 데이터 지문도 그 열만으로 계산됩니다.
+
+메모리 맵으로 읽은 수치 열은 읽기 전용입니다 (결과를 공유하므로 수정하지 말고 복사해서 사용하세요).
+
+    python -m gallery.datasets --out data    # 앱의 데이터셋을 Arrow 파일로 저장
+    GALLERY_DATA_DIR=data shiny run phython_shiny.py
+"""
+
+import argparse
+import os
+import sys
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+FORMATS = (".arrow", ".feather", ".parquet")
+
+
+@dataclass
+class _Dataset:
+    name: str
+    build: Callable
+    frame: object = None
+    # 파일에서 읽었으면 그 경로, 함수로 만들었으면 None
+    path: Optional[str] = None
+    # 메모리 맵으로 연 Arrow 테이블 (열 일부만 꺼낼 때 사용)
+    table: object = None
+    views: dict = field(default_factory=dict)
+
+
+def write_frame(path, frame):
+    """DataFrame 을 압축하지 않은 Arrow IPC 파일로 저장합니다 (메모리 맵으로 복사 없이 읽을 수 있게)."""
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+
+    table = pa.Table.from_pandas(frame)
+    tmp = f"{path}.tmp-{os.getpid()}"
+    with ipc.new_file(tmp, table.schema) as writer:
+        writer.write_table(table)
+    # 읽는 중인 프로세스가 있어도 안전하게 교체
+    os.replace(tmp, path)
+    return os.path.getsize(path)
+
+
+def _index_columns(schema):
+    metadata = schema.pandas_metadata or {}
+    return [col for col in metadata.get("index_columns", []) if isinstance(col, str)]
+
+
+def _read_table(path, columns=None):
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        if columns is not None:
+            columns = list(columns) + _index_columns(pq.read_schema(path))
+        return pq.read_table(path, columns=columns, memory_map=True)
+
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+
+    table = ipc.open_file(pa.memory_map(path)).read_all()
+    if columns is not None:
+        table = table.select(list(columns) + _index_columns(table.schema))
+    return table
+
+
+def _to_pandas(table):
+    # split_blocks: 열마다 따로 두어 수치 열을 메모리 맵 버퍼 그대로 사용
+    return table.to_pandas(split_blocks=True)
+
+
+class DatasetRegistry:
+    def __init__(self, directory=None):
+        self.directory = directory
+        self._datasets = {}
+        self._lock = threading.Lock()
+
+    def define(self, name):
+        """``fn()`` 이 만든 DataFrame 을 ``name`` 데이터셋으로 등록하는 데코레이터."""
+
+        def decorator(fn):
+            if name in self._datasets:
+                raise ValueError(f"Dataset '{name}' is already defined")
+            self._datasets[name] = _Dataset(name=name, build=fn)
+            return fn
+
+        return decorator
+
+    def __iter__(self):
+        return iter(self._datasets)
+
+    def file_for(self, name):
+        """데이터 디렉터리에서 ``name`` 의 파일 경로. 없으면 None."""
+        if not self.directory:
+            return None
+        for ext in FORMATS:
+            path = os.path.join(self.directory, name + ext)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def load(self, name):
+        """데이터셋 전체. 처음 한 번만 읽거나 만듭니다."""
+        ds = self._datasets[name]
+        with self._lock:
+            if ds.frame is None:
+                ds.path = self.file_for(name)
+                if ds.path is None:
+                    ds.frame = ds.build()
+                else:
+                    ds.table = _read_table(ds.path)
+                    ds.frame = _to_pandas(ds.table)
+            return ds.frame
+
+    def columns(self, name, columns):
+        """``columns`` 열만 가진 DataFrame (같은 열 조합이면 같은 객체)."""
+        columns = tuple(columns)
+        ds = self._datasets[name]
+        with self._lock:
+            view = ds.views.get(columns)
+        if view is not None:
+            return view
+        frame = self.load(name)
+        if ds.table is not None:
+            # 메모리 맵 테이블에서 필요한 열만 변환 (나머지 열은 페이지를 건드리지 않음)
+            view = _to_pandas(ds.table.select(list(columns) + _index_columns(ds.table.schema)))
+        else:
+            view = frame[list(columns)]
+        with self._lock:
+            return ds.views.setdefault(columns, view)
+
+    def owner(self, frame):
+        """``frame`` 이 어떤 데이터셋 (또는 그 열 일부) 인지. 모르는 객체면 None."""
+        for ds in self._datasets.values():
+            if ds.frame is frame or any(view is frame for view in ds.views.values()):
+                return ds.name
+        return None
+
+    def export(self, directory, names=None):
+        """데이터셋을 ``<directory>/<이름>.arrow`` 로 저장하고 {이름: 바이트 수} 를 돌려줍니다."""
+        os.makedirs(directory, exist_ok=True)
+        return {
+            name: write_frame(os.path.join(directory, f"{name}.arrow"), self.load(name))
+            for name in (names or list(self))
+        }
+
+    def stats(self):
+        rows = []
+        for ds in self._datasets.values():
+            rows.append({
+                "name": ds.name,
+                "loaded": ds.frame is not None,
+                "source": ds.path or "builder",
+                "memory_mapped": ds.table is not None and not ds.path.endswith(".parquet"),
+                "rows": None if ds.frame is None else len(ds.frame),
+                "file_bytes": os.path.getsize(ds.path) if ds.path else None,
+                "views": [list(columns) for columns in ds.views],
+            })
+        return rows
+
+
+def main(argv=None):
+    from .scheduler import init_worker
+
+    parser = argparse.ArgumentParser(prog="python -m gallery.datasets", description=__doc__.split("\n")[0])
+    parser.add_argument("--app", default="phython_shiny", help="데이터셋 레지스트리(datasets)가 있는 앱 모듈")
+    parser.add_argument("--out", default="data", help="저장할 디렉터리 (GALLERY_DATA_DIR 로 지정)")
+    parser.add_argument("--only", nargs="+", help="이 데이터셋만")
+    args = parser.parse_args(argv)
+
+    init_worker(args.app, os.getcwd())
+    registry = sys.modules[args.app].datasets
+    for name, nbytes in registry.export(args.out, args.only).items():
+        print(f"{name:<16} {nbytes / 1024:10.1f} KiB  {os.path.join(args.out, name + '.arrow')}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""밀도 차트가 함께 쓰는 KDE 엔진.
+
+plotnine ``geom_density`` / ``geom_violin``, seaborn ``kdeplot`` / ``pairplot(diag_kind='kde')`` 는 차트를 그릴
+때마다, 그리고 그룹(패널)마다 따로 KDE 를 계산합니다. 여기서는 ``aggregate.kde`` 로 모든 그룹을 한 격자
+위에서 한 번에 (구간 집계 + FFT 합성곱) 계산하고, 결과를 (데이터 지문, 열, 그룹 열, 대역폭/격자 옵션) 별로
+보관합니다. 차트는 미리 계산한 곡선만 그리므로 행 수가 늘어도 밀도 계산 비용은 거의 그대로입니다.
+
+옵션은 그리던 라이브러리의 기본값에 맞춥니다.
+
+- plotnine (``geom_density``, ``geom_violin``): ``bw="nrd0"``, 격자 1024 (``aggregate.KDE_POINTS``), 전체 범위 (바이올린은 그룹 범위)
+- seaborn (``kdeplot``): :data:`SEABORN` (``bw="scott"``, 격자 200, 그룹마다 범위 + 3 x 대역폭)
+
+결과 표는 여러 차트/세션이 공유하므로 수정하지 마세요.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+from . import aggregate
+from .cache import data_fingerprint
+
+# seaborn kdeplot 의 기본 추정 옵션
+SEABORN = {"bw": "scott", "n": 200, "cut": 3, "common_grid": False}
+
+
+class DensityEngine:
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.computations = 0
+
+    def _cached(self, key, compute):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+        value = compute()
+        with self._lock:
+            self.computations += 1
+            self._entries[key] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def kde(self, df, x, *, group=None, **options):
+        """``aggregate.kde`` 와 같은 표: [group], x, density, scaled, n."""
+        key = ("kde", data_fingerprint(df), x, group, tuple(sorted(options.items())))
+        return self._cached(key, lambda: aggregate.kde(df, x, group=group, **options))
+
+    def violin(self, df, y, *, group, **options):
+        """``aggregate.violin`` 과 같은 ``geom_violin(stat='identity')`` 용 표."""
+        key = ("violin", data_fingerprint(df), y, group, tuple(sorted(options.items())))
+        return self._cached(key, lambda: aggregate.violin(df, y, group=group, **options))
+
+    def curves(self, df, x, *, group=None, **options):
+        """{그룹 값: (격자, 밀도)} (그룹이 없으면 키는 None). 표를 그룹별로 나누지 않고 배열을 잘라 씁니다."""
+        out = self.kde(df, x, group=group, **options)
+        n = options.get("n", aggregate.KDE_POINTS)
+        grid = out["x"].to_numpy().reshape(-1, n)
+        density = out["density"].to_numpy().reshape(-1, n)
+        labels = out[group].to_numpy()[::n] if group is not None else [None]
+        return dict(zip(labels, zip(grid, density)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "computations": self.computations}
+
+
+density = DensityEngine(int(os.environ.get("GALLERY_DENSITY_CACHE", 128)))
+
+
+def fill_curve(ax, x, y, *, color, alpha=0.25, label=None):
+    """seaborn ``kdeplot(fill=True)`` 처럼 곡선 아래를 채워 그립니다 (테두리는 불투명)."""
+    from matplotlib.colors import to_rgba
+
+    artist = ax.fill_between(x, 0, y, facecolor=to_rgba(color, alpha), edgecolor=to_rgba(color, 1), label=label)
+    # 자동 축 범위에서 0 아래 여백을 두지 않음
+    artist.sticky_edges.y[:] = (0, float("inf"))
+    return artist
@@ -0,0 +1,137 @@
+"""원본 데이터에서 파생된 집계(상관계수, 그룹별 개수, 요약 통계)를 공유하는 계층.
+
+집계는 원본 데이터 버전마다 한 번만 계산되고, 모든 세션/차트가 같은 결과 객체를
+받습니다. 원본이 바뀌면 (``set_source``) 집계가 사용하는 열이 실제로 바뀐 경우에만
+다시 계산합니다.
+
+``DerivedData(view=...)`` 를 주면 집계는 ``view(원본)`` 이 돌려준 (걸러진 frame, 필터 상태) 로 계산하고
+상태별로 결과를 따로 보관합니다 (``gallery/crossfilter.py`` 의 ``CrossFilter.scoped``). 필터가 바뀌면
+그 데이터셋의 집계만, 그것도 처음 보는 상태일 때만 다시 계산합니다.
+
+결과 객체는 여러 차트가 공유하므로 수정하지 말고, 필요하면 복사해서 사용하세요.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from .metrics import data_phase
+
+
+def _column_hashes(df, columns):
+    return {
+        col: int(pd.util.hash_pandas_object(df[col], index=True).sum())
+        for col in columns
+    }
+
+
+def _freeze(value):
+    # numpy 배열은 읽기 전용으로 (DataFrame 은 copy-on-write 로 보호)
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    return value
+
+
+@dataclass
+class _Aggregate:
+    name: str
+    source: str
+    fn: Callable
+    columns: Optional[tuple]
+    value: object = None
+    # 계산 당시 사용한 열들의 해시 (None 이면 아직 계산 안 함)
+    version: Optional[dict] = None
+    # 필터 상태 → (버전, 값). 최근 상태만 보관
+    filtered: OrderedDict = field(default_factory=OrderedDict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class DerivedData:
+    def __init__(self, view=None, max_filtered=16):
+        self._view = view
+        self.max_filtered = max_filtered
+        self._sources = {}
+        self._source_hashes = {}
+        self._aggregates = {}
+        self._lock = threading.Lock()
+        self.computations = 0
+
+    def set_source(self, name, frame):
+        """원본 데이터를 등록하거나 교체합니다."""
+        with self._lock:
+            self._sources[name] = frame
+            # 열 해시는 필요할 때 계산
+            self._source_hashes[name] = {}
+
+    def source(self, name):
+        return self._sources[name]
+
+    def define(self, source, *, columns=None):
+        """``fn(frame)`` 을 ``source`` 의 파생 집계로 등록하는 데코레이터.
+
+        ``columns`` 를 알려주면 원본이 바뀌어도 해당 열이 그대로일 때는 다시 계산하지 않습니다.
+        """
+
+        def decorator(fn):
+            self._aggregates[fn.__name__] = _Aggregate(
+                name=fn.__name__,
+                source=source,
+                fn=fn,
+                columns=tuple(columns) if columns is not None else None,
+            )
+            return fn
+
+        return decorator
+
+    def _current_version(self, agg):
+        frame = self._sources[agg.source]
+        columns = agg.columns if agg.columns is not None else tuple(frame.columns)
+        with self._lock:
+            known = self._source_hashes[agg.source]
+            missing = [c for c in columns if c not in known]
+        if missing:
+            hashes = _column_hashes(frame, missing)
+            with self._lock:
+                known.update(hashes)
+        # 행 수가 바뀐 경우도 구분
+        return {"__len__": len(frame), **{c: known[c] for c in columns}}
+
+    @data_phase
+    def get(self, name):
+        agg = self._aggregates[name]
+        version = self._current_version(agg)
+        frame = self._sources[agg.source]
+        state = ()
+        if self._view is not None:
+            frame, state = self._view(frame)
+        if state:
+            return self._get_filtered(agg, version, frame, state)
+        with agg.lock:
+            if agg.version != version:
+                agg.value = _freeze(agg.fn(frame))
+                agg.version = version
+                self.computations += 1
+            return agg.value
+
+    def _get_filtered(self, agg, version, frame, state):
+        with agg.lock:
+            entry = agg.filtered.get(state)
+            if entry is not None and entry[0] == version:
+                agg.filtered.move_to_end(state)
+                return entry[1]
+            value = _freeze(agg.fn(frame))
+            agg.filtered[state] = (version, value)
+            agg.filtered.move_to_end(state)
+            while len(agg.filtered) > self.max_filtered:
+                agg.filtered.popitem(last=False)
+            self.computations += 1
+            return value
+
+    __getitem__ = get
+
+    def names(self):
+        return list(self._aggregates)
@@ -0,0 +1,222 @@
+"""렌더링 계측 결과를 보여주는 곳: 메트릭 엔드포인트, 숨겨진 진단 탭, cProfile 캡처.
+
+- ``GET /metrics``: 출력별 렌더링 통계, 렌더 캐시, figure 수를 JSON 으로 (``?format=prometheus`` 는 텍스트)
+- ``GET /metrics/profile/<output id>``: 차트 하나를 cProfile 로 한 번 렌더링한 결과
+  (``GALLERY_PROFILING=1`` 일 때만)
+- 주소에 ``?diagnostics=1`` 을 붙여 열면 "Diagnostics" 탭이 추가됩니다.
+
+모두 인증 없이 내부 상태를 보여 주고 프로파일링은 캐시를 거치지 않고 렌더링하므로, ``GALLERY_METRICS=1`` 일 때만
+켜집니다 (``METRICS``).
+"""
+
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+
+import pandas as pd
+from shiny import reactive, render, req, ui
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+
+from .artifacts import artifacts
+from .backends import startup
+from .cache import render_cache
+from .density import density
+from .figures import figures
+from .metrics import metrics
+from .rasterize import PLOT_FORMAT, skeletons
+from .render import offline_render, size_hints
+from .sizing import PLOT_BUCKETS, RESIZE_DEBOUNCE
+
+METRICS = os.environ.get("GALLERY_METRICS") == "1"
+PHASES = ("data", "build", "rasterize", "serialize")
+DEFAULT_PROFILE_SIZE = (800, 400, 1)
+
+
+def metrics_payload():
+    return {
+        "pid": os.getpid(),
+        "outputs": metrics.snapshot(),
+        "cache": render_cache.stats(),
+        "figures": figures.stats(),
+        "plotnine_skeletons": skeletons.stats(),
+        "density": density.stats(),
+        "artifacts": artifacts.stats(),
+        "plot_sizing": {
+            "buckets": list(PLOT_BUCKETS),
+            "format": PLOT_FORMAT,
+            "resize_debounce_ms": round(RESIZE_DEBOUNCE * 1000),
+        },
+        "startup": [
+            {"kind": kind, "name": name, "seconds": seconds}
+            for kind, name, seconds, _ in startup.entries
+        ],
+    }
+
+
+def prometheus_text(payload):
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f"# HELP gallery_{name} {help_text}")
+        lines.append(f"# TYPE gallery_{name} {kind}")
+        for labels, value in samples:
+            label_text = ",".join(f'{k}="{v}"' for k, v in labels.items())
+            lines.append(f"gallery_{name}{{{label_text}}} {value}")
+
+    outputs = payload["outputs"]
+    metric("renders_total", "counter", "Renders per output",
+           [({"output": row["output"]}, row["renders"]) for row in outputs])
+    metric("cache_hits_total", "counter", "Render cache hits per output",
+           [({"output": row["output"]}, row["cache_hits"]) for row in outputs])
+    metric("render_errors_total", "counter", "Render errors per output",
+           [({"output": row["output"]}, row["errors"]) for row in outputs])
+    metric("render_seconds_total", "counter", "Render time per output and phase",
+           [({"output": row["output"], "phase": name}, value)
+            for row in outputs for name, value in row["phases"].items()])
+    metric("payload_bytes", "gauge", "Size of the last rendered value per output",
+           [({"output": row["output"]}, row["bytes_last"]) for row in outputs])
+    metric("cache_bytes", "gauge", "Bytes held by the render cache",
+           [({}, payload["cache"]["bytes"])])
+    metric("figures_live", "gauge", "Live matplotlib figures",
+           [({}, payload["figures"]["live"])])
+    shared = payload["cache"]["shared"]
+    if shared is not None:
+        metric("shared_cache_hits_total", "counter", "Renders read from the cross-process cache",
+               [({}, shared["hits"])])
+        metric("shared_cache_bytes", "gauge", "Bytes held by the cross-process cache",
+               [({}, shared["bytes"])])
+    return "\n".join(lines) + "\n"
+
+
+def profile_chart(spec, *, sort="cumulative", limit=40):
+    """차트 하나를 cProfile 로 (캐시 없이) 렌더링하고 pstats 결과를 텍스트로 돌려줍니다."""
+    size = size_hints.get(spec.id, DEFAULT_PROFILE_SIZE) if spec.kind == "plot" else None
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        offline_render(spec, size)
+    finally:
+        profiler.disable()
+    out = io.StringIO()
+    stats = pstats.Stats(profiler, stream=out)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return out.getvalue()
+
+
+def install_routes(app, registry):
+    """Shiny 앱에 ``/metrics`` (와 ``GALLERY_PROFILING=1`` 이면 프로파일) 경로를 추가합니다.
+
+    인증을 하지 않으므로 앱은 ``GALLERY_METRICS=1`` 일 때만 호출합니다.
+    """
+
+    async def metrics_endpoint(request):
+        payload = metrics_payload()
+        if request.query_params.get("format") == "prometheus":
+            return PlainTextResponse(prometheus_text(payload))
+        return JSONResponse(payload)
+
+    async def profile_endpoint(request):
+        try:
+            spec = registry.get(request.path_params["output"])
+        except KeyError:
+            return PlainTextResponse("unknown output\n", status_code=404)
+        # 프로파일링은 렌더링 시간이 걸리므로 이벤트 루프 밖에서
+        text = await asyncio.to_thread(profile_chart, spec, sort=request.query_params.get("sort", "cumulative"))
+        return PlainTextResponse(text)
+
+    routes = [Route("/metrics", metrics_endpoint, methods=["GET"])]
+    if os.environ.get("GALLERY_PROFILING") == "1":
+        routes.append(Route("/metrics/profile/{output}", profile_endpoint, methods=["GET"]))
+    # Shiny 의 "/" Mount 보다 앞에 둬야 함
+    app.starlette_app.router.routes[0:0] = routes
+
+
+def _metrics_frame():
+    rows = []
+    for row in metrics.snapshot():
+        rows.append({
+            "output": row["output"],
+            "renders": row["renders"],
+            "cache hits": row["cache_hits"],
+            "errors": row["errors"],
+            "mean ms": round(row["seconds_mean"] * 1000, 1),
+            "max ms": round(row["seconds_max"] * 1000, 1),
+            **{f"{name} ms": round(row["phases"].get(name, 0.0) * 1000, 1) for name in PHASES},
+            "last KiB": round(row["bytes_last"] / 1024, 1),
+        })
+    return pd.DataFrame(rows)
+
+
+def diagnostics_panel(registry):
+    return ui.nav_panel(
+        "Diagnostics",
+        ui.card(
+            ui.card_header("Render metrics (누적, 2초마다 갱신)"),
+            ui.output_text_verbatim("diagnostics_summary"),
+            ui.output_data_frame("diagnostics_table"),
+        ),
+        ui.card(
+            ui.card_header("cProfile"),
+            ui.layout_columns(
+                ui.input_select("diagnostics_profile_output", "Output", [spec.id for spec in registry]),
+                ui.input_action_button("diagnostics_profile", "Profile once"),
+                col_widths=(8, 4),
+            ),
+            ui.output_text_verbatim("diagnostics_profile_result"),
+        ),
+        value="Diagnostics",
+    )
+
+
+def diagnostics_server(input, session, registry, *, nav_id, refresh=2):
+    """주소에 ``?diagnostics=1`` 이 있으면 진단 탭을 추가합니다. ``GALLERY_METRICS=1`` 이 아니면 아무것도 하지 않습니다."""
+    if not METRICS:
+        return
+    # 탭을 추가한 세션에서만 주기적으로 갱신
+    enabled = reactive.value(False)
+
+    @reactive.effect
+    def _insert_panel():
+        search_id = ".clientdata_url_search"
+        if search_id not in input or "diagnostics=1" not in input[search_id]():
+            return
+        with reactive.isolate():
+            if enabled():
+                return
+            ui.insert_nav_panel(nav_id, diagnostics_panel(registry))
+            enabled.set(True)
+
+    @render.text
+    def diagnostics_summary():
+        req(enabled())
+        reactive.invalidate_later(refresh)
+        cache, figs = render_cache.stats(), figures.stats()
+        text = (
+            f"pid {os.getpid()}\n"
+            f"cache: {cache['entries']} entries, {cache['bytes'] / 2**20:.1f} MiB, "
+            f"hit rate {cache['hit_rate']:.0%}\n"
+            f"figures: {figs['live']} live, {figs['raster_bytes'] / 2**20:.1f} MiB raster, "
+            f"pyplot open {figs['pyplot_open']}"
+        )
+        shared = cache["shared"]
+        if shared is not None:
+            text += (f"\nshared cache: {shared['entries']} entries, {shared['bytes'] / 2**20:.1f} MiB, "
+                     f"{shared['hits']} hits")
+        return text
+
+    @render.data_frame
+    def diagnostics_table():
+        req(enabled())
+        reactive.invalidate_later(refresh)
+        return render.DataGrid(_metrics_frame(), width="100%")
+
+    @render.text
+    @reactive.event(input.diagnostics_profile)
+    async def diagnostics_profile_result():
+        # 탭을 연 세션에서만 (입력을 직접 보내 프로파일링을 돌리지 못하게)
+        req(enabled())
+        spec = registry.get(input.diagnostics_profile_output())
+        return await asyncio.to_thread(profile_chart, spec)
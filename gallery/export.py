@@ -0,0 +1,240 @@
+"""갤러리 전체를 미리 렌더링해 파일로 내보내고, 앱 시작 시 렌더 캐시로 불러오기.
+
+    python -m gallery.export --out prerendered --jobs 4 --size 800x400@1 --size 800x400@2
+
+레지스트리의 모든 (캐시 가능한) 차트를 프로세스 풀에서 렌더링해 PNG / SVG / Plotly JSON /
+HTML 파일과 ``manifest.json`` 으로 저장합니다. 앱은 ``GALLERY_PRERENDERED=<디렉터리>`` 로
+실행하면 시작할 때 이 결과를 렌더 캐시에 넣으므로, 정적 차트는 요청 시 CPU 를 쓰지 않습니다.
+
+각 항목에는 데이터 지문과 소스 해시 (앱 모듈 + ``gallery`` 패키지) 가 기록되며, 현재 데이터나 코드와 맞지 않는 항목은
+불러오지 않습니다 (그 차트는 평소처럼 세션에서 렌더링).
+"""
+
+import argparse
+import base64
+import hashlib
+import io
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from .cache import data_fingerprint, render_cache
+from .scheduler import init_worker, worker_registry
+
+MANIFEST = "manifest.json"
+MANIFEST_VERSION = 1
+DEFAULT_SIZES = ((800, 400, 1), (800, 400, 2))
+SVG_DPI = 96
+
+
+def parse_size(text):
+    """``"800x400@2"`` → (800, 400, 2). pixelratio 는 생략하면 1."""
+    dims, _, ratio = text.partition("@")
+    width, height = dims.lower().split("x")
+    return int(width), int(height), float(ratio) if ratio else 1
+
+
+def source_hash(module):
+    """앱 모듈과 ``gallery`` 패키지 소스의 해시. 렌더링 코드가 바뀌면 미리 렌더링한 결과도 버립니다."""
+    package = os.path.dirname(os.path.abspath(__file__))
+    h = hashlib.sha1()
+    for path in [module.__file__, *sorted(glob.glob(os.path.join(package, "*.py")))]:
+        with open(path, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()[:16]
+
+
+def _json_default(obj):
+    # coordmap 등에 섞여 있는 numpy 스칼라
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _write(directory, name, data):
+    path = os.path.join(directory, name)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return len(data)
+
+
+def _to_svg(make, width, height):
+    from .figures import figures
+
+    buf = io.BytesIO()
+    with figures.scope():
+        # figure 는 범위 안에서 만들어야 범위를 벗어날 때 정리됨
+        obj = make()
+        if hasattr(obj, "save") and hasattr(obj, "draw"):  # plotnine ggplot
+            obj.save(buf, format="svg", width=width / SVG_DPI, height=height / SVG_DPI,
+                     units="in", dpi=SVG_DPI, verbose=False)
+        else:
+            obj.set_size_inches(width / SVG_DPI, height / SVG_DPI)
+            obj.savefig(buf, format="svg", dpi=SVG_DPI)
+    return buf.getvalue()
+
+
+# ---- 워커 프로세스 -----------------------------------------------------------
+
+def _export_chart(chart_id, out_dir, sizes, svg):
+    from .render import offline_render
+
+    spec = worker_registry().get(chart_id)
+    base = {"id": spec.id, "kind": spec.kind, "tab": spec.tab, "data": data_fingerprint(*spec.data)}
+    entries = []
+    started = time.perf_counter()
+    if spec.kind == "plot":
+        for width, height, pixelratio in sizes:
+            result = offline_render(spec, (width, height, pixelratio))
+            if result is None:
+                continue
+            _, value = result
+            header, _, encoded = value["src"].partition(",")
+            name = f"{spec.id}-{width}x{height}@{pixelratio:g}.png"
+            entry = {
+                **base,
+                "size": [width, height, pixelratio],
+                "file": name,
+                "bytes": _write(out_dir, name, base64.b64decode(encoded)),
+                "media_type": header[len("data:"):].split(";")[0],
+                # src 를 뺀 나머지 ImgData 속성 (width/height/coordmap 등)
+                "attrs": json.loads(json.dumps(
+                    {k: v for k, v in value.items() if k != "src"}, default=_json_default
+                )),
+            }
+            if svg and pixelratio == 1:
+                svg_name = f"{spec.id}-{width}x{height}.svg"
+                _write(out_dir, svg_name, _to_svg(spec.fn, width, height))
+                entry["svg"] = svg_name
+            entries.append(entry)
+    else:
+        result = offline_render(spec)
+        if result is not None:
+            _, value = result
+            if spec.kind == "plotly":
+                name = f"{spec.id}.plotly.json"
+                data = json.dumps(value, separators=(",", ":")).encode()
+            else:
+                name = f"{spec.id}.html"
+                data = value["html"].encode()
+            entries.append({**base, "file": name, "bytes": _write(out_dir, name, data)})
+    elapsed = time.perf_counter() - started
+    for entry in entries:
+        entry["seconds"] = round(elapsed / len(entries), 4)
+    return entries
+
+
+# ---- 내보내기 / 불러오기 ------------------------------------------------------
+
+def export_gallery(app_module, out_dir, *, sizes=DEFAULT_SIZES, jobs=None, svg=False,
+                   only=None, app_dir=None):
+    """모든 캐시 가능한 차트를 ``out_dir`` 로 내보내고 manifest dict 를 반환합니다."""
+    app_dir = os.path.abspath(app_dir or os.getcwd())
+    init_worker(app_module, app_dir)
+    registry = worker_registry()
+    specs = [spec for spec in registry if spec.cache and spec.kind in ("plot", "plotly", "ui")]
+    if only:
+        specs = [spec for spec in specs if spec.id in only]
+    os.makedirs(out_dir, exist_ok=True)
+
+    entries, errors = [], {}
+    started = time.perf_counter()
+    # 스케줄러와 같이 spawn 사용 (부모의 스레드/잠금 상태를 물려받지 않음)
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=init_worker, initargs=(app_module, app_dir)) as pool:
+        futures = {
+            pool.submit(_export_chart, spec.id, out_dir, tuple(sizes), svg): spec.id
+            for spec in specs
+        }
+        for future in as_completed(futures):
+            try:
+                entries.extend(future.result())
+            except Exception as e:
+                errors[futures[future]] = f"{type(e).__name__}: {e}"
+
+    order = {spec.id: i for i, spec in enumerate(specs)}
+    entries.sort(key=lambda e: (order[e["id"]], e.get("size", [])))
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "app": app_module,
+        "source": source_hash(sys.modules[app_module]),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "seconds": round(time.perf_counter() - started, 3),
+        "entries": entries,
+        "errors": errors,
+    }
+    _write(out_dir, MANIFEST, json.dumps(manifest, indent=1, ensure_ascii=False).encode())
+    return manifest
+
+
+def load_prerendered(directory, registry, app_module):
+    """manifest 의 결과 중 현재 데이터/코드와 맞는 항목을 렌더 캐시에 넣고 개수를 반환합니다."""
+    from .rasterize import PLOT_FORMAT
+    from .render import _payload_size, cache_key_for
+
+    with open(os.path.join(directory, MANIFEST), encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != MANIFEST_VERSION or manifest.get("source") != source_hash(app_module):
+        return 0
+
+    plot_media_type = "image/svg+xml" if PLOT_FORMAT == "svg" else "image/png"
+    loaded = 0
+    for entry in manifest["entries"]:
+        try:
+            spec = registry.get(entry["id"])
+        except KeyError:
+            continue
+        if spec.kind != entry["kind"] or data_fingerprint(*spec.data) != entry["data"]:
+            continue
+        # PNG 로 내보낸 결과를 SVG 모드의 캐시 키로 넣지 않음
+        if spec.kind == "plot" and entry["media_type"] != plot_media_type:
+            continue
+        size = tuple(entry["size"]) if "size" in entry else None
+        key = cache_key_for(spec, size)
+        if key is None:
+            continue
+        with open(os.path.join(directory, entry["file"]), "rb") as f:
+            data = f.read()
+        if spec.kind == "plot":
+            src = f"data:{entry['media_type']};base64," + base64.b64encode(data).decode("ascii")
+            value = {"src": src, **entry["attrs"]}
+        elif spec.kind == "plotly":
+            value = json.loads(data)
+        else:
+            value = {"deps": [], "html": data.decode()}
+        render_cache.put(key, value, _payload_size(value))
+        loaded += 1
+    return loaded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m gallery.export", description=__doc__.split("\n")[0])
+    parser.add_argument("--app", default="phython_shiny", help="차트 레지스트리(charts)가 있는 앱 모듈")
+    parser.add_argument("--out", default="prerendered", help="출력 디렉터리")
+    parser.add_argument("--jobs", type=int, default=None, help="워커 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--size", action="append", type=parse_size,
+                        help="plot 크기 WIDTHxHEIGHT[@PIXELRATIO], 여러 번 지정 가능")
+    parser.add_argument("--svg", action="store_true", help="plot 을 SVG 로도 저장")
+    parser.add_argument("--only", nargs="+", help="이 차트들만 내보내기")
+    args = parser.parse_args(argv)
+
+    manifest = export_gallery(args.app, args.out, sizes=args.size or DEFAULT_SIZES,
+                              jobs=args.jobs, svg=args.svg, only=args.only)
+    total = sum(e["bytes"] for e in manifest["entries"])
+    print(f"{len(manifest['entries'])} artifacts, {total / 1024:.0f} KiB, "
+          f"{manifest['seconds']:.1f}s -> {args.out}")
+    for chart_id, error in manifest["errors"].items():
+        print(f"  failed {chart_id}: {error}", file=sys.stderr)
+    return 1 if manifest["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""matplotlib figure 수명 관리.
+
+``plt.subplots`` 로 만든 figure 는 pyplot 의 전역 figure 관리자에 등록되어, 닫지 않으면
+워커가 오래 돌수록 계속 쌓입니다. 여기서는 pyplot 을 거치지 않는 객체지향 ``Figure`` API 로
+figure 를 만들고, 렌더링(래스터화)이 끝나면 ``scope()`` 를 빠져나갈 때 모두 정리합니다.
+
+``figures.stats()`` 는 현재 살아 있는 figure 수와 잡고 있는 래스터 버퍼 크기를 돌려줍니다.
+"""
+
+import sys
+import threading
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# 현재 렌더링 범위에서 만들어진 figure 목록
+_current_scope = ContextVar("figure_scope", default=None)
+
+
+class FigureFactory:
+    def __init__(self, prepare=None):
+        # figure 를 만들기 전에 호출 (rcParams 스타일을 먼저 적용해야 할 때)
+        self.prepare = prepare
+        self._live = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self.created = 0
+        self.released = 0
+
+    def _track(self, fig):
+        with self._lock:
+            self._live.add(fig)
+            self.created += 1
+        scope = _current_scope.get()
+        if scope is not None:
+            scope.append(fig)
+        return fig
+
+    def figure(self, figsize=None, **kwargs):
+        """pyplot 에 등록되지 않는 Figure (Agg 캔버스)."""
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        if self.prepare is not None:
+            self.prepare()
+        fig = Figure(figsize=figsize, **kwargs)
+        FigureCanvasAgg(fig)
+        return self._track(fig)
+
+    def subplots(self, nrows=1, ncols=1, *, figsize=None, **kwargs):
+        """``plt.subplots`` 와 같은 (fig, ax) 를 돌려주지만 pyplot 상태를 쓰지 않습니다."""
+        fig = self.figure(figsize=figsize)
+        return fig, fig.subplots(nrows, ncols, **kwargs)
+
+    def adopt(self, fig):
+        """pyplot 으로 만들어진 figure (예: ``sns.pairplot``) 를 pyplot 에서 떼어 내 관리합니다."""
+        if "matplotlib.pyplot" in sys.modules:
+            sys.modules["matplotlib.pyplot"].close(fig)
+        return self._track(fig)
+
+    def release(self, fig):
+        with self._lock:
+            if fig not in self._live:
+                return
+            self._live.discard(fig)
+            self.released += 1
+        if "matplotlib.pyplot" in sys.modules:
+            sys.modules["matplotlib.pyplot"].close(fig)
+        # 아티스트와 캐시된 래스터 버퍼를 바로 놓아 줌
+        fig.clear()
+        if hasattr(fig.canvas, "renderer"):
+            del fig.canvas.renderer
+
+    @contextmanager
+    def scope(self):
+        """이 범위 안에서 만든 figure 는 범위를 벗어날 때 (예외가 나도) 정리합니다."""
+        created = []
+        token = _current_scope.set(created)
+        try:
+            yield created
+        finally:
+            _current_scope.reset(token)
+            for fig in created:
+                self.release(fig)
+
+    def stats(self):
+        with self._lock:
+            live = list(self._live)
+            created, released = self.created, self.released
+        raster_bytes = 0
+        for fig in live:
+            renderer = getattr(fig.canvas, "renderer", None)
+            if renderer is not None:
+                raster_bytes += int(renderer.width) * int(renderer.height) * 4
+        pyplot_open = None
+        if "matplotlib.pyplot" in sys.modules:
+            pyplot_open = len(sys.modules["matplotlib.pyplot"].get_fignums())
+        return {
+            "live": len(live),
+            "raster_bytes": raster_bytes,
+            "created": created,
+            "released": released,
+            "pyplot_open": pyplot_open,
+        }
+
+
+figures = FigureFactory()
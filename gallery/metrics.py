@@ -0,0 +1,143 @@
+"""출력별 렌더링 계측.
+
+렌더링 한 번을 단계별로 나눠 시간을 잽니다 (단계 시간은 서로 겹치지 않음).
+
+- ``data``: 파생 집계 / 대용량 집계 (``derived[...]``, ``gallery.aggregate``)
+- ``build``: 차트 함수에서 figure 객체를 만드는 시간 (``data`` 제외)
+- ``rasterize``: plot 을 PNG 로 변환 (plotnine 은 통계 계산도 여기서 수행)
+- ``serialize``: Plotly figure JSON / HTML 변환
+
+``metrics.snapshot()`` 은 출력별 렌더 횟수, 캐시 적중, 오류, 단계별 시간, 전송 크기를 돌려줍니다.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+# 현재 렌더링의 타이머 (없으면 계측하지 않음)
+_current_timer = ContextVar("render_timer", default=None)
+
+
+class RenderTimer:
+    """렌더링 한 번의 단계별 (배타적) 시간."""
+
+    def __init__(self):
+        self.phases = {}
+        # 렌더 결과(전송 값)의 크기. 렌더링하는 쪽에서 채움
+        self.nbytes = 0
+        self._stack = []
+        self._mark = None
+
+    @contextmanager
+    def phase(self, name):
+        now = time.perf_counter()
+        # 바깥 단계의 시간은 안쪽 단계가 도는 동안 멈춤
+        if self._stack:
+            outer = self._stack[-1]
+            self.phases[outer] = self.phases.get(outer, 0.0) + now - self._mark
+        self._stack.append(name)
+        self._mark = now
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            self.phases[name] = self.phases.get(name, 0.0) + now - self._mark
+            self._stack.pop()
+            self._mark = now
+
+
+@contextmanager
+def timing():
+    """이 범위 안의 ``phase()`` 를 기록하는 타이머를 시작합니다."""
+    timer = RenderTimer()
+    token = _current_timer.set(timer)
+    try:
+        yield timer
+    finally:
+        _current_timer.reset(token)
+
+
+@contextmanager
+def phase(name):
+    """현재 렌더링 타이머에 단계를 기록합니다 (타이머가 없으면 아무 일도 하지 않음)."""
+    timer = _current_timer.get()
+    if timer is None:
+        yield
+        return
+    with timer.phase(name):
+        yield
+
+
+def data_phase(fn):
+    """함수 실행 시간을 ``data`` 단계로 기록하는 데코레이터."""
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        with phase("data"):
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+
+class RenderMetrics:
+    def __init__(self):
+        self._outputs = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, output_id):
+        entry = self._outputs.get(output_id)
+        if entry is None:
+            entry = self._outputs[output_id] = {
+                "renders": 0,
+                "cache_hits": 0,
+                "errors": 0,
+                "bytes_last": 0,
+                "bytes_max": 0,
+                "seconds_total": 0.0,
+                "seconds_max": 0.0,
+                "seconds_last": 0.0,
+                "phases": {},
+            }
+        return entry
+
+    def observe(self, output_id, phases, nbytes):
+        """렌더링 한 번의 단계별 시간(초)과 전송 크기를 기록합니다."""
+        seconds = sum(phases.values())
+        with self._lock:
+            entry = self._entry(str(output_id))
+            entry["renders"] += 1
+            entry["bytes_last"] = nbytes
+            entry["bytes_max"] = max(entry["bytes_max"], nbytes)
+            entry["seconds_total"] += seconds
+            entry["seconds_max"] = max(entry["seconds_max"], seconds)
+            entry["seconds_last"] = seconds
+            for name, value in phases.items():
+                entry["phases"][name] = entry["phases"].get(name, 0.0) + value
+
+    def hit(self, output_id):
+        with self._lock:
+            self._entry(str(output_id))["cache_hits"] += 1
+
+    def error(self, output_id):
+        with self._lock:
+            self._entry(str(output_id))["errors"] += 1
+
+    def snapshot(self):
+        """출력별 통계 (누적 렌더 시간이 긴 순서)."""
+        with self._lock:
+            rows = [
+                {"output": output_id, **entry, "phases": dict(entry["phases"])}
+                for output_id, entry in self._outputs.items()
+            ]
+        for row in rows:
+            row["seconds_mean"] = row["seconds_total"] / row["renders"] if row["renders"] else 0.0
+        return sorted(rows, key=lambda row: row["seconds_total"], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._outputs.clear()
+
+
+metrics = RenderMetrics()
@@ -0,0 +1,112 @@
+"""Plotly 차트를 HTML 문서 대신 압축된 figure JSON 으로 전송.
+
+- plotly.js 는 plotly 패키지에 포함된 파일을 페이지당 한 번만 로드합니다 (CDN 불필요, 오프라인 동작).
+- 서버는 figure JSON 만 보내고, 숫자 배열은 base64 typed array (``{"dtype", "bdata"}``) 로 인코딩합니다.
+- 레이아웃 템플릿은 세션마다 처음 한 번만 보내고 이후에는 id 로 참조합니다.
+- 클라이언트는 ``Plotly.react`` 로 기존 그래프를 제자리에서 갱신합니다.
+"""
+
+import base64
+import hashlib
+import json
+import os
+
+import numpy as np
+from htmltools import HTMLDependency, div
+
+WWW_DIR = os.path.join(os.path.dirname(__file__), "www")
+
+# plotly.js 가 typed array 로 받을 수 있는 dtype (int64 는 지원하지 않음)
+_TYPED_DTYPES = {"i1", "u1", "i2", "u2", "i4", "u4", "f4", "f8"}
+
+
+def plotly_dependencies():
+    import plotly
+
+    package_data = os.path.join(os.path.dirname(plotly.__file__), "package_data")
+    return [
+        HTMLDependency(
+            "plotly.js",
+            _plotlyjs_version(package_data),
+            source={"subdir": package_data},
+            script={"src": "plotly.min.js"},
+            all_files=False,
+        ),
+        HTMLDependency(
+            "gallery-plotly-output",
+            "1.1.0",
+            source={"subdir": WWW_DIR},
+            script={"src": "plotly-output.js"},
+            all_files=False,
+        ),
+    ]
+
+
+def _plotlyjs_version(package_data):
+    # 파일 머리말 "plotly.js vX.Y.Z" 에서 버전을 읽음 (캐시 무효화용)
+    with open(os.path.join(package_data, "plotly.min.js"), encoding="utf-8") as f:
+        head = f.read(200)
+    marker = "plotly.js v"
+    if marker in head:
+        return head.split(marker, 1)[1].split()[0]
+    return "0.0.0"
+
+
+def output_plotly(id, height="450px"):
+    """Plotly figure JSON 을 받는 출력 컨테이너 (``ui.output_ui`` 대신 사용)."""
+    return div(
+        plotly_dependencies(),
+        id=id,
+        class_="gallery-plotly-output",
+        style=f"width:100%;height:{height};",
+    )
+
+
+def _typed_array(arr):
+    if arr.dtype.kind == "b":
+        arr = arr.astype("u1")
+    elif arr.dtype.kind in "iu" and arr.dtype.str[1:] not in _TYPED_DTYPES:
+        info = np.iinfo(np.int32)
+        fits = arr.size == 0 or (arr.min() >= info.min and arr.max() <= info.max)
+        arr = arr.astype("i4" if fits else "f8")
+    arr = np.ascontiguousarray(arr, dtype=arr.dtype.newbyteorder("<"))
+    out = {"dtype": arr.dtype.str[1:], "bdata": base64.b64encode(arr.tobytes()).decode("ascii")}
+    if arr.ndim > 1:
+        out["shape"] = ",".join(str(n) for n in arr.shape)
+    return out
+
+
+def encode_arrays(obj):
+    """figure dict 안의 숫자 numpy 배열을 base64 typed array 로 바꿉니다."""
+    if isinstance(obj, np.ndarray):
+        if obj.dtype.kind in "biuf" and obj.ndim >= 1:
+            return _typed_array(obj)
+        return obj.tolist()
+    if isinstance(obj, dict):
+        return {k: encode_arrays(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [encode_arrays(v) for v in obj]
+    return obj
+
+
+def figure_payload(fig, *, uirevision=None):
+    """figure 를 (템플릿을 뺀 figure dict, 템플릿 id, 템플릿 dict) 로 변환합니다."""
+    from plotly.utils import PlotlyJSONEncoder
+
+    def to_jsonable(obj):
+        return json.loads(json.dumps(obj, cls=PlotlyJSONEncoder))
+
+    fig_dict = fig.to_plotly_json()
+    layout = dict(fig_dict.get("layout", {}))
+    template = layout.pop("template", None)
+    if uirevision is not None:
+        # 데이터가 바뀌어도 사용자의 줌/선택 상태 유지
+        layout.setdefault("uirevision", uirevision)
+    fig_dict = {"data": fig_dict.get("data", []), "layout": layout}
+    # 남은 값(날짜, pandas 객체 등)은 plotly 의 JSON 인코더로 처리
+    figure = to_jsonable(encode_arrays(fig_dict))
+    if template is None:
+        return figure, None, None
+    template = to_jsonable(template)
+    template_id = hashlib.sha1(json.dumps(template, sort_keys=True).encode()).hexdigest()[:12]
+    return figure, template_id, template
@@ -0,0 +1,58 @@
+"""점진적 렌더링용 미리보기 도우미.
+
+무거운 차트는 ``@charts.preview(chart)`` 로 가벼운 미리보기 함수를 함께 등록합니다. 세션은 미리보기를
+먼저 (낮은 해상도로) 보내고, 전체 렌더링이 백그라운드에서 끝나면 그 결과로 바꿉니다 (``gallery/render.py``).
+미리보기는 표본 추출, KDE 대신 히스토그램, 축 하나에 그리기처럼 원래 차트의 모양만 빠르게 보여 주면 됩니다.
+"""
+
+import numpy as np
+
+# 미리보기에 쓰는 최대 행 수
+PREVIEW_ROWS = 300
+
+
+def sample(df, n=PREVIEW_ROWS, *, seed=0):
+    """최대 ``n`` 행의 표본 (행이 적으면 그대로). 같은 데이터면 항상 같은 표본입니다."""
+    if len(df) <= n:
+        return df
+    return df.sample(n, random_state=seed)
+
+
+def scatter_matrix(ax, df, columns, *, hue, n=PREVIEW_ROWS, bins=12, gap=0.15):
+    """``sns.pairplot`` 모양의 산점도 행렬을 축 하나에 그립니다 (대각선은 히스토그램).
+
+    패널마다 축을 만들지 않고 값을 [0, 1] 로 맞춰 격자 위치에 옮겨 그리므로, 축 16개를 배치하고 그리는
+    pairplot 보다 훨씬 빠릅니다. 눈금은 없고 변수 이름만 표시합니다.
+    """
+    # 색 순서는 pairplot 처럼 전체 데이터에서 처음 나오는 순서
+    levels = df[hue].dropna().unique()
+    df = sample(df, n)
+    step = 1 + gap
+    scaled = {}
+    for column in columns:
+        values = df[column].to_numpy(dtype=float)
+        lo, hi = np.nanmin(values), np.nanmax(values)
+        scaled[column] = (values - lo) / ((hi - lo) or 1)
+    groups = df[hue].to_numpy()
+    for k, level in enumerate(levels):
+        mask = groups == level
+        color = f"C{k}"
+        xs, ys = [], []
+        for i, y in enumerate(columns):
+            for j, x in enumerate(columns):
+                if i == j:
+                    counts, edges = np.histogram(scaled[x][mask], bins=bins, range=(0, 1))
+                    ax.stairs(-i * step + 0.9 * counts / max(1, counts.max()), j * step + edges,
+                              baseline=-i * step, fill=True, alpha=0.4, color=color)
+                else:
+                    xs.append(j * step + scaled[x][mask])
+                    ys.append(-i * step + scaled[y][mask])
+        ax.scatter(np.concatenate(xs), np.concatenate(ys), s=4, color=color, label=level)
+    for i, column in enumerate(columns):
+        ax.text(i * step + 0.5, -(len(columns) - 1) * step - gap, column, ha="center", va="top",
+                fontsize="small")
+        ax.text(-gap, -i * step + 0.5, column, ha="right", va="center", rotation=90,
+                fontsize="small")
+    ax.set_axis_off()
+    ax.legend(title=hue, loc="center left", bbox_to_anchor=(1, 0.5), frameon=False)
+    return ax
@@ -0,0 +1,299 @@
+"""세션 없이 plotnine / matplotlib 객체를 PNG ImgData 로 변환.
+
+``render.plot`` 과 같은 변환 함수를 그대로 쓰므로, 미리 렌더링한 결과와 세션에서
+렌더링한 결과가 동일합니다.
+
+plotnine 차트는 ``render.plot`` 의 변환과 같은 PNG / coordmap 을 만들되, coordmap 을 계산할 때
+plot 을 처음부터 다시 빌드(통계/위치 계산 포함)하지 않고 그림을 그릴 때 빌드한 것을 재사용합니다
+(``GALLERY_PLOTNINE_FASTPATH=0`` 이면 ``render.plot`` 의 변환을 그대로 사용).
+
+빠른 경로는 plotnine 의 내부 API(``ggplot._setup`` / ``_build`` / ``_draw_*``, ``plotnine._mpl.layout_manager``)를,
+변환 자체는 shiny 의 내부 모듈(``shiny.render._try_render_plot``, ``_coordmap``)을 씁니다. plotnine 0.15 /
+shiny 1.x 에서 확인했으며, 설치된 버전에 이 API 가 없으면 빠른 경로를 끄고 (``plotnine_internals()``),
+shiny 모듈이 없으면 ``AVAILABLE`` 이 False 가 되어 ``cached_plot`` 은 ``render.plot`` 의 평소 경로로 그립니다.
+
+``key=`` (차트 + 데이터 지문) 를 주면 빌드한 plot(학습된 스케일, 통계/위치 계산 결과, facet 배치)을
+골격으로 보관해 두고, 같은 키를 다른 크기/pixelratio 로 다시 렌더링할 때는 그리기만 합니다.
+
+``GALLERY_PLOT_FORMAT=svg`` 이면 PNG 대신 SVG 로 변환합니다 (브라우저가 어떤 크기로든 선명하게 확대/축소).
+점이 아주 많은 차트는 SVG 가 PNG 보다 훨씬 커지므로 가벼운 차트 위주일 때 쓰세요.
+"""
+
+import base64
+import functools
+import io
+import os
+import sys
+import threading
+from collections import OrderedDict
+from copy import deepcopy
+
+try:
+    from shiny.render._coordmap import get_coordmap, get_coordmap_plotnine
+    from shiny.render._try_render_plot import (
+        PlotSizeInfo,
+        cast_to_size_tuple,
+        get_desired_dpi_from_fig,
+        get_matplotlib_figure,
+        try_render_matplotlib,
+        try_render_plotnine,
+    )
+except ImportError:
+    # 내부 모듈이 바뀐 shiny 버전: 세션 밖 변환을 쓰지 않음
+    AVAILABLE = False
+else:
+    AVAILABLE = True
+
+PLOTNINE_FASTPATH = os.environ.get("GALLERY_PLOTNINE_FASTPATH", "1") != "0"
+PLOT_FORMAT = os.environ.get("GALLERY_PLOT_FORMAT", "png").lower()
+if PLOT_FORMAT not in ("png", "svg"):
+    raise ValueError(f"GALLERY_PLOT_FORMAT must be 'png' or 'svg', not '{PLOT_FORMAT}'")
+
+_MIME = {"png": "image/png", "svg": "image/svg+xml"}
+
+# 골격을 그릴 때 부르는 ggplot 의 내부 메서드
+_PLOTNINE_METHODS = (
+    "_setup", "_build", "_draw_layers", "_draw_panel_borders", "_draw_breaks_and_labels",
+    "_draw_figure_texts", "_draw_watermarks", "_draw_figure_background",
+)
+
+
+@functools.cache
+def plotnine_internals():
+    """빠른 경로가 쓰는 plotnine 내부 API 가 설치된 버전에 있는지 (없으면 빠른 경로를 끔)."""
+    try:
+        from plotnine._mpl.layout_manager import PlotnineLayoutEngine  # noqa: F401
+        from plotnine._utils.context import plot_context  # noqa: F401
+        from plotnine.ggplot import ggplot
+        from plotnine.guides.guides import guides
+        from plotnine.themes.targets import ThemeTargets  # noqa: F401
+    except ImportError:
+        return False
+    return all(hasattr(ggplot, name) for name in _PLOTNINE_METHODS) and hasattr(guides, "_setup")
+
+
+class _Built:
+    """이미 빌드된 ggplot. ``get_coordmap_plotnine`` 의 복사 + 재빌드를 건너뛰게 합니다."""
+
+    def __init__(self, plot):
+        self._plot = plot
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def _build(self):
+        pass
+
+    def __getattr__(self, name):
+        return getattr(self._plot, name)
+
+
+class PlotnineSkeletons:
+    """빌드까지 마친 ggplot 을 키별로 보관 (LRU). 그릴 때마다 복사본에 새 figure 를 붙여 그립니다."""
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.builds = 0
+
+    def get(self, key, obj):
+        with self._lock:
+            built = self._entries.get(key)
+            if built is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return built
+        built = _prebuild(obj)
+        with self._lock:
+            self.builds += 1
+            self._entries[key] = built
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return built
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "builds": self.builds}
+
+
+skeletons = PlotnineSkeletons(int(os.environ.get("GALLERY_PLOTNINE_SKELETONS", 64)))
+
+
+def _prebuild(obj):
+    # ggplot.draw() 의 빌드 단계까지만 (figure 는 떼어 내고 보관)
+    from plotnine._utils.context import plot_context
+
+    plot = deepcopy(obj)
+    with plot_context(plot):
+        plot._setup()
+        plot._build()
+    del plot.figure, plot._gridspec
+    return plot
+
+
+def _draw_prebuilt(built, width, height, dpi):
+    """``save_helper`` + ``draw`` 와 같은 순서로 그리되 ``_build`` 는 건너뜁니다."""
+    from matplotlib.patches import Rectangle
+    from plotnine import theme
+    from plotnine._mpl.layout_manager import PlotnineLayoutEngine
+    from plotnine._utils.context import plot_context
+    from plotnine.themes.targets import ThemeTargets
+
+    plot = deepcopy(built)
+    plot += theme(figure_size=(width, height))
+    plot.theme = plot.theme + theme(dpi=dpi)
+    with plot_context(plot):
+        figure = plot._setup()
+        # _build 의 마지막 (figure 에 붙는 배경)
+        rect = Rectangle((0, 0), 0, 0, facecolor="none", zorder=-1000)
+        figure.add_artist(rect)
+        plot._gridspec.patch = rect
+        # 테마를 복사하면 targets 는 빠지므로 다시 만듦 (theme.setup 에서 어차피 새로 만듦)
+        plot.theme.targets = ThemeTargets()
+        plot.theme.targets.plot_background = rect
+
+        plot.axs = plot.facet.setup(plot)
+        plot.guides._setup(plot)
+        plot.theme.setup(plot)
+
+        plot._draw_layers()
+        plot._draw_panel_borders()
+        plot._draw_breaks_and_labels()
+        plot.guides.draw()
+        plot._draw_figure_texts()
+        plot._draw_watermarks()
+        plot._draw_figure_background()
+
+        plot.theme.apply()
+        figure.set_layout_engine(PlotnineLayoutEngine(plot))
+    return figure
+
+
+def _data_uri(buf, fmt):
+    return f"data:{_MIME[fmt]};base64," + base64.b64encode(buf.getvalue()).decode("utf-8")
+
+
+def render_plotnine(obj, size_info, alt=None, key=None, fmt="png", fast=True):
+    """``try_render_plotnine`` 과 같은 결과를 plot 빌드 한 번으로 만듭니다. ggplot 이 아니면 (False, None).
+
+    ``key`` 가 있으면 같은 키의 빌드 결과(골격)를 재사용합니다.
+    ``fast=False`` 면 골격도, 그릴 때 빌드한 plot 도 쓰지 않습니다 (coordmap 은 ``render.plot`` 처럼 다시 빌드).
+    """
+    import plotnine.options as p9options
+    from plotnine.ggplot import ggplot
+
+    if not isinstance(obj, ggplot):
+        return False, None
+
+    initial_size = result_size = p9options.figure_size
+    figure_size = obj.theme.themeables.get("figure_size")
+    if figure_size is not None and figure_size.properties.get("value") is not None:
+        result_size = figure_size.properties["value"]
+    ppi = p9options.dpi
+    figure_dpi = obj.theme.themeables.get("dpi")
+    if figure_dpi is not None and figure_dpi.properties.get("value") is not None:
+        ppi = figure_dpi.properties["value"]
+    w, h, w_attr, h_attr = size_info.get_img_size_px(initial_size, result_size, ppi)
+
+    with io.BytesIO() as buf:
+        figure = None
+        if key is not None and fast:
+            try:
+                figure = _draw_prebuilt(skeletons.get(key, obj), w / ppi, h / ppi, ppi * size_info.pixelratio)
+            except Exception:
+                # 골격으로 그릴 수 없는 plot 이면 평소 경로로 (예외는 거기서 다시 발생)
+                skeletons.discard(key)
+        if figure is None:
+            view = obj.save_helper(filename=buf, format=fmt, units="in", dpi=ppi * size_info.pixelratio,
+                                   width=w / ppi, height=h / ppi, verbose=False)
+            figure = view.figure
+        figure.savefig(buf, format=fmt)
+        src = _data_uri(buf, fmt)
+
+    # 그림을 그린 복사본은 레이아웃 엔진이 들고 있음
+    built = getattr(figure.get_layout_engine(), "plot", None) if fast else None
+    coordmap = get_coordmap_plotnine(obj if built is None else _Built(built), figure)
+
+    result = {"src": src, "width": w_attr, "height": h_attr}
+    if alt is not None:
+        result["alt"] = alt
+    if coordmap is not None:
+        result["coordmap"] = coordmap
+    return True, result
+
+
+def render_matplotlib_svg(obj, size_info, alt=None):
+    """``try_render_matplotlib`` 과 같은 크기/레이아웃으로 SVG 를 만듭니다. matplotlib 객체가 아니면 (False, None)."""
+    import matplotlib.pyplot as plt
+
+    fig = get_matplotlib_figure(obj, False)
+    if fig is None:
+        return False, None
+    try:
+        ppi = get_desired_dpi_from_fig(fig)
+        w, h, w_attr, h_attr = size_info.get_img_size_px(
+            cast_to_size_tuple(plt.rcParams["figure.figsize"]), cast_to_size_tuple(fig.get_size_inches()), ppi
+        )
+        fig.set_size_inches(w / ppi, h / ppi)
+        layout_engine = fig.get_layout_engine()
+        if layout_engine is None or not layout_engine.adjust_compatible:
+            fig.set_layout_engine(layout="tight")
+        with io.BytesIO() as buf:
+            fig.savefig(buf, format="svg", dpi=ppi)
+            src = _data_uri(buf, "svg")
+        coordmap = get_coordmap(fig)
+    finally:
+        plt.close(fig)
+
+    result = {"src": src, "width": w_attr, "height": h_attr}
+    if alt is not None:
+        result["alt"] = alt
+    if coordmap is not None:
+        result["coordmap"] = coordmap
+    return True, result
+
+
+def rasterize(obj, width, height, pixelratio=1, alt=None, key=None, fmt=None):
+    """plot 객체를 (width x height, pixelratio) 크기의 ImgData dict 로 렌더링.
+
+    ``key`` 는 같은 plot 을 가리키는 키 (차트 id + 데이터 지문). plotnine 골격 재사용에 씁니다.
+    ``fmt`` 는 ``"png"`` 또는 ``"svg"`` (기본: ``GALLERY_PLOT_FORMAT``).
+    """
+    if not AVAILABLE:
+        raise RuntimeError("rasterize needs shiny.render._try_render_plot, which this shiny version does not have")
+    fmt = fmt or PLOT_FORMAT
+    size_info = PlotSizeInfo(
+        container_size_px_fn=(lambda: width, lambda: height),
+        user_specified_size_px=(None, None),
+        pixelratio=pixelratio,
+    )
+    if "plotnine" in sys.modules:
+        fast = PLOTNINE_FASTPATH and plotnine_internals()
+        if fast or fmt != "png":
+            ok, result = render_plotnine(obj, size_info, alt=alt, key=key, fmt=fmt, fast=fast)
+        else:
+            ok, result = try_render_plotnine(obj, plot_size_info=size_info, alt=alt)
+        if ok:
+            return None if result is None else dict(result)
+    if "matplotlib" in sys.modules and fmt == "svg":
+        ok, result = render_matplotlib_svg(obj, size_info, alt=alt)
+        if ok:
+            return result
+    elif "matplotlib" in sys.modules:
+        # 세션 밖에서는 pyplot 전역 figure 를 쓰지 않음
+        ok, result = try_render_matplotlib(
+            obj, plot_size_info=size_info, allow_global=False, alt=alt
+        )
+        if ok:
+            return None if result is None else dict(result)
+    raise TypeError(f"Don't know how to rasterize object of type '{type(obj)}'")
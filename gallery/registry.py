@@ -0,0 +1,69 @@
+"""차트 레지스트리.
+
+각 출력(output id)을 만드는 함수를 세션 밖(모듈 수준)에 등록해 두고, ``server()`` 는
+레지스트리를 돌며 출력을 연결합니다. 탭별 지연 렌더링, 미리 렌더링 등은 모두 이
+목록을 기준으로 동작합니다.
+"""
+
+from dataclasses import dataclass, replace
+from typing import Callable
+
+
+@dataclass(frozen=True)
+class ChartSpec:
+    id: str
+    kind: str  # "plot" | "plotly" | "ui" | "text"
+    fn: Callable
+    tab: str
+    data: tuple = ()
+    # 무작위 데이터를 쓰는 차트는 캐시하지 않음
+    cache: bool = True
+    # 스트리밍 데이터 소스 (gallery/stream.py 의 TimeSeriesSource). 있으면 점진적으로 갱신
+    source: object = None
+    # 전체 렌더링이 끝나기 전에 먼저 보낼 가벼운 미리보기를 만드는 함수 (같은 kind 의 객체를 반환)
+    preview: Callable = None
+
+
+class ChartRegistry:
+    def __init__(self):
+        self._specs = {}
+
+    def register(self, kind, *, tab, data=(), cache=True, source=None):
+        """함수 이름을 output id 로 하여 차트를 등록하는 데코레이터."""
+
+        def decorator(fn):
+            if fn.__name__ in self._specs:
+                raise ValueError(f"Chart '{fn.__name__}' is already registered")
+            self._specs[fn.__name__] = ChartSpec(
+                id=fn.__name__, kind=kind, fn=fn, tab=tab, data=tuple(data), cache=cache,
+                source=source,
+            )
+            return fn
+
+        return decorator
+
+    def preview(self, chart):
+        """``chart`` (등록한 차트 함수 또는 id) 의 미리보기 함수를 등록하는 데코레이터."""
+        chart_id = chart if isinstance(chart, str) else chart.__name__
+
+        def decorator(fn):
+            self._specs[chart_id] = replace(self._specs[chart_id], preview=fn)
+            return fn
+
+        return decorator
+
+    def __iter__(self):
+        return iter(self._specs.values())
+
+    def __len__(self):
+        return len(self._specs)
+
+    def get(self, chart_id):
+        return self._specs[chart_id]
+
+    def tabs(self):
+        """등록 순서대로 탭 이름 목록."""
+        return list(dict.fromkeys(spec.tab for spec in self))
+
+    def by_tab(self, tab):
+        return [spec for spec in self if spec.tab == tab]
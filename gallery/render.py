@@ -0,0 +1,571 @@
+"""렌더 캐시를 사용하는 Shiny 렌더러.
+
+``render.plot`` / ``render.ui`` 와 같은 방식으로 쓰되, 입력 데이터를 ``data=`` 로
+알려주면 (출력 id, 데이터 지문, 크기/DPI) 를 키로 렌더 결과를 프로세스 전체에서
+공유합니다.
+
+미리보기 함수가 등록된 차트(``@charts.preview``)는 전체 렌더링을 백그라운드에서 시작하고 그동안 가벼운
+미리보기를 먼저 보냅니다 (``GALLERY_PROGRESSIVE=0`` 이면 끔).
+
+plot / Plotly 결과는 웹소켓 메시지에 직접 싣지 않고 ``/charts/<해시>`` 로 올린 뒤 URL 만 보냅니다
+(``gallery/artifacts.py``, ``GALLERY_ARTIFACTS=0`` 이면 끔).
+
+``filters=`` (교차 필터 상태를 돌려주는 reactive 함수, ``gallery/crossfilter.py``) 를 주면 그 상태를 캐시 키에
+넣고 렌더링하는 동안 적용합니다. 렌더러는 차트가 쓰는 데이터셋의 필터가 바뀔 때만 무효화됩니다.
+"""
+
+import asyncio
+import os
+import weakref
+from contextlib import contextmanager
+
+from htmltools import TagList
+from shiny import render, req
+from shiny.reactive import ExtendedTask
+from shiny.render.renderer import Renderer
+from shiny.session import require_active_session
+from shiny.types import SilentCancelOutputException, SilentException
+
+from .artifacts import ARTIFACTS, artifacts
+from .cache import data_fingerprint, render_cache
+from .crossfilter import applied
+from .figures import figures
+from .metrics import metrics, phase, timing
+from .plotly_output import figure_payload, output_plotly
+from .rasterize import AVAILABLE as RASTERIZE, PLOT_FORMAT, rasterize
+from .sizing import BUCKET_STYLE, PLOT_BUCKETS, RESIZE_DEBOUNCE, SizeWatch, snap_size
+
+# 출력별로 가장 최근에 클라이언트가 보고한 (너비, 높이, pixelratio).
+# 세션 밖에서 미리 렌더링할 때 크기 추정값으로 사용
+size_hints = {}
+
+# 세션별로 이미 보낸 Plotly 템플릿 id
+_sent_templates = weakref.WeakKeyDictionary()
+# 차트 결과를 고정해 둔 세션 id (세션이 끝나면 풀도록 한 번만 등록)
+_pinning_sessions = set()
+
+
+def _artifact_owner(session, name):
+    """이 세션의 출력 ``name`` 에 보낸 결과를 고정할 키. 클라이언트가 URL 을 받기 전에 밀려나지 않게 합니다."""
+    session_id = session.id
+    if session_id not in _pinning_sessions:
+        _pinning_sessions.add(session_id)
+
+        def release():
+            _pinning_sessions.discard(session_id)
+            artifacts.release(session_id)
+
+        session.on_ended(release)
+    return session_id, name
+
+PROGRESSIVE = os.environ.get("GALLERY_PROGRESSIVE", "1") != "0"
+# 미리보기 이미지에 붙이는 스타일 (전체 결과가 오면 Shiny 가 속성을 지움)
+PREVIEW_STYLE = "opacity: 0.6"
+
+
+def _payload_size(value):
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(_payload_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_payload_size(v) for v in value)
+    return 8
+
+
+@contextmanager
+def observed(name):
+    """렌더링 한 번의 단계별 시간을 ``metrics`` 에 기록합니다 (``req()`` 로 멈춘 경우는 제외)."""
+    with timing() as timer:
+        try:
+            yield timer
+        except (SilentException, SilentCancelOutputException):
+            raise
+        except Exception:
+            metrics.error(name)
+            raise
+    metrics.observe(name, timer.phases, timer.nbytes)
+
+
+def _filtered(key, filters):
+    # 교차 필터 상태는 데이터처럼 키에 포함 (상태가 같으면 세션/워커끼리 공유)
+    return key + (("filters", filters),) if filters else key
+
+
+def plot_cache_key(name, data, width, height, pixelratio, filters=()):
+    key = ("plot", str(name), data_fingerprint(*data), width, height, pixelratio)
+    # PNG 와 SVG 결과가 섞이지 않도록 (미리 렌더링한 PNG 는 SVG 모드에서 쓰지 않음)
+    return _filtered(key if PLOT_FORMAT == "png" else key + (PLOT_FORMAT,), filters)
+
+
+def ui_cache_key(name, data, filters=()):
+    return _filtered(("ui", str(name), data_fingerprint(*data)), filters)
+
+
+def plotly_cache_key(name, data, filters=()):
+    return _filtered(("plotly", str(name), data_fingerprint(*data)), filters)
+
+
+class _BackgroundRender:
+    """출력 하나의 세션 밖 렌더링 작업 (``ExtendedTask``).
+
+    ``result(key, ...)`` 는 작업이 끝나기 전에는 출력을 '진행 중' 상태로 두고, 끝나면 렌더러가
+    다시 실행되어 그 출력만 전송됩니다. key 가 바뀌면 (크기 변경 등) 이전 작업은 취소합니다.
+    """
+
+    def __init__(self, offload):
+        self._offload = offload
+        self._key = None
+        self._task = None
+
+    def _start(self, key, *args):
+        if self._task is not None:
+            self._task.cancel()
+        self._task = ExtendedTask(self._offload)
+        self._key = key
+        self._task.invoke(*args)
+
+    def result(self, key, *args):
+        if self._task is None or self._key != key:
+            self._start(key, *args)
+        return self._task.result()
+
+    def progressive(self, key, preview, visible, *args):
+        """(값, 전체 결과인지). 작업이 끝나기 전에는 ``preview()`` 를 돌려줍니다.
+
+        ``visible()`` 이 False 가 되면 (사용자가 다른 탭으로 이동) 작업을 취소하고, 다시 보이면 새로 시작합니다.
+        """
+        if self._task is None or self._key != key:
+            self._start(key, *args)
+        status = self._task.status()
+        if status in ("success", "error"):
+            return self._task.result(), True
+        if visible is not None and not visible():
+            if status == "running":
+                self._task.cancel()
+            # 화면에 없으면 이미 보낸 미리보기를 그대로 둠
+            raise SilentCancelOutputException()
+        if status == "cancelled":
+            self._start(key, *args)
+            self._task.status()
+        return preview(), False
+
+
+class cached_plot(render.plot):
+    """``render.plot`` + 렌더 캐시. 키: (id, 데이터 지문, 너비, 높이, pixelratio).
+
+    렌더링 중에 ``figures`` 로 만든 figure 는 PNG 로 변환한 뒤 바로 정리합니다.
+    크기는 ``gallery/sizing.py`` 에 따라 구간으로 맞추고, 크기 변경은 디바운스한 뒤 반영합니다.
+    ``offload=`` (``async offload(size)``) 를 주면 렌더링을 세션 밖(렌더 스케줄러)에서 수행합니다.
+    ``preview=`` (plot 객체를 돌려주는 함수) 도 주면 전체 렌더링이 끝날 때까지 미리보기를 낮은 해상도로 보여 주고,
+    ``visible()`` 이 False 가 되면 진행 중인 전체 렌더링을 취소합니다.
+    ``filters=`` 를 주면 ``offload(size, filters)`` 로 필터 상태도 넘깁니다.
+    """
+
+    def __init__(self, _fn=None, *, data=(), gate=None, cache=True, offload=None, version=None,
+                 preview=None, visible=None, filters=None, **kwargs):
+        super().__init__(_fn, **kwargs)
+        self.data = tuple(data)
+        self.gate = gate
+        self.cache = cache
+        self.background = None if offload is None else _BackgroundRender(offload)
+        self.preview = preview if self.background is not None else None
+        self.visible = visible
+        # 데이터 지문 대신 (또는 함께) 캐시 키에 넣을 버전 (예: 스트리밍 소스의 seq)
+        self.version = version
+        self.filters = filters
+        self._size = None
+
+    def filter_key(self):
+        return self.filters() if self.filters is not None else ()
+
+    def client_size(self):
+        session = require_active_session(None)
+        name = session.ns(self.output_id)
+        inputs = session.root_scope().input
+        width = inputs[f".clientdata_output_{name}_width"]()
+        height = inputs[f".clientdata_output_{name}_height"]()
+        pixelratio = inputs[".clientdata_pixelratio"]()
+        size = snap_size(width, height, pixelratio)
+        if size is not None:
+            size_hints[str(name)] = size
+        return size
+
+    def render_size(self):
+        """렌더링할 크기. 클라이언트 크기가 바뀌어도 구간이 같으면 이 출력을 무효화하지 않습니다."""
+        if not PLOT_BUCKETS and RESIZE_DEBOUNCE <= 0:
+            return self.client_size()
+        if self._size is None:
+            self._size = SizeWatch(self.client_size)
+        return self._size()
+
+    def cache_key(self, size=None):
+        # 컨테이너 크기와 DPI 가 바뀌면 다른 이미지이므로 키에 포함
+        name = require_active_session(None).ns(self.output_id)
+        key = plot_cache_key(name, self.data, *(size or self.render_size()), filters=self.filter_key())
+        return key if self.version is None else key + (self.version(),)
+
+    def skeleton_key(self, name, filters=()):
+        # 같은 데이터면 같은 plot 이므로 크기만 다른 렌더링은 빌드 결과를 재사용 (무작위 데이터는 제외)
+        if self.version is not None:
+            return (name, data_fingerprint(*self.data), self.version())
+        return _filtered((name, data_fingerprint(*self.data)), filters) if self.cache else None
+
+    async def _render_uncached(self, size, filters):
+        if self.background is not None:
+            return self.background.result((size, filters), size, filters)
+        name = str(require_active_session(None).ns(self.output_id))
+        with observed(name) as timer, figures.scope():
+            with phase("build"), applied(filters):
+                obj = await self.fn()
+            if obj is None:
+                return None
+            with phase("rasterize"):
+                value = rasterize(obj, *size, key=self.skeleton_key(name, filters))
+            timer.nbytes = _payload_size(value)
+        return value
+
+    def _render_preview(self, size, filters):
+        # 미리보기는 pixelratio 1 로 세션 안에서 바로 렌더링
+        size = (size[0], size[1], 1)
+        key = self.cache_key(size) + ("preview",)
+        # 미리보기는 세션 안에서 바로 그리므로 디스크(공유 저장소)를 거치지 않음
+        value = render_cache.get(key, shared=False) if self.cache else None
+        if value is None:
+            name = key[1] + ":preview"
+            with observed(name) as timer, figures.scope():
+                with phase("build"), applied(filters):
+                    obj = self.preview()
+                with phase("rasterize"):
+                    value = rasterize(obj, *size)
+                timer.nbytes = _payload_size(value)
+            if self.cache:
+                render_cache.put(key, value, timer.nbytes, shared=False)
+        return value
+
+    async def render(self):
+        # 캐시 조회보다 먼저 확인해야 열리지 않은 탭의 결과가 전송되지 않음
+        if self.gate is not None:
+            self.gate()
+        if not RASTERIZE:
+            # 세션 밖에서 변환할 수 없는 shiny 버전: render.plot 의 평소 경로 (캐시 없이 세션에서 그림)
+            with applied(self.filter_key()):
+                return await super().render()
+        size = self.render_size()
+        req(size)
+        filters = self.filter_key()
+        key = self.cache_key(size) if self.cache else None
+        value = await render_cache.aget(key) if key is not None else None
+        if value is not None:
+            metrics.hit(key[1])
+            return self._styled(self._published(value))
+        if self.preview is not None:
+            value, final = self.background.progressive(
+                (size, filters), lambda: self._render_preview(size, filters), self.visible, size, filters
+            )
+        else:
+            value, final = await self._render_uncached(size, filters), True
+        if key is not None and value is not None and final:
+            # 버전(스트리밍 seq)은 프로세스마다 다른 데이터이므로 다른 프로세스와 공유하지 않음
+            render_cache.put(key, value, _payload_size(value), shared=self.version is None)
+        return self._styled(self._published(value), preview=not final)
+
+    def _published(self, value):
+        # 스트리밍 차트(버전이 계속 바뀜)는 올리지 않고 메시지에 직접 실음
+        if value is None or not ARTIFACTS or self.version is not None:
+            return value
+        session = require_active_session(None)
+        return artifacts.image(value, _artifact_owner(session, str(session.ns(self.output_id))))
+
+    @staticmethod
+    def _styled(value, preview=False):
+        # 구간 크기 이미지는 비율을 유지한 채 컨테이너에 맞춰 보여 줌
+        styles = ([BUCKET_STYLE] if PLOT_BUCKETS else []) + ([PREVIEW_STYLE] if preview else [])
+        if value is None or not styles:
+            return value
+        return {**value, "style": "; ".join(styles)}
+
+
+class cached_ui(render.ui):
+    """``render.ui`` + 렌더 캐시. 키: (id, 데이터 지문, 필터 상태)."""
+
+    def __init__(self, _fn=None, *, data=(), gate=None, filters=None):
+        super().__init__(_fn)
+        self.data = tuple(data)
+        self.gate = gate
+        self.filters = filters
+
+    def cache_key(self, filters=()):
+        session = require_active_session(None)
+        return ui_cache_key(session.ns(self.output_id), self.data, filters)
+
+    async def render(self):
+        # 캐시 조회보다 먼저 확인해야 열리지 않은 탭의 결과가 전송되지 않음
+        if self.gate is not None:
+            self.gate()
+        filters = self.filters() if self.filters is not None else ()
+        key = self.cache_key(filters)
+        value = await render_cache.aget(key)
+        if value is not None:
+            metrics.hit(key[1])
+        else:
+            with observed(key[1]) as timer, phase("build"), applied(filters):
+                value = await super().render()
+                timer.nbytes = _payload_size(value)
+            # HTML 의존성(deps)은 세션마다 등록해야 하므로 deps 가 없는 결과만 공유
+            if isinstance(value, dict) and not value.get("deps"):
+                render_cache.put(key, value, _payload_size(value))
+        return value
+
+
+def _plotly_value(name, fig):
+    figure, template_id, template = figure_payload(fig, uirevision=name)
+    return {"figure": figure, "template_id": template_id, "template": template}
+
+
+class cached_plotly(Renderer[object]):
+    """Plotly figure 를 압축 JSON 으로 보내는 렌더러 (``output_plotly`` 와 함께 사용).
+
+    ``data=`` 를 주면 figure JSON 을 렌더 캐시에 공유하고, 레이아웃 템플릿은 세션마다
+    처음 한 번만 보냅니다. ``preview=`` 는 ``cached_plot`` 과 같습니다 (미리보기 figure 를 먼저 보냄).
+    ``stream=True`` 이면 함수가 (figure, seq) 를 돌려주고, 값에 seq 를 실어
+    클라이언트가 이후의 점진적 갱신을 이어 붙일 수 있게 합니다 (``gallery/stream.py``).
+    ``filters=`` 는 ``cached_plot`` 과 같습니다 (``offload(None, filters)``).
+    """
+
+    def auto_output_ui(self):
+        return output_plotly(self.output_id)
+
+    def __init__(self, _fn=None, *, data=(), gate=None, cache=True, offload=None, stream=False,
+                 preview=None, visible=None, filters=None):
+        super().__init__(_fn)
+        self.data = tuple(data)
+        self.gate = gate
+        self.cache = cache
+        self.background = None if offload is None else _BackgroundRender(offload)
+        self.stream = stream
+        self.preview = preview if self.background is not None else None
+        self.visible = visible
+        self.filters = filters
+
+    def _render_preview(self, name, filters):
+        key = plotly_cache_key(name, self.data, filters) + ("preview",)
+        value = render_cache.get(key, shared=False) if self.cache else None
+        if value is None:
+            with observed(name + ":preview") as timer:
+                with phase("build"), applied(filters):
+                    fig = self.preview()
+                with phase("serialize"):
+                    value = _plotly_value(name, fig)
+                timer.nbytes = _payload_size(value)
+            if self.cache:
+                render_cache.put(key, value, timer.nbytes, shared=False)
+        return value
+
+    async def render(self):
+        if self.gate is not None:
+            self.gate()
+        session = require_active_session(None)
+        name = str(session.ns(self.output_id))
+        filters = self.filters() if self.filters is not None else ()
+        key = plotly_cache_key(name, self.data, filters) if self.cache else None
+        value = await render_cache.aget(key) if key is not None else None
+        final = True
+        if value is not None:
+            metrics.hit(name)
+        else:
+            if self.preview is not None:
+                value, final = self.background.progressive(
+                    filters, lambda: self._render_preview(name, filters), self.visible, None, filters
+                )
+            elif self.background is not None:
+                value = self.background.result(filters, None, filters)
+            else:
+                with observed(name) as timer:
+                    with phase("build"), applied(filters):
+                        fig = await self.fn()
+                    if self.stream and fig is not None:
+                        fig, seq = fig
+                    if fig is None:
+                        return None
+                    with phase("serialize"):
+                        value = _plotly_value(name, fig)
+                    if self.stream:
+                        value["stream"] = {"seq": seq}
+                    timer.nbytes = _payload_size(value)
+            if value is None:
+                return None
+            if key is not None and final:
+                render_cache.put(key, value, _payload_size(value))
+        if ARTIFACTS and not self.stream:
+            # figure / 템플릿은 URL 로 (클라이언트가 받아 온 템플릿은 id 별로 보관)
+            return artifacts.plotly(value, _artifact_owner(session, name))
+        # 템플릿은 이 세션에서 처음일 때만 포함
+        sent = _sent_templates.setdefault(session, set())
+        if value["template_id"] is None or value["template_id"] in sent:
+            return {**value, "template": None}
+        sent.add(value["template_id"])
+        return value
+
+
+async def render_in_thread(spec, size=None, filters=()):
+    """스케줄러 없이 차트를 스레드에서 렌더링해 출력 값을 돌려줍니다 (미리보기를 먼저 보내기 위해)."""
+    try:
+        result, phases = await asyncio.to_thread(timed_offline_render, spec, size, filters)
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        metrics.error(spec.id)
+        raise
+    value = None if result is None else result[1]
+    metrics.observe(spec.id, phases, 0 if value is None else _payload_size(value))
+    return value
+
+
+def output_for(spec, gate=None, scheduler=None, visible=None, filters=None):
+    """ChartSpec 에 맞는 렌더러를 만들어 현재 세션에 등록합니다.
+
+    ``gate(spec)`` 는 렌더링 직전에 호출되며, ``req()`` 로 렌더링을 미룰 수 있습니다.
+    ``scheduler`` (``RenderScheduler``) 가 켜져 있으면 plot / Plotly 차트는 세션 밖에서 렌더링합니다.
+    ``visible(spec)`` 은 출력이 지금 화면에 보이는지 (reactive). 미리보기를 보여 주는 동안 False 가 되면
+    전체 렌더링을 취소합니다.
+    ``filters(spec)`` 는 차트에 적용할 교차 필터 상태 (reactive, ``FilterSession.key``).
+    """
+
+    if spec.source is not None:
+        from .stream import output_stream
+
+        return output_stream(spec, gate, visible)
+
+    check = None if gate is None else (lambda: gate(spec))
+    filter_key = None if filters is None else (lambda: filters(spec))
+    offload = None
+    if scheduler is not None and scheduler.enabled:
+
+        async def offload(size=None, filters=()):
+            return await scheduler.render(spec, size, filters)
+
+    preview = spec.preview if PROGRESSIVE and spec.kind in ("plot", "plotly") else None
+    if preview is not None and offload is None:
+        # 미리보기를 보내는 동안 세션을 막지 않도록 전체 렌더링은 스레드에서
+
+        async def offload(size=None, filters=()):
+            return await render_in_thread(spec, size, filters)
+
+    progressive = {}
+    if preview is not None:
+        progressive = {"preview": preview, "visible": None if visible is None else (lambda: visible(spec))}
+
+    def value_fn():
+        if check is not None:
+            check()
+        return spec.fn()
+
+    def text_fn():
+        # 텍스트 출력은 캐시하지 않으므로 필터 상태를 여기서 적용
+        if check is not None:
+            check()
+        with applied(filter_key() if filter_key is not None else ()):
+            return spec.fn()
+
+    # 렌더러는 함수 이름을 output id 로 사용
+    value_fn.__name__ = text_fn.__name__ = spec.id
+
+    if spec.kind == "plot":
+        renderer = cached_plot(data=spec.data, gate=check, cache=spec.cache, offload=offload, filters=filter_key,
+                               **progressive)
+    elif spec.kind == "ui":
+        renderer = cached_ui(data=spec.data, gate=check, filters=filter_key) if spec.cache else render.ui()
+    elif spec.kind == "plotly":
+        renderer = cached_plotly(data=spec.data, gate=check, cache=spec.cache, offload=offload, filters=filter_key,
+                                 **progressive)
+    elif spec.kind == "text":
+        return render.text()(text_fn)
+    else:
+        raise ValueError(f"Unknown chart kind '{spec.kind}'")
+    return renderer(value_fn)
+
+
+def offline_render(spec, size=None, filters=()):
+    """세션 없이 차트를 렌더링해 (캐시 키, 값) 을 돌려줍니다.
+
+    plot 은 ``size=(너비, 높이, pixelratio)`` 가 필요합니다. 렌더링할 수 없는 차트면 None.
+    ``filters`` 는 렌더링하는 동안 적용할 교차 필터 상태입니다.
+    """
+    if spec.kind == "plot":
+        if size is None or not RASTERIZE:
+            return None
+        with figures.scope():
+            with phase("build"), applied(filters):
+                obj = spec.fn()
+            with phase("rasterize"):
+                skeleton = _filtered((spec.id, data_fingerprint(*spec.data)), filters) if spec.cache else None
+                value = rasterize(obj, *size, key=skeleton)
+        key = plot_cache_key(spec.id, spec.data, *size, filters=filters)
+    elif spec.kind == "ui":
+        with phase("build"), applied(filters):
+            obj = spec.fn()
+        with phase("serialize"):
+            rendered = TagList(obj).render()
+        if rendered["dependencies"]:
+            return None
+        value = {"deps": [], "html": rendered["html"]}
+        key = ui_cache_key(spec.id, spec.data, filters)
+    elif spec.kind == "plotly":
+        with phase("build"), applied(filters):
+            fig = spec.fn()
+        with phase("serialize"):
+            value = _plotly_value(spec.id, fig)
+        key = plotly_cache_key(spec.id, spec.data, filters)
+    else:
+        return None
+    if value is None:
+        return None
+    return key, value
+
+
+def timed_offline_render(spec, size=None, filters=()):
+    """``offline_render`` 와 같지만 단계별 시간(초)도 함께 돌려줍니다: ((키, 값) 또는 None, 단계별 시간)."""
+    with timing() as timer:
+        result = offline_render(spec, size, filters)
+    return result, timer.phases
+
+
+def cache_key_for(spec, size=None):
+    if spec.kind == "plot":
+        return None if size is None else plot_cache_key(spec.id, spec.data, *size)
+    if spec.kind == "ui":
+        return ui_cache_key(spec.id, spec.data)
+    if spec.kind == "plotly":
+        return plotly_cache_key(spec.id, spec.data)
+    return None
+
+
+def prerender_target(spec):
+    """미리 렌더링할 (캐시 키, 크기). 이미 캐시에 있거나 크기 정보가 없으면 None."""
+    if not spec.cache:
+        return None
+    size = size_hints.get(spec.id) if spec.kind == "plot" else None
+    key = cache_key_for(spec, size)
+    if key is None or key in render_cache:
+        return None
+    return key, size
+
+
+def prerender(spec):
+    """세션 없이 차트를 렌더링해 캐시에 넣습니다.
+
+    이미 캐시에 있거나, plot 인데 아직 크기 정보가 없으면 건너뛰고 False 를 반환합니다.
+    """
+    target = prerender_target(spec)
+    if target is None:
+        return False
+    with observed(spec.id) as timer:
+        result = offline_render(spec, target[1])
+        if result is not None:
+            timer.nbytes = _payload_size(result[1])
+    if result is None:
+        return False
+    key, value = result
+    render_cache.put(key, value, _payload_size(value))
+    return True
@@ -0,0 +1,138 @@
+"""세션 밖 렌더링 스케줄러.
+
+Shiny 는 한 세션의 출력을 차례로 렌더링하고 모두 끝난 뒤에 한꺼번에 보내므로, 느린 차트
+하나(예: ``sns.pairplot``)가 같은 탭의 다른 차트를 붙잡아 둡니다. 스케줄러는 plot / Plotly
+차트의 렌더링을 프로세스 풀(또는 스레드 풀)로 보내고, 렌더러는 ``ExtendedTask`` 로 결과를
+기다리므로 차트마다 끝나는 대로 클라이언트에 전송됩니다.
+
+- ``mode="process"``: 워커 프로세스가 앱 모듈을 import 해 차트 id 로 렌더링 (GIL 영향 없음)
+- ``mode="thread"``: 같은 프로세스의 스레드에서 렌더링 (메모리는 적게 들지만 GIL 을 공유)
+- ``workers`` 가 동시에 렌더링하는 차트 수의 상한이며, 0 이면 스케줄러를 쓰지 않습니다.
+
+워커 프로세스가 죽으면 (메모리 부족, 네이티브 라이브러리 오류 등) 풀 전체가 깨지므로, 새 풀을 만들어
+그 렌더링을 한 번 다시 시도합니다.
+"""
+
+import asyncio
+import importlib
+import multiprocessing
+import sys
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from .cache import render_cache
+from .metrics import metrics
+from .render import _payload_size, prerender_target, timed_offline_render
+
+# ---- 워커 프로세스 -----------------------------------------------------------
+
+_worker_app = None
+
+
+def init_worker(app_module, app_dir):
+    """워커 프로세스에서 앱 모듈(차트 레지스트리)을 import 합니다."""
+    global _worker_app
+    if app_dir not in sys.path:
+        sys.path.insert(0, app_dir)
+    _worker_app = importlib.import_module(app_module)
+
+
+def worker_registry():
+    return _worker_app.charts
+
+
+def _render_timed(spec, size, filters=()):
+    # 계측 결과는 서버 프로세스의 metrics 에 기록하도록 값과 함께 돌려줌
+    result, phases = timed_offline_render(spec, size, filters)
+    return (None if result is None else result[1]), phases
+
+
+def worker_render(chart_id, size=None, filters=()):
+    return _render_timed(worker_registry().get(chart_id), size, filters)
+
+
+# ---- 스케줄러 -----------------------------------------------------------------
+
+class RenderScheduler:
+    def __init__(self, workers, *, mode="process", app_module=None, app_dir=None):
+        if mode not in ("process", "thread"):
+            raise ValueError(f"Unknown render pool mode '{mode}'")
+        if mode == "process" and workers > 0 and app_module is None:
+            raise ValueError("A process pool needs the app module name to import in workers")
+        self.workers = workers
+        self.mode = mode
+        self.app_module = app_module
+        self.app_dir = app_dir
+        self._executor = None
+
+    @property
+    def enabled(self):
+        return self.workers > 0
+
+    def executor(self):
+        # 워커는 처음 렌더링을 요청할 때 시작
+        if self._executor is None:
+            if self.mode == "process":
+                # 이벤트 루프/스레드가 있는 서버 프로세스를 fork 하지 않도록 spawn 사용
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=init_worker,
+                    initargs=(self.app_module, self.app_dir),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="gallery-render"
+                )
+        return self._executor
+
+    async def render(self, spec, size=None, filters=()):
+        """차트를 풀에서 렌더링해 출력 값(ImgData / Plotly payload)을 돌려줍니다 (``filters`` = 교차 필터 상태)."""
+        retries = 1
+        while True:
+            executor = self.executor()
+            try:
+                value, phases = await self._submit(executor, spec, size, filters)
+                break
+            except asyncio.CancelledError:
+                raise
+            except BrokenExecutor:
+                self._discard(executor)
+                if retries:
+                    retries -= 1
+                    continue
+                metrics.error(spec.id)
+                raise
+            except Exception:
+                metrics.error(spec.id)
+                raise
+        metrics.observe(spec.id, phases, 0 if value is None else _payload_size(value))
+        return value
+
+    def _submit(self, executor, spec, size, filters):
+        loop = asyncio.get_running_loop()
+        if self.mode == "process":
+            return loop.run_in_executor(executor, worker_render, spec.id, size, filters)
+        return loop.run_in_executor(executor, _render_timed, spec, size, filters)
+
+    def _discard(self, executor):
+        # 깨진 풀은 버리고 다음 렌더링에서 새로 만듦 (다른 렌더링이 이미 바꿨으면 그대로)
+        if self._executor is executor:
+            self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def prerender(self, spec):
+        """``render.prerender`` 와 같지만 렌더링을 풀에서 수행합니다."""
+        target = prerender_target(spec)
+        if target is None:
+            return False
+        key, size = target
+        value = await self.render(spec, size)
+        if value is None:
+            return False
+        render_cache.put(key, value, _payload_size(value))
+        return True
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
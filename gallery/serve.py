@@ -0,0 +1,258 @@
+"""여러 앱 프로세스로 실행하기: N 개의 uvicorn 워커 + 세션 고정(sticky) 프록시.
+
+    python -m gallery.serve --workers 4 --port 8000
+
+- 워커는 ``127.0.0.1`` 의 ``port+1 .. port+N`` 에서 각각 ``uvicorn <app>:app`` 으로 뜹니다.
+- Shiny 세션 상태는 워커 메모리에 있으므로 한 브라우저의 요청(페이지, 웹소켓, 다운로드)은 모두 같은
+  워커가 받아야 합니다. 앞단 프록시는 쿠키가 없는 요청을 클라이언트 주소의 해시로 워커에 나누고
+  ``gallery_worker`` 쿠키를 붙이며, 이후 그 쿠키가 있는 요청은 같은 워커로 보냅니다. 브라우저가 쿠키를
+  받기 전에 여러 연결(HTML, JS, CSS, 웹소켓)을 동시에 열어도 모두 같은 워커로 갑니다.
+- 렌더 결과는 ``GALLERY_SHARED_CACHE`` 디렉터리(지정하지 않으면 실행 동안만 쓰는 임시 디렉터리)로
+  워커끼리 공유하므로, 같은 차트/데이터/크기는 호스트에서 한 번만 렌더링됩니다 (``gallery/cache.py``).
+- 워커 프로세스가 죽으면 다시 띄웁니다.
+
+nginx 같은 프록시를 앞에 둘 때는 ``--no-proxy`` 로 워커만 띄우고 프록시에서 ip_hash 나
+쿠키 기반 sticky 설정으로 나누면 됩니다.
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+
+COOKIE = b"gallery_worker"
+# 요청/응답 헤더 최대 크기
+HEAD_LIMIT = 64 * 1024
+CHUNK = 64 * 1024
+
+
+class Worker:
+    def __init__(self, index, port, command, env, cwd):
+        self.index = index
+        self.port = port
+        self.command = command
+        self.env = env
+        self.cwd = cwd
+        self.proc = None
+        self.connections = 0
+        self.restarts = 0
+
+    def start(self):
+        self.proc = subprocess.Popen(self.command, env=self.env, cwd=self.cwd)
+
+    @property
+    def alive(self):
+        return self.proc is not None and self.proc.poll() is None
+
+    def stop(self, timeout=10):
+        if not self.alive:
+            return
+        self.proc.terminate()
+        try:
+            self.proc.wait(timeout)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+
+
+def _sticky_index(head):
+    """요청 헤더의 ``gallery_worker`` 쿠키 값. 없거나 잘못되었으면 None."""
+    for line in head.split(b"\r\n")[1:]:
+        name, _, value = line.partition(b":")
+        if name.strip().lower() != b"cookie":
+            continue
+        for part in value.split(b";"):
+            key, _, index = part.strip().partition(b"=")
+            if key == COOKIE and index.isdigit():
+                return int(index)
+    return None
+
+
+def _with_cookie(head, index):
+    # 응답 헤더 끝(빈 줄) 앞에 Set-Cookie 추가
+    cookie = b"Set-Cookie: %s=%d; Path=/; HttpOnly; SameSite=Lax\r\n" % (COOKIE, index)
+    return head[:-2] + cookie + b"\r\n"
+
+
+async def _pipe(reader, writer, *, first=None):
+    """reader 에서 읽은 바이트를 writer 로 전달. ``first`` 는 첫 헤더를 바꾸는 함수."""
+    try:
+        if first is not None:
+            head = await reader.readuntil(b"\r\n\r\n")
+            writer.write(first(head))
+        while True:
+            data = await reader.read(CHUNK)
+            if not data:
+                break
+            writer.write(data)
+            await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+        pass
+    finally:
+        try:
+            if writer.can_write_eof():
+                writer.write_eof()
+        except (OSError, RuntimeError):
+            pass
+
+
+class StickyProxy:
+    def __init__(self, workers):
+        self.workers = workers
+
+    def choose(self, client):
+        """쿠키가 없는 요청의 워커: 클라이언트 주소의 해시로 고름 (같은 주소의 동시 연결은 같은 워커로).
+
+        그 워커가 죽어 있으면 다음 살아 있는 워커.
+        """
+        start = zlib.crc32(client.encode()) % len(self.workers)
+        for step in range(len(self.workers)):
+            worker = self.workers[(start + step) % len(self.workers)]
+            if worker.alive:
+                return worker
+        return self.workers[start]
+
+    async def handle(self, client_reader, client_writer):
+        try:
+            head = await client_reader.readuntil(b"\r\n\r\n")
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            client_writer.close()
+            return
+        index = _sticky_index(head)
+        assign = index is None or not 0 <= index < len(self.workers) or not self.workers[index].alive
+        peer = client_writer.get_extra_info("peername")
+        worker = self.choose(peer[0] if peer else "") if assign else self.workers[index]
+        try:
+            upstream_reader, upstream_writer = await asyncio.open_connection(
+                "127.0.0.1", worker.port, limit=HEAD_LIMIT
+            )
+        except OSError:
+            client_writer.write(b"HTTP/1.1 502 Bad Gateway\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+            await client_writer.drain()
+            client_writer.close()
+            return
+        worker.connections += 1
+        try:
+            upstream_writer.write(head)
+            first = (lambda response: _with_cookie(response, worker.index)) if assign else None
+            upload = asyncio.create_task(_pipe(client_reader, upstream_writer))
+            # 워커가 연결을 닫으면 끝 (keep-alive 클라이언트가 열어 둔 쪽은 정리)
+            await _pipe(upstream_reader, client_writer, first=first)
+            upload.cancel()
+        finally:
+            worker.connections -= 1
+            upstream_writer.close()
+            client_writer.close()
+
+
+async def _wait_ready(worker, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if not worker.alive:
+            raise RuntimeError(f"worker {worker.index} exited with code {worker.proc.returncode}")
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", worker.port)
+        except OSError:
+            await asyncio.sleep(0.2)
+            continue
+        writer.close()
+        return
+    raise RuntimeError(f"worker {worker.index} did not start within {timeout}s")
+
+
+async def _supervise(workers, stopping, timeout):
+    # 죽은 워커를 다시 띄움
+    while not stopping.is_set():
+        for worker in workers:
+            if not worker.alive and not stopping.is_set():
+                print(f"worker {worker.index} (port {worker.port}) exited, restarting", file=sys.stderr)
+                worker.restarts += 1
+                worker.start()
+                try:
+                    await _wait_ready(worker, timeout)
+                except RuntimeError as e:
+                    print(e, file=sys.stderr)
+        try:
+            await asyncio.wait_for(stopping.wait(), 1)
+        except asyncio.TimeoutError:
+            pass
+
+
+def worker_env(workers, shared_cache):
+    env = dict(os.environ)
+    env["GALLERY_SHARED_CACHE"] = shared_cache
+    # 렌더 풀은 기본으로 끔 (앱 워커마다 렌더 워커 프로세스가 앱을 다시 import 하므로 메모리가 곱절로 늘어남).
+    # 켜려면 GALLERY_RENDER_WORKERS 를 지정하며, 앱 워커마다 그만큼의 풀이 생김
+    env.setdefault("GALLERY_RENDER_WORKERS", "0")
+    return env
+
+
+async def serve(app_module, *, workers, host, port, proxy=True, app_dir=None, shared_cache=None,
+                log_level="warning", timeout=120):
+    app_dir = os.path.abspath(app_dir or os.getcwd())
+    temporary = shared_cache is None
+    if temporary:
+        shared_cache = tempfile.mkdtemp(prefix="gallery-cache-")
+    env = worker_env(workers, shared_cache)
+    pool = []
+    for i in range(workers):
+        worker_port = port + 1 + i
+        command = [sys.executable, "-m", "uvicorn", f"{app_module}:app", "--host", "127.0.0.1",
+                   "--port", str(worker_port), "--log-level", log_level]
+        pool.append(Worker(i, worker_port, command, env, app_dir))
+
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stopping.set)
+        except (NotImplementedError, RuntimeError):
+            # Windows 이벤트 루프는 지원하지 않음 (Ctrl+C 는 KeyboardInterrupt 로 끝나고 finally 에서 정리)
+            pass
+
+    server = None
+    try:
+        for worker in pool:
+            worker.start()
+        await asyncio.gather(*(_wait_ready(worker, timeout) for worker in pool))
+        ports = ", ".join(str(worker.port) for worker in pool)
+        print(f"{workers} workers on 127.0.0.1 ports {ports}; shared render cache {shared_cache}", file=sys.stderr)
+        if proxy:
+            server = await asyncio.start_server(StickyProxy(pool).handle, host, port, limit=HEAD_LIMIT)
+            print(f"sticky proxy on http://{host}:{port}", file=sys.stderr)
+        await _supervise(pool, stopping, timeout)
+    finally:
+        stopping.set()
+        if server is not None:
+            server.close()
+        for worker in pool:
+            worker.stop()
+        if temporary:
+            shutil.rmtree(shared_cache, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m gallery.serve", description=__doc__.split("\n")[0])
+    parser.add_argument("--app", default="phython_shiny", help="Shiny 앱(app)이 있는 모듈")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="앱 프로세스 수")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000, help="프록시 포트 (워커는 그다음 포트부터)")
+    parser.add_argument("--no-proxy", action="store_true", help="워커만 띄움 (sticky 프록시는 직접 구성)")
+    parser.add_argument("--shared-cache", default=os.environ.get("GALLERY_SHARED_CACHE"),
+                        help="워커가 공유하는 렌더 캐시 디렉터리 (기본: 임시 디렉터리)")
+    parser.add_argument("--log-level", default="warning", help="uvicorn 로그 수준")
+    args = parser.parse_args(argv)
+
+    asyncio.run(serve(args.app, workers=args.workers, host=args.host, port=args.port,
+                      proxy=not args.no_proxy, shared_cache=args.shared_cache, log_level=args.log_level))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""plot 출력의 크기 처리: 크기 구간(bucket)으로 맞추기 + 크기 변경 디바운스.
+
+창 크기 변경, 탭 전환, 모바일 회전마다 컨테이너 크기가 몇 픽셀씩 바뀌면 ``render.plot`` 은 매번
+서버에서 다시 그립니다. 여기서는
+
+- 클라이언트가 보고한 크기가 바뀌어도 (구간으로 맞춘) 렌더링 크기가 같으면 출력을 무효화하지 않고,
+- 크기가 바뀐 뒤 ``GALLERY_RESIZE_DEBOUNCE_MS`` (기본 250ms) 동안 더 바뀌지 않을 때만 다시 렌더링합니다.
+  그동안 브라우저는 이전 이미지를 컨테이너에 맞춰 늘이거나 줄여서 보여 줍니다.
+
+``GALLERY_PLOT_BUCKETS`` 를 켜면 (``1`` 이면 기본 너비 목록, 또는 ``"480,800,1280"`` 처럼 직접 지정)
+너비는 가장 가까운 기준 너비로, 높이는 ``HEIGHT_STEP`` 단위로 맞추고, pixelratio 는 2 이상 정수로
+올려 렌더링합니다. 그러면 크기 조합이 몇 개로 줄어 각각 한 번만 렌더링되어 캐시되고 (세션/워커 공유),
+브라우저는 고해상도 이미지를 ``object-fit: contain`` 으로 비율을 유지한 채 축소해 보여 줍니다.
+``GALLERY_PLOT_FORMAT=svg`` 이면 PNG 대신 SVG 로 보냅니다 (``gallery/rasterize.py``).
+"""
+
+import math
+import os
+import time
+
+from shiny import reactive
+
+from .rasterize import PLOT_FORMAT
+
+DEFAULT_BUCKETS = (320, 400, 480, 576, 720, 864, 1024, 1280, 1536, 1920)
+HEIGHT_STEP = 50
+# 구간 모드에서 <img> 에 붙이는 스타일 (구간 크기 이미지를 왜곡 없이 컨테이너에 맞춤)
+BUCKET_STYLE = "object-fit: contain"
+
+
+def _parse_buckets(text):
+    text = (text or "").strip()
+    if text in ("", "0"):
+        return ()
+    if text == "1":
+        return DEFAULT_BUCKETS
+    return tuple(sorted(int(width) for width in text.split(",") if width.strip()))
+
+
+PLOT_BUCKETS = _parse_buckets(os.environ.get("GALLERY_PLOT_BUCKETS"))
+RESIZE_DEBOUNCE = int(os.environ.get("GALLERY_RESIZE_DEBOUNCE_MS", 250)) / 1000
+
+
+def snap_size(width, height, pixelratio, buckets=PLOT_BUCKETS):
+    """렌더링할 (너비, 높이, pixelratio). 구간 모드가 아니면 그대로, 크기가 0 이면 None."""
+    if not width or not height:
+        return None
+    if not buckets:
+        return width, height, pixelratio
+    # 비율로 가장 가까운 기준 너비 (contain 으로 보일 때 여백이 가장 작음)
+    width = min(buckets, key=lambda bucket: abs(math.log(bucket / width)))
+    height = max(HEIGHT_STEP, round(height / HEIGHT_STEP) * HEIGHT_STEP)
+    # SVG 는 해상도와 무관
+    pixelratio = 1 if PLOT_FORMAT == "svg" else max(2, math.ceil(pixelratio))
+    return width, height, pixelratio
+
+
+class SizeWatch:
+    """출력 하나의 렌더링 크기를 담는 reactive 값.
+
+    ``read_size()`` (클라이언트 크기를 읽는 함수, 구간으로 맞춘 크기를 반환) 는 effect 안에서만 호출하므로,
+    렌더러는 렌더링 크기가 실제로 바뀔 때만 (그리고 디바운스가 끝난 뒤에만) 무효화됩니다.
+    """
+
+    def __init__(self, read_size, delay=RESIZE_DEBOUNCE):
+        self.delay = delay
+        self._pending = None
+        with reactive.isolate():
+            self.size = reactive.value(read_size())
+
+        @reactive.effect
+        def _watch():
+            size = read_size()
+            with reactive.isolate():
+                current = self.size()
+            if size == current:
+                self._pending = None
+                return
+            now = time.monotonic()
+            # 처음 크기가 정해질 때 (숨겨져 있던 출력 등) 는 바로 반영
+            if current is not None and self.delay > 0:
+                if self._pending is None or self._pending[0] != size:
+                    self._pending = (size, now + self.delay)
+                remaining = self._pending[1] - now
+                if remaining > 0:
+                    reactive.invalidate_later(remaining)
+                    return
+            self._pending = None
+            self.size.set(size)
+
+        self._effect = _watch
+
+    def __call__(self):
+        return self.size()
@@ -0,0 +1,205 @@
+"""스트리밍 시계열: 링 버퍼 데이터 소스, 최소/최대 보존 솎아내기, 점진적 Plotly 갱신.
+
+- ``TimeSeriesSource``: 여러 계열의 (시각, 값) 을 고정 크기 링 버퍼에 보관. ``seq`` 는 지금까지
+  추가된 점의 수로, 세션은 마지막으로 받은 ``seq`` 이후의 점만 받습니다.
+- ``minmax_decimate``: 긴 구간을 구간별 최소/최대값만 남겨 줄임 (봉우리/골짜기 보존).
+- ``output_stream``: Plotly 차트는 처음 한 번 전체 figure 를 보내고 이후에는 새 점만
+  ``Plotly.extendTraces`` 로 이어 붙입니다. plot(PNG) 차트는 주기적으로 다시 렌더링하되 같은
+  ``seq`` 의 이미지는 세션끼리 공유합니다.
+"""
+
+import asyncio
+import threading
+
+import numpy as np
+import pandas as pd
+
+# ---- 데이터 소스 ---------------------------------------------------------------
+
+
+class TimeSeriesSource:
+    def __init__(self, series, capacity=3600, display_points=None):
+        self.series = list(series)
+        self.capacity = capacity
+        # 차트에 한 번에 그리는 계열별 최대 점 수 (None 이면 버퍼 전체)
+        self.display_points = display_points
+        self._t = np.zeros(capacity, dtype="datetime64[ns]")
+        self._values = np.zeros((capacity, len(self.series)))
+        self._lock = threading.Lock()
+        # 지금까지 추가된 점의 수 (버퍼에서 밀려난 점 포함)
+        self.seq = 0
+
+    def append(self, t, values):
+        """시각 ``t`` 의 계열별 값 ``values`` (``series`` 순서) 를 추가합니다."""
+        with self._lock:
+            i = self.seq % self.capacity
+            self._t[i] = np.datetime64(pd.Timestamp(t).as_unit("ns"))
+            self._values[i] = values
+            self.seq += 1
+
+    def _ordered(self, start_seq):
+        # start_seq 부터 현재까지를 시간 순서로
+        idx = np.arange(start_seq, self.seq) % self.capacity
+        return self._t[idx], self._values[idx]
+
+    def window(self):
+        """버퍼에 남아 있는 구간 전체: (seq, 시각 배열, 값 배열[점, 계열])."""
+        with self._lock:
+            start = max(0, self.seq - self.capacity)
+            t, values = self._ordered(start)
+            return self.seq, t, values
+
+    def since(self, seq):
+        """``seq`` 이후에 추가된 점. 이미 버퍼에서 밀려났으면 None."""
+        with self._lock:
+            if seq < self.seq - self.capacity:
+                return None
+            t, values = self._ordered(seq)
+            return self.seq, t, values
+
+    def frame(self, max_points=None):
+        """(date, value, category) 형식의 DataFrame. ``max_points`` 를 넘는 계열은 솎아냅니다."""
+        _, t, values = self.window()
+        parts = []
+        for j, name in enumerate(self.series):
+            idx = minmax_decimate(values[:, j], max_points) if max_points else slice(None)
+            parts.append(pd.DataFrame({"date": t[idx], "value": values[idx, j], "category": name}))
+        return pd.concat(parts, ignore_index=True)
+
+
+def minmax_decimate(values, max_points):
+    """구간마다 최소/최대값의 위치만 남긴 인덱스 (시간 순서, 최대 ``max_points`` 개)."""
+    n = len(values)
+    if max_points is None or n <= max_points:
+        return np.arange(n)
+    # 구간마다 2점 + 첫/끝 점
+    buckets = max(1, (max_points - 2) // 2)
+    edges = np.linspace(0, n, buckets + 1).astype(int)
+    starts, lengths = edges[:-1], np.diff(edges)
+    width = lengths.max()
+    # 구간 길이를 맞추려고 마지막 값으로 채운 (구간, 폭) 행렬
+    cols = np.minimum(starts[:, None] + np.arange(width), starts[:, None] + lengths[:, None] - 1)
+    block = values[cols]
+    lo = cols[np.arange(buckets), np.nanargmin(block, axis=1)]
+    hi = cols[np.arange(buckets), np.nanargmax(block, axis=1)]
+    # 첫 점과 마지막 점은 항상 남김
+    return np.unique(np.concatenate([[0], lo, hi, [n - 1]]))
+
+
+class RandomWalkFeed:
+    """데모용 실시간 지표: ``interval`` 초마다 계열별 랜덤 워크 값을 하나씩 추가합니다."""
+
+    def __init__(self, source, *, interval=1.0, history=300, start=100.0, seed=None):
+        self.source = source
+        self.interval = interval
+        self._rng = np.random.default_rng(seed)
+        self._level = np.full(len(source.series), float(start))
+        self._task = None
+        # 과거 구간을 채워 두고 시작
+        now = pd.Timestamp.now().floor("s")
+        for i in range(history, 0, -1):
+            self._step(now - pd.Timedelta(seconds=i * interval))
+
+    def _step(self, t):
+        self._level += self._rng.standard_normal(len(self._level))
+        self.source.append(t, self._level)
+
+    def start(self):
+        """이벤트 루프에서 처음 호출될 때 한 번만 시작합니다."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            self._step(pd.Timestamp.now())
+
+
+# ---- 세션 출력 -----------------------------------------------------------------
+
+
+def output_stream(spec, gate=None, visible=None, *, plot_refresh=5.0, push_interval=1.0):
+    """스트리밍 소스를 쓰는 ChartSpec 의 렌더러를 현재 세션에 등록합니다.
+
+    ``visible(spec)`` 이 False 인 동안 (다른 탭을 보는 동안) 은 새 점을 보내지 않고, 다시 보이면
+    밀린 점을 한 번에 이어 붙입니다 (표시 점 수를 넘게 밀렸으면 전체를 다시 보냄).
+    """
+    from shiny import reactive
+    from shiny.session import require_active_session
+
+    from .render import cached_plot, cached_plotly
+
+    source = spec.source
+    check = None if gate is None else (lambda: gate(spec))
+    max_points = source.display_points or source.capacity
+
+    def value_fn():
+        if check is not None:
+            check()
+        return spec.fn()
+
+    value_fn.__name__ = spec.id
+
+    if spec.kind == "plot":
+        # PNG 는 이어 붙일 수 없으므로 plot_refresh 초마다 새 seq 로 다시 렌더링 (캐시 키에 seq 포함)
+        @reactive.poll(lambda: source.seq, plot_refresh)
+        def version():
+            return source.seq
+
+        return cached_plot(gate=check, version=version)(value_fn)
+
+    if spec.kind != "plotly":
+        raise ValueError(f"Chart kind '{spec.kind}' can't be streamed")
+
+    session = require_active_session(None)
+    # 그래프가 가진 마지막 seq. 버퍼가 넘쳐 이어 붙일 수 없으면 resync 로 전체를 다시 보냄
+    sent = {"seq": None}
+    resync = reactive.value(0)
+
+    def figure_fn():
+        resync()
+        if check is not None:
+            check()
+        seq = source.seq
+        fig = spec.fn()
+        sent["seq"] = seq
+        return fig, seq
+
+    figure_fn.__name__ = spec.id
+    renderer = cached_plotly(cache=False, stream=True)(figure_fn)
+
+    @reactive.poll(lambda: source.seq, push_interval)
+    def latest():
+        return source.seq
+
+    @reactive.effect
+    async def _push():
+        # 보이지 않는 동안은 poll 에도 의존하지 않음 (탭이 다시 보이면 이 effect 가 다시 실행됨)
+        if visible is not None and not visible(spec):
+            return
+        latest()
+        if sent["seq"] is None:
+            return
+        if check is not None:
+            check()
+        update = source.since(sent["seq"])
+        # 버퍼가 넘쳤거나 표시 점 수보다 많이 밀렸으면 (탭을 오래 떠나 있었으면) 전체를 다시 보냄
+        if update is None or update[0] - sent["seq"] > max_points:
+            with reactive.isolate():
+                resync.set(resync() + 1)
+            return
+        end, t, values = update
+        if end == sent["seq"]:
+            return
+        start, sent["seq"] = sent["seq"], end
+        await session.send_custom_message("gallery-plotly-extend", {
+            "id": session.ns(spec.id),
+            "start": start,
+            "end": end,
+            "x": [np.datetime_as_string(t, unit="ms").tolist()] * len(source.series),
+            "y": [values[:, j].tolist() for j in range(len(source.series))],
+            "traces": list(range(len(source.series))),
+            "maxPoints": max_points,
+        })
+
+    return renderer
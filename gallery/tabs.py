@@ -0,0 +1,108 @@
+"""탭 단위 지연 렌더링.
+
+각 탭의 출력은 사용자가 그 탭을 처음 열 때까지 렌더링하지 않습니다. 탭이 열리면
+(선택적으로) 다음 탭의 차트를 백그라운드에서 미리 렌더링해 캐시를 데워 둡니다.
+"""
+
+import asyncio
+
+from shiny import reactive, req
+
+from .render import prerender
+
+
+class TabActivation:
+    def __init__(self, input, session, registry, *, nav_id, initial, prefetch=True, scheduler=None):
+        self._session = session
+        self._registry = registry
+        self._prefetch = prefetch
+        # 켜져 있으면 미리 렌더링도 렌더 스케줄러의 풀에서 수행
+        self._scheduler = scheduler if scheduler is not None and scheduler.enabled else None
+        self._tasks = set()
+        # 탭마다 별도의 reactive value 를 둬서, 한 탭이 열릴 때 다른 탭의 출력이
+        # 다시 계산되지 않도록 함
+        self._active = {tab: reactive.value(tab == initial) for tab in registry.tabs()}
+        # 지금 보고 있는 탭 (한 번 열린 탭도 다른 탭으로 이동하면 보이지 않음)
+        self._current = reactive.value(initial)
+
+        @reactive.effect
+        @reactive.event(input[nav_id])
+        def _on_tab_change():
+            self._current.set(input[nav_id]())
+            self.activate(input[nav_id]())
+
+        session.on_ended(self._cancel_prefetch)
+        if prefetch:
+            self._schedule_prefetch(initial)
+
+    def is_active(self, tab):
+        value = self._active.get(tab)
+        return value is not None and value()
+
+    def is_active_nonreactive(self, tab):
+        with reactive.isolate():
+            return self.is_active(tab)
+
+    def visible(self, spec):
+        """출력의 탭이 지금 보이는지 (점진적 렌더링에서 사용자가 떠나면 전체 렌더링을 취소)."""
+        return self._current() == spec.tab
+
+    def gate(self, spec):
+        """출력의 탭이 아직 열리지 않았으면 렌더링을 미룹니다."""
+        req(self.is_active(spec.tab))
+
+    def activate(self, tab):
+        value = self._active.get(tab)
+        if value is None:
+            return
+        if self.is_active_nonreactive(tab):
+            return
+        value.set(True)
+        if self._prefetch:
+            self._schedule_prefetch(tab)
+
+    def next_tab(self, tab):
+        """탭 순서상 다음에 열릴 가능성이 높은, 아직 열리지 않은 탭."""
+        tabs = self._registry.tabs()
+        if tab not in tabs:
+            return None
+        start = tabs.index(tab)
+        for candidate in tabs[start + 1:] + tabs[:start]:
+            if not self.is_active_nonreactive(candidate):
+                return candidate
+        return None
+
+    def _schedule_prefetch(self, tab):
+        target = self.next_tab(tab)
+        if target is None:
+            return
+
+        # 현재 탭의 출력이 클라이언트로 전송된 뒤에 시작
+        def start():
+            task = asyncio.create_task(self._prefetch_tab(target))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        self._session.on_flushed(start, once=True)
+
+    async def _prefetch_tab(self, tab):
+        for spec in self._registry.by_tab(tab):
+            # 사용자가 그 사이 탭을 열었다면 일반 렌더링에 맡김
+            if self.is_active_nonreactive(tab):
+                return
+            try:
+                if self._scheduler is not None:
+                    await self._scheduler.prerender(spec)
+                else:
+                    prerender(spec)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # 미리 렌더링 실패는 무시. 탭을 열면 일반 렌더링에서 오류가 표시됨
+                pass
+            # 차트 하나마다 이벤트 루프에 양보해 다른 세션의 요청을 처리
+            await asyncio.sleep(0)
+
+    def _cancel_prefetch(self):
+        for task in list(self._tasks):
+            task.cancel()
@@ -0,0 +1,115 @@
+// Plotly figure JSON 출력 바인딩 (gallery/plotly_output.py)
+// 서버는 {figure, template_id, template?} 를 보내고, 템플릿은 세션에서 처음 한 번만 포함됩니다.
+// 스트리밍 차트는 {stream: {seq}} 도 함께 보내고, 이후에는 새 점만 "gallery-plotly-extend" 메시지로 받습니다.
+// 캐시되는 차트는 {url, template_id, template_url} 만 오고, figure / 템플릿 JSON 은 그 URL 에서 받습니다
+// (gallery/artifacts.py: 내용 해시 URL 이라 브라우저/프록시 캐시를 그대로 씀).
+(function () {
+  var templates = {};
+  // 템플릿 id → 받는 중인 Promise
+  var loading = {};
+
+  function fetchJSON(url) {
+    return fetch(url).then(function (response) {
+      if (!response.ok) {
+        throw new Error("Failed to load " + url + " (" + response.status + ")");
+      }
+      return response.json();
+    });
+  }
+
+  function loadTemplate(id, url) {
+    if (!id || templates[id] || !url) {
+      return Promise.resolve(templates[id]);
+    }
+    if (!loading[id]) {
+      loading[id] = fetchJSON(url).then(function (template) {
+        templates[id] = template;
+        return template;
+      }, function (err) {
+        delete loading[id];
+        throw err;
+      });
+    }
+    return loading[id];
+  }
+
+  function draw(el, figure, value) {
+    var layout = Object.assign({}, figure.layout);
+    if (value.template_id) {
+      layout.template = templates[value.template_id];
+    }
+    el._gallerySeq = null;
+    // react 는 기존 그래프를 지우지 않고 바뀐 부분만 갱신
+    var drawn = Plotly.react(el, figure.data, layout, value.config || { responsive: true });
+    if (value.stream) {
+      drawn.then(function () {
+        el._gallerySeq = value.stream.seq;
+        applyExtends(el);
+      });
+    }
+  }
+
+  // 그래프가 seq 까지의 데이터를 갖고 있을 때, start == seq 인 메시지만 이어 붙임
+  function applyExtends(el) {
+    var pending = el._galleryPending || [];
+    el._galleryPending = [];
+    pending.forEach(function (msg) {
+      if (msg.start !== el._gallerySeq) {
+        return; // 이전 그래프에 대한 메시지
+      }
+      Plotly.extendTraces(el, { x: msg.x, y: msg.y }, msg.traces, msg.maxPoints);
+      el._gallerySeq = msg.end;
+    });
+  }
+
+  Shiny.addCustomMessageHandler("gallery-plotly-extend", function (msg) {
+    var el = document.getElementById(msg.id);
+    if (!el) {
+      return;
+    }
+    (el._galleryPending = el._galleryPending || []).push(msg);
+    if (el._gallerySeq !== undefined && el._gallerySeq !== null) {
+      applyExtends(el);
+    }
+  });
+
+  var binding = new Shiny.OutputBinding();
+  $.extend(binding, {
+    find: function (scope) {
+      return $(scope).find(".gallery-plotly-output");
+    },
+    renderValue: function (el, value) {
+      var self = this;
+      el._galleryUrl = value ? value.url : null;
+      if (!value) {
+        Plotly.purge(el);
+        return;
+      }
+      if (value.url) {
+        Promise.all([fetchJSON(value.url), loadTemplate(value.template_id, value.template_url)]).then(
+          function (loaded) {
+            // 받는 동안 더 새 값이 왔으면 버림
+            if (el._galleryUrl === value.url) {
+              draw(el, loaded[0], value);
+            }
+          },
+          function (err) {
+            if (el._galleryUrl === value.url) {
+              self.renderError(el, { message: err.message });
+            }
+          }
+        );
+        return;
+      }
+      if (value.template) {
+        templates[value.template_id] = value.template;
+      }
+      draw(el, value.figure, value);
+    },
+    renderError: function (el, err) {
+      Plotly.purge(el);
+      Shiny.OutputBinding.prototype.renderError.call(this, el, err);
+    }
+  });
+  Shiny.outputBindings.register(binding, "gallery.plotlyOutput");
+})();
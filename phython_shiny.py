@@ -1,54 +1,173 @@
-import shiny
-from shiny import App, ui, render, reactive
-import pandas as pd
-import numpy as np
-import plotnine as pn
-import plotly.express as px
-import plotly.graph_objects as go
-import seaborn as sns
-import matplotlib.pyplot as plt
+import os
+import sys
 import warnings
 
+from gallery.backends import backends, startup
+
+with startup.timed("import", "shiny, pandas, numpy"):
+    import shiny
+    from shiny import App, ui, render, reactive
+    import pandas as pd
+    import numpy as np
+
+from gallery import aggregate as agg
+from gallery import preview
+from gallery.artifacts import ARTIFACTS, serve_artifacts
+from gallery.cache import attach_shared_store
+from gallery.crossfilter import CrossFilter
+from gallery.datasets import DatasetRegistry
+from gallery.density import SEABORN, density, fill_curve
+from gallery.derived import DerivedData
+from gallery.diagnostics import METRICS, diagnostics_server, install_routes
+from gallery.export import source_hash
+from gallery.figures import figures
+from gallery.plotly_output import output_plotly
+from gallery.registry import ChartRegistry
+from gallery.render import output_for
+from gallery.scheduler import RenderScheduler
+from gallery.stream import RandomWalkFeed, TimeSeriesSource
+from gallery.tabs import TabActivation
+
 # 경고 메시지 억제
 warnings.filterwarnings('ignore', category=UserWarning, message='.*pkg_resources.*')
 warnings.filterwarnings('ignore', category=FutureWarning)
 
-# Seaborn 스타일 설정
-sns.set_style("whitegrid")
-try:
-    plt.style.use('seaborn-v0_8')
-except OSError:
+# 플로팅 라이브러리는 그 라이브러리를 쓰는 차트를 처음 렌더링할 때 import (gallery/backends.py)
+# Seaborn 스타일 설정 (matplotlib 을 처음 쓸 때 적용)
+# sns.set_style("whitegrid") 가 'seaborn-v0_8' 스타일 위에 남기는 설정. seaborn 을 import 하지 않고 적용
+WHITEGRID_RC = {"patch.edgecolor": "w", "patch.force_edgecolor": True, "xtick.bottom": False, "ytick.left": False}
+
+
+def apply_plot_style(plt):
     try:
-        plt.style.use('seaborn')
+        plt.style.use('seaborn-v0_8')
     except OSError:
-        plt.style.use('default')
+        try:
+            plt.style.use('seaborn')
+        except OSError:
+            plt.style.use('default')
+            return
+    plt.rcParams.update(WHITEGRID_RC)
+
+
+backends.register("matplotlib.pyplot", setup=apply_plot_style)
+backends.register("seaborn", requires=("matplotlib.pyplot",))
+backends.register("plotnine", requires=("matplotlib.pyplot",))
+pn = backends.lazy("plotnine")
+px = backends.lazy("plotly.express")
+go = backends.lazy("plotly.graph_objects")
+sns = backends.lazy("seaborn")
+plt = backends.lazy("matplotlib.pyplot")
+# matplotlib 차트는 pyplot 전역 상태 대신 figures.subplots() 로 만들고, 렌더링 후 바로 정리 (gallery/figures.py)
+figures.prepare = lambda: backends.load("matplotlib.pyplot")
 
 # 데이터 준비
+# GALLERY_DATA_DIR 에 <이름>.arrow 파일이 있으면 아래 함수 대신 메모리 맵으로 읽음 (gallery/datasets.py)
+datasets = DatasetRegistry(os.environ.get("GALLERY_DATA_DIR"))
+
+
 # Palmer Penguins dataset: pip install palmerpenguins
-from palmerpenguins import load_penguins
-
-penguins = load_penguins()
-penguins = penguins.dropna(subset=['body_mass_g', 'flipper_length_mm', 'species', 'sex'])
-
-np.random.seed(123)
-house_data = pd.DataFrame({
-    'city': np.repeat(['A', 'B', 'C'], 300),
-    'price': np.concatenate([
-        np.random.normal(1500000, 400000, 300),
-        np.random.normal(2000000, 500000, 300),
-        np.random.normal(1800000, 450000, 300)
-    ]),
-    'bathrooms': np.random.choice([1, 2, 3, 4], 900, replace=True)
-})
-
-netflix_data = pd.DataFrame({
-    'genre': ["action", "crime", "drama", "comedy", "documentary", "reality"],
-    'count': [1027, 1526, 3190, 235, 410, 695]
-})
-netflix_data['fraction'] = netflix_data['count'] / netflix_data['count'].sum()
-netflix_data['ymax'] = netflix_data['fraction'].cumsum()
-netflix_data['ymin'] = netflix_data['ymax'].shift(fill_value=0)
-netflix_data['labelPosition'] = (netflix_data['ymax'] + netflix_data['ymin']) / 2
+@datasets.define("penguins")
+def build_penguins():
+    from palmerpenguins import load_penguins
+
+    df = load_penguins()
+    return df.dropna(subset=['body_mass_g', 'flipper_length_mm', 'species', 'sex'])
+
+
+@datasets.define("house_data")
+def build_house_data():
+    np.random.seed(123)
+    return pd.DataFrame({
+        'city': np.repeat(['A', 'B', 'C'], 300),
+        'price': np.concatenate([
+            np.random.normal(1500000, 400000, 300),
+            np.random.normal(2000000, 500000, 300),
+            np.random.normal(1800000, 450000, 300)
+        ]),
+        'bathrooms': np.random.choice([1, 2, 3, 4], 900, replace=True)
+    })
+
+
+@datasets.define("netflix_data")
+def build_netflix_data():
+    df = pd.DataFrame({
+        'genre': ["action", "crime", "drama", "comedy", "documentary", "reality"],
+        'count': [1027, 1526, 3190, 235, 410, 695]
+    })
+    df['fraction'] = df['count'] / df['count'].sum()
+    df['ymax'] = df['fraction'].cumsum()
+    df['ymin'] = df['ymax'].shift(fill_value=0)
+    df['labelPosition'] = (df['ymax'] + df['ymin']) / 2
+    return df
+
+
+with startup.timed("data", "penguins"):
+    penguins = datasets.load("penguins")
+with startup.timed("data", "house_data"):
+    house_data = datasets.load("house_data")
+with startup.timed("data", "netflix_data"):
+    netflix_data = datasets.load("netflix_data")
+
+PENGUIN_NUMERIC_COLS = ['bill_length_mm', 'bill_depth_mm', 'flipper_length_mm', 'body_mass_g']
+
+# 차트가 쓰는 열만 가진 DataFrame (데이터 지문도 이 열로만 계산)
+penguin_counts = datasets.columns("penguins", ['species', 'sex'])
+penguin_mass = datasets.columns("penguins", ['species', 'body_mass_g'])
+penguin_flipper = datasets.columns("penguins", ['species', 'flipper_length_mm', 'body_mass_g'])
+penguin_numeric = datasets.columns("penguins", PENGUIN_NUMERIC_COLS + ['species'])
+
+# 종별 색은 전체 데이터 기준으로 고정 (교차 필터로 종이 빠져도 남은 종의 색이 바뀌지 않도록)
+SPECIES_COLORS = {"Adelie": "#F8766D", "Chinstrap": "#00BA38", "Gentoo": "#619CFF"}
+# 기본 색 순환(C0, C1, ...)을 쓰는 matplotlib/seaborn 차트용: 전체 데이터에서 처음 나오는 순서의 종과 색
+SPECIES_LEVELS = list(penguins['species'].dropna().unique())
+SPECIES_CYCLE = {species: f"C{k}" for k, species in enumerate(SPECIES_LEVELS)}
+
+# 교차 필터: 사이드바에서 고른 조건으로 각 데이터셋의 행을 거름 (차원마다 색인을 한 번만 만듦)
+# 차트 함수는 filters.view(frame) 으로 현재 세션의 조건에 맞는 행만 받음
+filters = CrossFilter(datasets)
+filters.categorical("penguins", "species", label="Species")
+filters.categorical("penguins", "sex", label="Sex")
+filters.categorical("house_data", "city", label="City")
+filters.range("house_data", "price", label="Price (USD)")
+filters.categorical("house_data", "bathrooms", label="Bathrooms")
+
+# 파생 집계: 데이터 버전 (그리고 필터 상태) 마다 한 번만 계산하고 모든 차트/세션이 같은 결과를 공유
+derived = DerivedData(view=filters.scoped)
+derived.set_source("penguins", penguins)
+derived.set_source("house_data", house_data)
+
+# 실시간 시계열: 1초마다 계열별로 한 점씩 추가되는 링 버퍼 (최근 1시간 보관)
+# 차트에 한 번에 그리는 계열별 최대 점 수 (넘으면 구간별 최소/최대만 남김)
+STREAM_DISPLAY_POINTS = 1000
+ts_source = TimeSeriesSource(['A', 'B', 'C'], capacity=3600, display_points=STREAM_DISPLAY_POINTS)
+ts_feed = RandomWalkFeed(ts_source, interval=1.0, history=300)
+
+
+@derived.define("penguins", columns=PENGUIN_NUMERIC_COLS)
+def penguin_corr(df):
+    return df[PENGUIN_NUMERIC_COLS].corr()
+
+
+@derived.define("penguins", columns=['species'])
+def species_counts(df):
+    return df.groupby('species').size().reset_index(name='count')
+
+
+@derived.define("penguins", columns=['species', 'sex'])
+def species_sex_counts(df):
+    return df.groupby(['species', 'sex']).size().reset_index(name='n')
+
+
+@derived.define("penguins", columns=['species'])
+def penguin_summary(df):
+    return f"Total Penguins: {len(df)}\nSpecies:\n{df['species'].value_counts().to_string()}"
+
+
+@derived.define("house_data", columns=['price'])
+def house_summary(df):
+    return f"Total Houses: {len(df)}\nPrice Range: ${int(df['price'].min()):,} - ${int(df['price'].max()):,}\nMean Price: ${int(df['price'].mean()):,}"
+
 
 # UI
 app_ui = ui.page_navbar(
@@ -108,28 +227,28 @@ app_ui = ui.page_navbar(
         ui.layout_columns(
             ui.card(ui.h4("ggplot2 (plotnine)"), ui.output_plot("compare_bar_ggplot"), ui.p({"class": "text-muted"}, "문법적 계층 구조, 레이어 기반")),
             ui.card(ui.h4("Seaborn"), ui.output_plot("compare_bar_seaborn"), ui.p({"class": "text-muted"}, "간결한 API, 통계적 시각화")),
-            ui.card(ui.h4("Plotly"), ui.output_ui("compare_bar_plotly"), ui.p({"class": "text-muted"}, "인터랙티브, 웹 기반")),
+            ui.card(ui.h4("Plotly"), output_plotly("compare_bar_plotly"), ui.p({"class": "text-muted"}, "인터랙티브, 웹 기반")),
         ),
         ui.hr(),
         ui.h3("2. 산점도 비교"),
         ui.layout_columns(
             ui.card(ui.h4("ggplot2 (plotnine)"), ui.output_plot("compare_scatter_ggplot"), ui.p({"class": "text-muted"}, "세밀한 커스터마이징 가능")),
             ui.card(ui.h4("Seaborn"), ui.output_plot("compare_scatter_seaborn"), ui.p({"class": "text-muted"}, "회귀선 자동 추가")),
-            ui.card(ui.h4("Plotly"), ui.output_ui("compare_scatter_plotly"), ui.p({"class": "text-muted"}, "호버 정보, 줌/팬 기능")),
+            ui.card(ui.h4("Plotly"), output_plotly("compare_scatter_plotly"), ui.p({"class": "text-muted"}, "호버 정보, 줌/팬 기능")),
         ),
         ui.hr(),
         ui.h3("3. 박스플롯 비교"),
         ui.layout_columns(
             ui.card(ui.h4("ggplot2 (plotnine)"), ui.output_plot("compare_box_ggplot"), ui.p({"class": "text-muted"}, "레이어 추가로 확장 용이")),
             ui.card(ui.h4("Seaborn"), ui.output_plot("compare_box_seaborn"), ui.p({"class": "text-muted"}, "한 줄 코드로 빠른 시각화")),
-            ui.card(ui.h4("Plotly"), ui.output_ui("compare_box_plotly"), ui.p({"class": "text-muted"}, "인터랙티브 박스플롯")),
+            ui.card(ui.h4("Plotly"), output_plotly("compare_box_plotly"), ui.p({"class": "text-muted"}, "인터랙티브 박스플롯")),
         ),
         ui.hr(),
         ui.h3("4. 히트맵 비교"),
         ui.layout_columns(
             ui.card(ui.h4("ggplot2 (plotnine)"), ui.output_plot("compare_heatmap_ggplot"), ui.p({"class": "text-muted"}, "geom_tile 사용")),
             ui.card(ui.h4("Seaborn"), ui.output_plot("compare_heatmap_seaborn"), ui.p({"class": "text-muted"}, "heatmap() 함수로 간단히")),
-            ui.card(ui.h4("Plotly"), ui.output_ui("compare_heatmap_plotly"), ui.p({"class": "text-muted"}, "인터랙티브 히트맵")),
+            ui.card(ui.h4("Plotly"), output_plotly("compare_heatmap_plotly"), ui.p({"class": "text-muted"}, "인터랙티브 히트맵")),
         ),
     ),
     ui.nav_panel(
@@ -141,7 +260,7 @@ app_ui = ui.page_navbar(
         ui.hr(),
         ui.layout_columns(
             ui.card(ui.h3("Line Chart"), ui.output_plot("plot11"), ui.hr(), ui.p({"class": "text-muted"}, "시계열 데이터 시각화")),
-            ui.card(ui.h3("Pie Chart"), ui.output_ui("plot12"), ui.hr(), ui.p({"class": "text-muted"}, "Netflix 장르별 분포")),
+            ui.card(ui.h3("Pie Chart"), output_plotly("plot12"), ui.hr(), ui.p({"class": "text-muted"}, "Netflix 장르별 분포")),
         )
     ),
     ui.nav_panel(
@@ -150,367 +269,503 @@ app_ui = ui.page_navbar(
         ui.p("Plotly를 사용한 인터랙티브 시각화 - 줌, 팬, 호버 기능 지원"),
         ui.hr(),
         ui.layout_columns(
-            ui.card(ui.h3("3D Scatter Plot"), ui.output_ui("interactive_3d"), ui.hr(), ui.p({"class": "text-muted"}, "3차원 산점도 - 회전 가능")),
-            ui.card(ui.h3("Interactive Time Series"), ui.output_ui("interactive_ts"), ui.hr(), ui.p({"class": "text-muted"}, "인터랙티브 시계열 차트")),
+            ui.card(ui.h3("3D Scatter Plot"), output_plotly("interactive_3d"), ui.hr(), ui.p({"class": "text-muted"}, "3차원 산점도 - 회전 가능")),
+            ui.card(ui.h3("Interactive Time Series"), output_plotly("interactive_ts"), ui.hr(), ui.p({"class": "text-muted"}, "인터랙티브 시계열 차트")),
         ),
         ui.hr(),
         ui.layout_columns(
-            ui.card(ui.h3("Sunburst Chart"), ui.output_ui("interactive_sunburst"), ui.hr(), ui.p({"class": "text-muted"}, "계층적 데이터 시각화")),
-            ui.card(ui.h3("Parallel Coordinates"), ui.output_ui("interactive_parallel"), ui.hr(), ui.p({"class": "text-muted"}, "다차원 데이터 시각화")),
+            ui.card(ui.h3("Sunburst Chart"), output_plotly("interactive_sunburst"), ui.hr(), ui.p({"class": "text-muted"}, "계층적 데이터 시각화")),
+            ui.card(ui.h3("Parallel Coordinates"), output_plotly("interactive_parallel"), ui.hr(), ui.p({"class": "text-muted"}, "다차원 데이터 시각화")),
         )
     ),
-    title="Data Visualization Gallery"
+    title="Data Visualization Gallery",
+    id="main_nav",
+    # 교차 필터: 바꾸면 그 데이터셋을 쓰는 차트만 다시 렌더링
+    sidebar=ui.sidebar(ui.h4("필터"), *filters.controls(), open="closed"),
 )
 
-# 서버 로직
-def server(input, output, session):
-    # 대시보드 quick stats
-    @output
-    @render.text
-    def quick_stats_penguins():
-        out = f"Total Penguins: {len(penguins)}\nSpecies:\n{penguins['species'].value_counts().to_string()}"
-        return out
-
-    @output
-    @render.text
-    def quick_stats_houses():
-        out = f"Total Houses: {len(house_data)}\nPrice Range: ${int(house_data['price'].min()):,} - ${int(house_data['price'].max()):,}\nMean Price: ${int(house_data['price'].mean()):,}"
-        return out
-
-    # 정적 플롯
-    @output
-    @render.plot
-    def plot1():
-        df = penguins.groupby(['species', 'sex']).size().reset_index(name='n')
-        p = (pn.ggplot(df, pn.aes(x='species', y='n', fill='sex'))
-             + pn.geom_bar(stat='identity', position='stack')
-             + pn.geom_text(pn.aes(label='n'), position=pn.position_stack(vjust=0.5), color="white", size=8, fontweight="bold")
-             + pn.scale_fill_manual(values={"female": "#E69F00", "male": "#56B4E9"})
-             + pn.labs(title="Penguin Count by Species and Sex", x="Species", y="Count", fill="Sex")
-             + pn.theme_minimal(base_size=14))
-        return p
-
-    @output
-    @render.plot
-    def plot2():
-        p = (pn.ggplot(penguins, pn.aes(x='species', y='body_mass_g', fill='species'))
+# 차트 정의 (output id = 함수 이름)
+charts = ChartRegistry()
+
+# 대시보드 quick stats
+@charts.register("text", tab="Dashboard", cache=False, data=(penguins,))
+def quick_stats_penguins():
+    out = derived["penguin_summary"]
+    return out
+
+@charts.register("text", tab="Dashboard", cache=False, data=(house_data,))
+def quick_stats_houses():
+    out = derived["house_summary"]
+    return out
+
+# 정적 플롯
+@charts.register("plot", tab="Basic Charts", data=(penguin_counts,))
+def plot1():
+    df = derived["species_sex_counts"]
+    p = (pn.ggplot(df, pn.aes(x='species', y='n', fill='sex'))
+         + pn.geom_bar(stat='identity', position='stack')
+         + pn.geom_text(pn.aes(label='n'), position=pn.position_stack(vjust=0.5), color="white", size=8, fontweight="bold")
+         + pn.scale_fill_manual(values={"female": "#E69F00", "male": "#56B4E9"})
+         + pn.labs(title="Penguin Count by Species and Sex", x="Species", y="Count", fill="Sex")
+         + pn.theme_minimal(base_size=14))
+    return p
+
+@charts.register("plot", tab="Basic Charts", data=(penguin_mass,))
+def plot2():
+    df = filters.view(penguin_mass)
+    if agg.is_large(df):
+        # 대용량 모드: 사분위수는 미리 계산하고 jitter 점은 화면 격자 기준으로 솎아냄
+        points = agg.thin_scatter(df, None, 'body_mass_g', group='species')
+        p = (pn.ggplot(agg.box_stats(df, 'body_mass_g', group='species'), pn.aes(x='species', fill='species'))
+             + pn.geom_boxplot(pn.aes(ymin='ymin', lower='lower', middle='middle', upper='upper', ymax='ymax'),
+                               stat='identity', alpha=0.7)
+             + pn.geom_jitter(pn.aes(y='body_mass_g'), data=points, width=0.2, alpha=0.3, size=1.5))
+    else:
+        p = (pn.ggplot(df, pn.aes(x='species', y='body_mass_g', fill='species'))
              + pn.geom_boxplot(alpha=0.7)
-             + pn.geom_jitter(width=0.2, alpha=0.3, size=1.5)
-             + pn.scale_fill_manual(values={"Adelie": "#F8766D", "Chinstrap": "#00BA38", "Gentoo": "#619CFF"})
-             + pn.labs(title="Distribution of Penguin Body Mass by Species", x="Species", y="Body Mass (g)")
-             + pn.theme_minimal(base_size=14))
-        return p
-
-    @output
-    @render.plot
-    def plot3():
-        p = (pn.ggplot(house_data, pn.aes(x='price', fill='city'))
-             + pn.geom_histogram(alpha=0.6, bins=30, position='identity')
-             + pn.scale_fill_manual(values={"A": "#FF6B6B", "B": "#4ECDC4", "C": "#95E1D3"})
-             + pn.scale_x_continuous(labels=lambda l: [f"{int(x):,}" for x in l])
-             + pn.labs(title="American House Prices in Big Cities", x="Price (USD)", y="Count", fill="City")
-             + pn.theme_minimal(base_size=14))
-        return p
-
-    @output
-    @render.plot
-    def plot4():
-        p = (pn.ggplot(house_data, pn.aes(x='price', color='bathrooms'))
-             + pn.geom_density(size=1.2)
-             + pn.scale_x_continuous(labels=lambda l: [f"{int(x):,}" for x in l])
-             + pn.labs(title="House Prices - Density Plot by Number of Bathrooms", x="Price (USD)", y="Density")
-             + pn.theme_minimal(base_size=14))
-        return p
-
-    # Distributions 탭 그래프
-    @output
-    @render.plot
-    def plot5():
-        p = (pn.ggplot(penguins, pn.aes(x='species', y='body_mass_g', fill='species'))
-             + pn.geom_violin(alpha=0.7)
-             + pn.scale_fill_manual(values={"Adelie": "#F8766D", "Chinstrap": "#00BA38", "Gentoo": "#619CFF"})
-             + pn.labs(title="Violin Plot: Body Mass by Species", x="Species", y="Body Mass (g)")
-             + pn.theme_minimal(base_size=14))
-        return p
-
-    @output
-    @render.plot
-    def plot6():
-        fig, ax = plt.subplots(figsize=(10, 6))
-        for species in penguins['species'].unique():
-            data = penguins[penguins['species'] == species]['flipper_length_mm']
-            sns.kdeplot(data=data, label=species, ax=ax, fill=True, alpha=0.6)
-        ax.set_title("Ridge Plot: Flipper Length by Species")
-        ax.set_xlabel("Flipper Length (mm)")
-        ax.set_ylabel("Density")
-        ax.legend()
-        plt.tight_layout()
-        return fig
-
-    @output
-    @render.plot
-    def plot7():
-        p = (pn.ggplot(penguins, pn.aes(x='flipper_length_mm', y='body_mass_g', color='species'))
+             + pn.geom_jitter(width=0.2, alpha=0.3, size=1.5))
+    p = (p
+         + pn.scale_fill_manual(values={"Adelie": "#F8766D", "Chinstrap": "#00BA38", "Gentoo": "#619CFF"})
+         + pn.labs(title="Distribution of Penguin Body Mass by Species", x="Species", y="Body Mass (g)")
+         + pn.theme_minimal(base_size=14))
+    return p
+
+@charts.register("plot", tab="Basic Charts", data=(house_data,))
+def plot3():
+    df = filters.view(house_data)
+    if agg.is_large(df):
+        # 대용량 모드: 구간별 개수를 미리 집계해 막대만 그림
+        p = (pn.ggplot(agg.histogram(df, 'price', group='city', bins=30),
+                       pn.aes(xmin='xmin', xmax='xmax', ymin=0, ymax='count', fill='city'))
+             + pn.geom_rect(alpha=0.6))
+    else:
+        p = (pn.ggplot(df, pn.aes(x='price', fill='city'))
+             + pn.geom_histogram(alpha=0.6, bins=30, position='identity'))
+    p = (p
+         + pn.scale_fill_manual(values={"A": "#FF6B6B", "B": "#4ECDC4", "C": "#95E1D3"})
+         + pn.scale_x_continuous(labels=lambda l: [f"{int(x):,}" for x in l])
+         + pn.labs(title="American House Prices in Big Cities", x="Price (USD)", y="Count", fill="City")
+         + pn.theme_minimal(base_size=14))
+    return p
+
+@charts.register("plot", tab="Basic Charts", data=(house_data,))
+def plot4():
+    # 밀도 곡선은 공유 KDE 엔진에서 계산 (geom_density 기본값: nrd0 대역폭, 1024점 격자).
+    # 원래 차트의 color='bathrooms' 는 연속 척도라 그룹을 나누지 않았으므로 전체 가격의 곡선 하나
+    p = (pn.ggplot(density.kde(filters.view(house_data), 'price'), pn.aes(x='x', y='density'))
+         + pn.geom_line(size=1.2)
+         + pn.scale_x_continuous(labels=lambda l: [f"{int(x):,}" for x in l])
+         + pn.labs(title="House Prices - Density Plot by Number of Bathrooms", x="Price (USD)", y="Density")
+         + pn.theme_minimal(base_size=14))
+    return p
+
+# Distributions 탭 그래프
+@charts.register("plot", tab="Distributions", data=(penguin_mass,))
+def plot5():
+    # 종별 밀도는 공유 KDE 엔진에서 미리 계산하고 바이올린 모양만 그림
+    p = (pn.ggplot(density.violin(filters.view(penguin_mass), 'body_mass_g', group='species'), pn.aes(x='species', y='y', fill='species'))
+         + pn.geom_violin(pn.aes(violinwidth='violinwidth', width='width'), stat='identity', alpha=0.7)
+         + pn.scale_fill_manual(values={"Adelie": "#F8766D", "Chinstrap": "#00BA38", "Gentoo": "#619CFF"})
+         + pn.labs(title="Violin Plot: Body Mass by Species", x="Species", y="Body Mass (g)")
+         + pn.theme_minimal(base_size=14))
+    return p
+
+@charts.register("plot", tab="Distributions", data=(penguin_flipper,))
+def plot6():
+    df = filters.view(penguin_flipper)
+    fig, ax = figures.subplots(figsize=(10, 6))
+    # 종별 곡선을 한 번에 계산 (sns.kdeplot 과 같은 대역폭/범위)
+    curves = density.curves(df, 'flipper_length_mm', group='species', **SEABORN)
+    for species in SPECIES_LEVELS:
+        if species in curves:
+            fill_curve(ax, *curves[species], color=SPECIES_CYCLE[species], alpha=0.6, label=species)
+    ax.set_title("Ridge Plot: Flipper Length by Species")
+    ax.set_xlabel("Flipper Length (mm)")
+    ax.set_ylabel("Density")
+    ax.legend()
+    fig.tight_layout()
+    return fig
+
+@charts.register("plot", tab="Distributions", data=(penguin_flipper,))
+def plot7():
+    df = filters.view(penguin_flipper)
+    if agg.is_large(df):
+        # 대용량 모드: 회귀선/신뢰구간은 전체 데이터로 계산하고, 점은 화면 격자 기준으로 솎아냄
+        fit = agg.linear_fit(df, 'flipper_length_mm', 'body_mass_g', group='species')
+        p = (pn.ggplot(agg.thin_scatter(df, 'flipper_length_mm', 'body_mass_g', group='species'),
+                       pn.aes(x='flipper_length_mm', y='body_mass_g', color='species'))
              + pn.geom_point(alpha=0.6)
-             + pn.geom_smooth(method='lm', se=True)
-             + pn.scale_color_manual(values={"Adelie": "#F8766D", "Chinstrap": "#00BA38", "Gentoo": "#619CFF"})
-             + pn.labs(title="Scatter Plot with Regression Line", x="Flipper Length (mm)", y="Body Mass (g)")
-             + pn.theme_minimal(base_size=14))
-        return p
-
-    @output
-    @render.plot
-    def plot8():
-        p = (pn.ggplot(penguins, pn.aes(x='body_mass_g', fill='species'))
-             + pn.geom_histogram(bins=30, alpha=0.7)
-             + pn.facet_wrap('~species', ncol=3)
-             + pn.scale_fill_manual(values={"Adelie": "#F8766D", "Chinstrap": "#00BA38", "Gentoo": "#619CFF"})
-             + pn.labs(title="Faceted Histogram: Body Mass by Species", x="Body Mass (g)", y="Count")
-             + pn.theme_minimal(base_size=12))
-        return p
-
-    # Advanced 탭 그래프
-    @output
-    @render.plot
-    def plot9():
-        corr_data = penguins[['bill_length_mm', 'bill_depth_mm', 'flipper_length_mm', 'body_mass_g']].corr()
-        p = (pn.ggplot(corr_data.reset_index().melt(id_vars='index'), 
-                      pn.aes(x='index', y='variable', fill='value'))
-             + pn.geom_tile()
-             + pn.scale_fill_gradient2(low="#FF6B6B", mid="white", high="#4ECDC4", midpoint=0)
-             + pn.labs(title="Correlation Heatmap", x="", y="", fill="Correlation")
-             + pn.theme_minimal(base_size=12)
-             + pn.theme(axis_text_x=pn.element_text(angle=45, hjust=1)))
-        return p
-
-    @output
-    @render.plot
-    def plot10():
-        fig = sns.pairplot(penguins[['bill_length_mm', 'bill_depth_mm', 'flipper_length_mm', 'body_mass_g', 'species']], 
-                          hue='species', diag_kind='kde')
-        fig.fig.suptitle("Pair Plot: Variable Relationships", y=1.02)
-        return fig.fig
-
-    @output
-    @render.plot
-    def plot11():
-        # 시계열 데이터 생성
-        dates = pd.date_range('2020-01-01', periods=100, freq='D')
-        ts_data = pd.DataFrame({
-            'date': dates,
-            'value': np.cumsum(np.random.randn(100)) + 100,
-            'category': np.random.choice(['A', 'B', 'C'], 100)
-        })
-        p = (pn.ggplot(ts_data, pn.aes(x='date', y='value', color='category'))
-             + pn.geom_line(size=1.2)
-             + pn.labs(title="Time Series Line Chart", x="Date", y="Value")
-             + pn.theme_minimal(base_size=14))
-        return p
-
-    @output
-    @render.ui
-    def plot12():
-        fig = px.pie(netflix_data, values='count', names='genre', 
-                     title="Netflix Genre Distribution",
-                     color_discrete_sequence=px.colors.qualitative.Set3)
-        fig.update_traces(textposition='inside', textinfo='percent+label')
-        html_str = fig.to_html(include_plotlyjs='cdn', div_id="plot12")
-        return ui.HTML(html_str)
-
-    # Library Comparison - 막대 그래프
-    @output
-    @render.plot
-    def compare_bar_ggplot():
-        df = penguins.groupby('species').size().reset_index(name='count')
-        p = (pn.ggplot(df, pn.aes(x='species', y='count', fill='species'))
-             + pn.geom_bar(stat='identity')
-             + pn.scale_fill_manual(values={"Adelie": "#F8766D", "Chinstrap": "#00BA38", "Gentoo": "#619CFF"})
-             + pn.labs(title="ggplot2: Bar Chart", x="Species", y="Count")
-             + pn.theme_minimal())
-        return p
-
-    @output
-    @render.plot
-    def compare_bar_seaborn():
-        fig, ax = plt.subplots(figsize=(8, 5))
-        sns.countplot(data=penguins, x='species', ax=ax, palette=["#F8766D", "#00BA38", "#619CFF"])
-        ax.set_title("Seaborn: Bar Chart")
-        ax.set_xlabel("Species")
-        ax.set_ylabel("Count")
-        plt.tight_layout()
-        return fig
-
-    @output
-    @render.ui
-    def compare_bar_plotly():
-        df = penguins.groupby('species').size().reset_index(name='count')
-        fig = px.bar(df, x='species', y='count', color='species',
-                     title="Plotly: Interactive Bar Chart",
-                     color_discrete_map={"Adelie": "#F8766D", "Chinstrap": "#00BA38", "Gentoo": "#619CFF"})
-        html_str = fig.to_html(include_plotlyjs='cdn', div_id="compare_bar_plotly")
-        return ui.HTML(html_str)
-
-    # Library Comparison - 산점도
-    @output
-    @render.plot
-    def compare_scatter_ggplot():
-        p = (pn.ggplot(penguins, pn.aes(x='flipper_length_mm', y='body_mass_g', color='species'))
+             + pn.geom_ribbon(pn.aes(x='x', ymin='ymin', ymax='ymax', group='species'), data=fit,
+                              inherit_aes=False, fill='#999999', alpha=0.4)
+             + pn.geom_line(pn.aes(x='x', y='y', color='species'), data=fit, inherit_aes=False, size=1))
+    else:
+        p = (pn.ggplot(df, pn.aes(x='flipper_length_mm', y='body_mass_g', color='species'))
              + pn.geom_point(alpha=0.6)
-             + pn.scale_color_manual(values={"Adelie": "#F8766D", "Chinstrap": "#00BA38", "Gentoo": "#619CFF"})
-             + pn.labs(title="ggplot2: Scatter Plot", x="Flipper Length (mm)", y="Body Mass (g)")
-             + pn.theme_minimal())
-        return p
-
-    @output
-    @render.plot
-    def compare_scatter_seaborn():
-        fig, ax = plt.subplots(figsize=(8, 5))
-        sns.scatterplot(data=penguins, x='flipper_length_mm', y='body_mass_g', 
-                       hue='species', ax=ax, palette=["#F8766D", "#00BA38", "#619CFF"], alpha=0.6)
-        sns.regplot(data=penguins, x='flipper_length_mm', y='body_mass_g', 
+             + pn.geom_smooth(method='lm', se=True))
+    p = (p
+         + pn.scale_color_manual(values={"Adelie": "#F8766D", "Chinstrap": "#00BA38", "Gentoo": "#619CFF"})
+         + pn.labs(title="Scatter Plot with Regression Line", x="Flipper Length (mm)", y="Body Mass (g)")
+         + pn.theme_minimal(base_size=14))
+    return p
+
+@charts.preview(plot7)
+def plot7_preview():
+    # 미리보기: 표본 점만 (회귀선/신뢰구간 계산 없음)
+    return (pn.ggplot(preview.sample(filters.view(penguin_flipper)), pn.aes(x='flipper_length_mm', y='body_mass_g', color='species'))
+            + pn.geom_point(alpha=0.6)
+            + pn.scale_color_manual(values={"Adelie": "#F8766D", "Chinstrap": "#00BA38", "Gentoo": "#619CFF"})
+            + pn.labs(title="Scatter Plot with Regression Line", x="Flipper Length (mm)", y="Body Mass (g)")
+            + pn.theme_minimal(base_size=14))
+
+@charts.register("plot", tab="Distributions", data=(penguin_mass,))
+def plot8():
+    df = filters.view(penguin_mass)
+    if agg.is_large(df):
+        # 대용량 모드: 구간별 개수를 미리 집계 (facet 간 같은 구간 경계)
+        p = (pn.ggplot(agg.histogram(df, 'body_mass_g', group='species', bins=30),
+                       pn.aes(xmin='xmin', xmax='xmax', ymin=0, ymax='count', fill='species'))
+             + pn.geom_rect(alpha=0.7))
+    else:
+        p = (pn.ggplot(df, pn.aes(x='body_mass_g', fill='species'))
+             + pn.geom_histogram(bins=30, alpha=0.7))
+    p = (p
+         + pn.facet_wrap('~species', ncol=3)
+         + pn.scale_fill_manual(values={"Adelie": "#F8766D", "Chinstrap": "#00BA38", "Gentoo": "#619CFF"})
+         + pn.labs(title="Faceted Histogram: Body Mass by Species", x="Body Mass (g)", y="Count")
+         + pn.theme_minimal(base_size=12))
+    return p
+
+# Library Comparison - 막대 그래프
+@charts.register("plot", tab="Library Comparison", data=(penguin_counts,))
+def compare_bar_ggplot():
+    df = derived["species_counts"]
+    p = (pn.ggplot(df, pn.aes(x='species', y='count', fill='species'))
+         + pn.geom_bar(stat='identity')
+         + pn.scale_fill_manual(values={"Adelie": "#F8766D", "Chinstrap": "#00BA38", "Gentoo": "#619CFF"})
+         + pn.labs(title="ggplot2: Bar Chart", x="Species", y="Count")
+         + pn.theme_minimal())
+    return p
+
+@charts.register("plot", tab="Library Comparison", data=(penguin_counts,))
+def compare_bar_seaborn():
+    fig, ax = figures.subplots(figsize=(8, 5))
+    sns.countplot(data=filters.view(penguin_counts), x='species', ax=ax, palette=SPECIES_COLORS)
+    ax.set_title("Seaborn: Bar Chart")
+    ax.set_xlabel("Species")
+    ax.set_ylabel("Count")
+    fig.tight_layout()
+    return fig
+
+@charts.register("plotly", tab="Library Comparison", data=(penguin_counts,))
+def compare_bar_plotly():
+    df = derived["species_counts"]
+    fig = px.bar(df, x='species', y='count', color='species',
+                 title="Plotly: Interactive Bar Chart",
+                 color_discrete_map={"Adelie": "#F8766D", "Chinstrap": "#00BA38", "Gentoo": "#619CFF"})
+    return fig
+
+# Library Comparison - 산점도
+@charts.register("plot", tab="Library Comparison", data=(penguin_flipper,))
+def compare_scatter_ggplot():
+    df = filters.view(penguin_flipper)
+    # 대용량 모드에서는 화면 격자 기준으로 솎아낸 점만 그림
+    points = agg.thin_scatter(df, 'flipper_length_mm', 'body_mass_g', group='species') if agg.is_large(df) else df
+    p = (pn.ggplot(points, pn.aes(x='flipper_length_mm', y='body_mass_g', color='species'))
+         + pn.geom_point(alpha=0.6)
+         + pn.scale_color_manual(values={"Adelie": "#F8766D", "Chinstrap": "#00BA38", "Gentoo": "#619CFF"})
+         + pn.labs(title="ggplot2: Scatter Plot", x="Flipper Length (mm)", y="Body Mass (g)")
+         + pn.theme_minimal())
+    return p
+
+@charts.register("plot", tab="Library Comparison", data=(penguin_flipper,))
+def compare_scatter_seaborn():
+    df = filters.view(penguin_flipper)
+    fig, ax = figures.subplots(figsize=(8, 5))
+    if agg.is_large(df):
+        # 대용량 모드: regplot 의 부트스트랩 대신 전체 데이터로 회귀선/신뢰구간을 한 번에 계산
+        points = agg.thin_scatter(df, 'flipper_length_mm', 'body_mass_g', group='species')
+        sns.scatterplot(data=points, x='flipper_length_mm', y='body_mass_g',
+                       hue='species', ax=ax, palette=SPECIES_COLORS, alpha=0.6)
+        fit = agg.linear_fit(df, 'flipper_length_mm', 'body_mass_g')
+        ax.plot(fit['x'], fit['y'], color='gray', linestyle='--')
+        ax.fill_between(fit['x'], fit['ymin'], fit['ymax'], color='gray', alpha=0.15, linewidth=0)
+    else:
+        sns.scatterplot(data=df, x='flipper_length_mm', y='body_mass_g', 
+                       hue='species', ax=ax, palette=SPECIES_COLORS, alpha=0.6)
+        sns.regplot(data=df, x='flipper_length_mm', y='body_mass_g', 
                    scatter=False, ax=ax, color='gray', line_kws={'linestyle': '--'})
-        ax.set_title("Seaborn: Scatter Plot with Regression")
-        ax.set_xlabel("Flipper Length (mm)")
-        ax.set_ylabel("Body Mass (g)")
-        plt.tight_layout()
-        return fig
-
-    @output
-    @render.ui
-    def compare_scatter_plotly():
-        fig = px.scatter(penguins, x='flipper_length_mm', y='body_mass_g', color='species',
-                        title="Plotly: Interactive Scatter Plot",
-                        hover_data=['bill_length_mm', 'bill_depth_mm'],
-                        color_discrete_map={"Adelie": "#F8766D", "Chinstrap": "#00BA38", "Gentoo": "#619CFF"})
-        html_str = fig.to_html(include_plotlyjs='cdn', div_id="compare_scatter_plotly")
-        return ui.HTML(html_str)
-
-    # Library Comparison - 박스플롯
-    @output
-    @render.plot
-    def compare_box_ggplot():
-        p = (pn.ggplot(penguins, pn.aes(x='species', y='body_mass_g', fill='species'))
-             + pn.geom_boxplot(alpha=0.7)
-             + pn.geom_jitter(width=0.2, alpha=0.3)
-             + pn.scale_fill_manual(values={"Adelie": "#F8766D", "Chinstrap": "#00BA38", "Gentoo": "#619CFF"})
-             + pn.labs(title="ggplot2: Box Plot", x="Species", y="Body Mass (g)")
-             + pn.theme_minimal())
-        return p
-
-    @output
-    @render.plot
-    def compare_box_seaborn():
-        fig, ax = plt.subplots(figsize=(8, 5))
-        sns.boxplot(data=penguins, x='species', y='body_mass_g', ax=ax, 
-                   palette=["#F8766D", "#00BA38", "#619CFF"])
-        sns.stripplot(data=penguins, x='species', y='body_mass_g', ax=ax, 
-                     color='black', alpha=0.3, size=3)
-        ax.set_title("Seaborn: Box Plot")
-        ax.set_xlabel("Species")
-        ax.set_ylabel("Body Mass (g)")
-        plt.tight_layout()
-        return fig
-
-    @output
-    @render.ui
-    def compare_box_plotly():
-        fig = px.box(penguins, x='species', y='body_mass_g', color='species',
-                    title="Plotly: Interactive Box Plot",
+    ax.set_title("Seaborn: Scatter Plot with Regression")
+    ax.set_xlabel("Flipper Length (mm)")
+    ax.set_ylabel("Body Mass (g)")
+    fig.tight_layout()
+    return fig
+
+@charts.register("plotly", tab="Library Comparison", data=(penguins,))
+def compare_scatter_plotly():
+    df = filters.view(penguins)
+    # 대용량 모드에서는 화면 격자 기준으로 솎아낸 점만 전송
+    points = agg.thin_scatter(df, 'flipper_length_mm', 'body_mass_g', group='species') if agg.is_large(df) else df
+    fig = px.scatter(points, x='flipper_length_mm', y='body_mass_g', color='species',
+                    title="Plotly: Interactive Scatter Plot",
+                    hover_data=['bill_length_mm', 'bill_depth_mm'],
                     color_discrete_map={"Adelie": "#F8766D", "Chinstrap": "#00BA38", "Gentoo": "#619CFF"})
-        html_str = fig.to_html(include_plotlyjs='cdn', div_id="compare_box_plotly")
-        return ui.HTML(html_str)
-
-    # Library Comparison - 히트맵
-    @output
-    @render.plot
-    def compare_heatmap_ggplot():
-        corr_data = penguins[['bill_length_mm', 'bill_depth_mm', 'flipper_length_mm', 'body_mass_g']].corr()
-        p = (pn.ggplot(corr_data.reset_index().melt(id_vars='index'), 
-                      pn.aes(x='index', y='variable', fill='value'))
-             + pn.geom_tile()
-             + pn.scale_fill_gradient2(low="#FF6B6B", mid="white", high="#4ECDC4", midpoint=0)
-             + pn.labs(title="ggplot2: Heatmap", x="", y="", fill="Correlation")
-             + pn.theme_minimal()
-             + pn.theme(axis_text_x=pn.element_text(angle=45, hjust=1)))
-        return p
-
-    @output
-    @render.plot
-    def compare_heatmap_seaborn():
-        corr_data = penguins[['bill_length_mm', 'bill_depth_mm', 'flipper_length_mm', 'body_mass_g']].corr()
-        fig, ax = plt.subplots(figsize=(8, 6))
-        sns.heatmap(corr_data, annot=True, fmt='.2f', cmap='coolwarm', center=0, ax=ax, square=True)
-        ax.set_title("Seaborn: Heatmap")
-        plt.tight_layout()
-        return fig
-
-    @output
-    @render.ui
-    def compare_heatmap_plotly():
-        corr_data = penguins[['bill_length_mm', 'bill_depth_mm', 'flipper_length_mm', 'body_mass_g']].corr()
-        fig = px.imshow(corr_data, text_auto=True, aspect="auto",
-                       title="Plotly: Interactive Heatmap",
-                       color_continuous_scale='RdBu')
-        html_str = fig.to_html(include_plotlyjs='cdn', div_id="compare_heatmap_plotly")
-        return ui.HTML(html_str)
-
-    # Interactive 탭 그래프
-    @output
-    @render.ui
-    def interactive_3d():
-        fig = px.scatter_3d(penguins, x='bill_length_mm', y='bill_depth_mm', z='flipper_length_mm',
-                           color='species', size='body_mass_g',
-                           title="3D Scatter Plot",
-                           color_discrete_map={"Adelie": "#F8766D", "Chinstrap": "#00BA38", "Gentoo": "#619CFF"})
-        html_str = fig.to_html(include_plotlyjs='cdn', div_id="interactive_3d")
-        return ui.HTML(html_str)
-
-    @output
-    @render.ui
-    def interactive_ts():
-        dates = pd.date_range('2020-01-01', periods=100, freq='D')
-        ts_data = pd.DataFrame({
-            'date': dates,
-            'value': np.cumsum(np.random.randn(100)) + 100,
-            'category': np.random.choice(['A', 'B', 'C'], 100)
-        })
-        fig = px.line(ts_data, x='date', y='value', color='category',
-                     title="Interactive Time Series",
-                     markers=True)
-        fig.update_xaxes(rangeslider_visible=True)
-        html_str = fig.to_html(include_plotlyjs='cdn', div_id="interactive_ts")
-        return ui.HTML(html_str)
-
-    @output
-    @render.ui
-    def interactive_sunburst():
-        # 계층적 데이터 생성
-        hierarchical_data = pd.DataFrame({
-            'ids': ['World', 'World-A', 'World-B', 'World-C', 'World-A-1', 'World-A-2', 'World-B-1', 'World-B-2'],
-            'labels': ['World', 'A', 'B', 'C', 'A1', 'A2', 'B1', 'B2'],
-            'parents': ['', 'World', 'World', 'World', 'World-A', 'World-A', 'World-B', 'World-B'],
-            'values': [100, 40, 35, 25, 20, 20, 18, 17]
-        })
-        fig = px.sunburst(hierarchical_data, ids='ids', labels='labels', parents='parents', values='values',
-                         title="Sunburst Chart")
-        html_str = fig.to_html(include_plotlyjs='cdn', div_id="interactive_sunburst")
-        return ui.HTML(html_str)
-
-    @output
-    @render.ui
-    def interactive_parallel():
-        # 샘플 데이터 선택
-        sample_data = penguins.sample(min(100, len(penguins)))
-        fig = px.parallel_coordinates(sample_data,
-                                     dimensions=['bill_length_mm', 'bill_depth_mm', 'flipper_length_mm', 'body_mass_g'],
-                                     color='body_mass_g',
-                                     title="Parallel Coordinates Plot",
-                                     color_continuous_scale=px.colors.sequential.Viridis)
-        html_str = fig.to_html(include_plotlyjs='cdn', div_id="interactive_parallel")
-        return ui.HTML(html_str)
+    return fig
+
+# Library Comparison - 박스플롯
+@charts.register("plot", tab="Library Comparison", data=(penguin_mass,))
+def compare_box_ggplot():
+    df = filters.view(penguin_mass)
+    if agg.is_large(df):
+        # 대용량 모드: 사분위수는 미리 계산하고 jitter 점은 화면 격자 기준으로 솎아냄
+        points = agg.thin_scatter(df, None, 'body_mass_g', group='species')
+        p = (pn.ggplot(agg.box_stats(df, 'body_mass_g', group='species'), pn.aes(x='species', fill='species'))
+             + pn.geom_boxplot(pn.aes(ymin='ymin', lower='lower', middle='middle', upper='upper', ymax='ymax'),
+                               stat='identity', alpha=0.7)
+             + pn.geom_jitter(pn.aes(y='body_mass_g'), data=points, width=0.2, alpha=0.3))
+    else:
+        p = (pn.ggplot(df, pn.aes(x='species', y='body_mass_g', fill='species'))
+             + pn.geom_boxplot(alpha=0.7)
+             + pn.geom_jitter(width=0.2, alpha=0.3))
+    p = (p
+         + pn.scale_fill_manual(values={"Adelie": "#F8766D", "Chinstrap": "#00BA38", "Gentoo": "#619CFF"})
+         + pn.labs(title="ggplot2: Box Plot", x="Species", y="Body Mass (g)")
+         + pn.theme_minimal())
+    return p
+
+@charts.register("plot", tab="Library Comparison", data=(penguin_mass,))
+def compare_box_seaborn():
+    df = filters.view(penguin_mass)
+    fig, ax = figures.subplots(figsize=(8, 5))
+    sns.boxplot(data=df, x='species', y='body_mass_g', ax=ax, 
+               palette=SPECIES_COLORS)
+    sns.stripplot(data=df, x='species', y='body_mass_g', ax=ax, 
+                 color='black', alpha=0.3, size=3)
+    ax.set_title("Seaborn: Box Plot")
+    ax.set_xlabel("Species")
+    ax.set_ylabel("Body Mass (g)")
+    fig.tight_layout()
+    return fig
+
+@charts.register("plotly", tab="Library Comparison", data=(penguin_mass,))
+def compare_box_plotly():
+    fig = px.box(filters.view(penguin_mass), x='species', y='body_mass_g', color='species',
+                title="Plotly: Interactive Box Plot",
+                color_discrete_map={"Adelie": "#F8766D", "Chinstrap": "#00BA38", "Gentoo": "#619CFF"})
+    return fig
+
+# Library Comparison - 히트맵
+@charts.register("plot", tab="Library Comparison", data=(penguin_numeric,))
+def compare_heatmap_ggplot():
+    corr_data = derived["penguin_corr"]
+    p = (pn.ggplot(corr_data.reset_index().melt(id_vars='index'), 
+                  pn.aes(x='index', y='variable', fill='value'))
+         + pn.geom_tile()
+         + pn.scale_fill_gradient2(low="#FF6B6B", mid="white", high="#4ECDC4", midpoint=0)
+         + pn.labs(title="ggplot2: Heatmap", x="", y="", fill="Correlation")
+         + pn.theme_minimal()
+         + pn.theme(axis_text_x=pn.element_text(angle=45, hjust=1)))
+    return p
+
+@charts.register("plot", tab="Library Comparison", data=(penguin_numeric,))
+def compare_heatmap_seaborn():
+    corr_data = derived["penguin_corr"]
+    fig, ax = figures.subplots(figsize=(8, 6))
+    sns.heatmap(corr_data, annot=True, fmt='.2f', cmap='coolwarm', center=0, ax=ax, square=True)
+    ax.set_title("Seaborn: Heatmap")
+    fig.tight_layout()
+    return fig
+
+@charts.register("plotly", tab="Library Comparison", data=(penguin_numeric,))
+def compare_heatmap_plotly():
+    corr_data = derived["penguin_corr"]
+    fig = px.imshow(corr_data, text_auto=True, aspect="auto",
+                   title="Plotly: Interactive Heatmap",
+                   color_continuous_scale='RdBu')
+    return fig
+
+# Advanced 탭 그래프
+@charts.register("plot", tab="Advanced", data=(penguin_numeric,))
+def plot9():
+    corr_data = derived["penguin_corr"]
+    p = (pn.ggplot(corr_data.reset_index().melt(id_vars='index'), 
+                  pn.aes(x='index', y='variable', fill='value'))
+         + pn.geom_tile()
+         + pn.scale_fill_gradient2(low="#FF6B6B", mid="white", high="#4ECDC4", midpoint=0)
+         + pn.labs(title="Correlation Heatmap", x="", y="", fill="Correlation")
+         + pn.theme_minimal(base_size=12)
+         + pn.theme(axis_text_x=pn.element_text(angle=45, hjust=1)))
+    return p
+
+@charts.register("plot", tab="Advanced", data=(penguin_numeric,))
+def plot10():
+    df = filters.view(penguin_numeric)
+    columns = ['bill_length_mm', 'bill_depth_mm', 'flipper_length_mm', 'body_mass_g']
+    # sns.pairplot(diag_kind='kde') 와 같은 구성. 대각선 KDE 는 공유 엔진에서 변수마다 한 번에 계산
+    present = set(df['species'])
+    hue_order = [species for species in SPECIES_LEVELS if species in present]
+    grid = sns.PairGrid(df[columns + ['species']], hue='species', hue_order=hue_order,
+                        palette={species: SPECIES_CYCLE[species] for species in hue_order}, diag_sharey=False)
+    grid.map_offdiag(sns.scatterplot)
+    grid.map_diag(lambda *args, **kwargs: None)
+    for column, ax in zip(grid.diag_vars, grid.diag_axes):
+        curves = density.curves(df, column, group='species', common_norm=True, **SEABORN)
+        for species, color in zip(grid.hue_names, grid.palette):
+            fill_curve(ax, *curves[species], color=color)
+    grid.add_legend()
+    grid.tight_layout()
+    # figure-level 함수는 pyplot 으로 figure 를 만들므로 pyplot 에서 떼어 내 관리
+    fig = figures.adopt(grid.figure)
+    fig.suptitle("Pair Plot: Variable Relationships", y=1.02)
+    return fig
+
+@charts.preview(plot10)
+def plot10_preview():
+    # 미리보기: 표본 점과 히스토그램(KDE 대신)을 축 하나에 격자로 배치
+    fig, ax = figures.subplots(figsize=(10, 10))
+    preview.scatter_matrix(ax, filters.view(penguin_numeric), ['bill_length_mm', 'bill_depth_mm', 'flipper_length_mm', 'body_mass_g'],
+                           hue='species')
+    fig.suptitle("Pair Plot: Variable Relationships")
+    return fig
+
+@charts.register("plot", tab="Advanced", cache=False, source=ts_source)
+def plot11():
+    # 시계열 데이터 (ts_source 의 현재 구간)
+    ts_data = ts_source.frame(max_points=STREAM_DISPLAY_POINTS)
+    p = (pn.ggplot(ts_data, pn.aes(x='date', y='value', color='category'))
+         + pn.geom_line(size=1.2)
+         + pn.labs(title="Time Series Line Chart", x="Date", y="Value")
+         + pn.theme_minimal(base_size=14))
+    return p
+
+@charts.register("plotly", tab="Advanced", data=(netflix_data,))
+def plot12():
+    fig = px.pie(netflix_data, values='count', names='genre', 
+                 title="Netflix Genre Distribution",
+                 color_discrete_sequence=px.colors.qualitative.Set3)
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    return fig
+
+# Interactive 탭 그래프
+@charts.register("plotly", tab="Interactive", data=(penguin_numeric,))
+def interactive_3d():
+    fig = px.scatter_3d(filters.view(penguin_numeric), x='bill_length_mm', y='bill_depth_mm', z='flipper_length_mm',
+                       color='species', size='body_mass_g',
+                       title="3D Scatter Plot",
+                       color_discrete_map={"Adelie": "#F8766D", "Chinstrap": "#00BA38", "Gentoo": "#619CFF"})
+    return fig
+
+@charts.preview(interactive_3d)
+def interactive_3d_preview():
+    # 미리보기: 표본 점만, 크기 매핑 없이
+    fig = px.scatter_3d(preview.sample(filters.view(penguin_numeric)), x='bill_length_mm', y='bill_depth_mm', z='flipper_length_mm',
+                       color='species', title="3D Scatter Plot",
+                       color_discrete_map={"Adelie": "#F8766D", "Chinstrap": "#00BA38", "Gentoo": "#619CFF"})
+    return fig
+
+@charts.register("plotly", tab="Interactive", cache=False, source=ts_source)
+def interactive_ts():
+    ts_data = ts_source.frame(max_points=STREAM_DISPLAY_POINTS)
+    # 트레이스 순서 = ts_source.series 순서 (점진적 갱신이 트레이스 번호로 이어 붙임)
+    fig = px.line(ts_data, x='date', y='value', color='category',
+                 title="Interactive Time Series",
+                 markers=True, category_orders={'category': ts_source.series})
+    fig.update_xaxes(rangeslider_visible=True)
+    return fig
+
+@charts.register("plotly", tab="Interactive")
+def interactive_sunburst():
+    # 계층적 데이터 생성
+    hierarchical_data = pd.DataFrame({
+        'ids': ['World', 'World-A', 'World-B', 'World-C', 'World-A-1', 'World-A-2', 'World-B-1', 'World-B-2'],
+        'labels': ['World', 'A', 'B', 'C', 'A1', 'A2', 'B1', 'B2'],
+        'parents': ['', 'World', 'World', 'World', 'World-A', 'World-A', 'World-B', 'World-B'],
+        'values': [100, 40, 35, 25, 20, 20, 18, 17]
+    })
+    fig = px.sunburst(hierarchical_data, ids='ids', labels='labels', parents='parents', values='values',
+                     title="Sunburst Chart")
+    return fig
+
+@charts.register("plotly", tab="Interactive", cache=False, data=(penguins,))
+def interactive_parallel():
+    # 샘플 데이터 선택
+    df = filters.view(penguins)
+    sample_data = df.sample(min(100, len(df)))
+    fig = px.parallel_coordinates(sample_data,
+                                 dimensions=['bill_length_mm', 'bill_depth_mm', 'flipper_length_mm', 'body_mass_g'],
+                                 color='body_mass_g',
+                                 title="Parallel Coordinates Plot",
+                                 color_continuous_scale=px.colors.sequential.Viridis)
+    return fig
+
+# 서버 로직
+# 대시보드 카드 버튼 → 이동할 탭
+GOTO_BUTTONS = {
+    "goto_basic": "Basic Charts",
+    "goto_dist": "Distributions",
+    "goto_compare": "Library Comparison",
+    "goto_adv": "Advanced",
+    "goto_inter": "Interactive",
+}
+
+# 탭을 처음 열 때까지 해당 탭의 차트는 렌더링하지 않음 (GALLERY_PREFETCH=0 이면 다음 탭 미리 렌더링 끔)
+PREFETCH_NEXT_TAB = os.environ.get("GALLERY_PREFETCH", "1") != "0"
+
+# GALLERY_RENDER_WORKERS=N 이면 plot / Plotly 차트를 워커 풀에서 렌더링해 끝나는 대로 전송 (기본 0: 세션 안에서 차례로).
+# process 풀의 워커는 앱 모듈 전체(데이터셋, plotnine/seaborn/plotly)를 import 하므로 워커마다 앱 하나만큼 메모리를 더 씀
+scheduler = RenderScheduler(
+    int(os.environ.get("GALLERY_RENDER_WORKERS", 0)),
+    mode=os.environ.get("GALLERY_RENDER_POOL", "process"),
+    app_module=os.path.splitext(os.path.basename(__file__))[0],
+    app_dir=os.path.dirname(os.path.abspath(__file__)),
+)
+
+
+def server(input, output, session):
+    ts_feed.start()
+    tabs = TabActivation(input, session, charts, nav_id="main_nav", initial="Dashboard",
+                         prefetch=PREFETCH_NEXT_TAB, scheduler=scheduler)
+    selection = filters.session(input)
+    for spec in charts:
+        output_for(spec, gate=tabs.gate, scheduler=scheduler, visible=tabs.visible, filters=selection.key)
+    # GALLERY_METRICS=1 일 때 ?diagnostics=1 로 열면 출력별 렌더링 시간 / 캐시 / cProfile 탭 표시
+    diagnostics_server(input, session, charts, nav_id="main_nav")
+
+    def goto(button, tab):
+        @reactive.effect
+        @reactive.event(input[button])
+        def _():
+            ui.update_navset("main_nav", selected=tab)
+
+    for button, tab in GOTO_BUTTONS.items():
+        goto(button, tab)
+
 
 # 앱 실행
 app = App(app_ui, server)
+# /charts/<해시>: plot / Plotly 결과를 캐시 가능한 URL 로 내려 줌 (GALLERY_ARTIFACTS=0 이면 메시지에 직접 실음)
+if ARTIFACTS:
+    serve_artifacts(app)
+# /metrics: 출력별 렌더링 통계. 인증 없이 내부 상태를 보여 주므로 GALLERY_METRICS=1 일 때만 켬
+# (GALLERY_PROFILING=1 이면 /metrics/profile/<id> 추가)
+if METRICS:
+    install_routes(app, charts)
+
+# GALLERY_SHARED_CACHE=<디렉터리>: 같은 호스트의 앱 프로세스끼리 렌더 결과 공유 (python -m gallery.serve 가 설정)
+# 앱 소스가 바뀌면 다른 키를 쓰므로 이전 배포의 결과와 섞이지 않음
+attach_shared_store(namespace=source_hash(sys.modules[__name__]))
+
+# GALLERY_PRELOAD_BACKENDS=1: 첫 요청 지연 대신 시작 시간을 쓰고 싶을 때 (워커 미리 데우기)
+if os.environ.get("GALLERY_PRELOAD_BACKENDS") == "1":
+    backends.preload()
+# GALLERY_PRERENDERED=<디렉터리>: python -m gallery.export 로 미리 렌더링한 결과를 캐시에 올림
+if os.environ.get("GALLERY_PRERENDERED"):
+    from gallery.export import load_prerendered
+
+    with startup.timed("data", "prerendered"):
+        load_prerendered(os.environ["GALLERY_PRERENDERED"], charts, sys.modules[__name__])
+# GALLERY_STARTUP_REPORT=1: import / 데이터 준비 / 백엔드 로딩 시간 출력
+if os.environ.get("GALLERY_STARTUP_REPORT") == "1":
+    print(startup.report(), file=sys.stderr)
 
 if __name__ == "__main__":
     app.run()
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from gallery import aggregate
+
+
+@pytest.fixture
+def groups():
+    rng = np.random.default_rng(1)
+    return pd.DataFrame({
+        "x": np.concatenate([rng.normal(0, 1, 300), rng.normal(4, 0.5, 120), rng.gamma(2, 1, 200) + 6]),
+        "y": rng.normal(size=620),
+        "g": ["a"] * 300 + ["b"] * 120 + ["c"] * 200,
+    })
+
+
+def test_histogram_counts_every_finite_row(groups):
+    df = groups.copy()
+    df.loc[[0, 5], "x"] = np.nan
+    out = aggregate.histogram(df, "x", group="g", bins=30)
+    assert out.groupby("g")["count"].sum().to_dict() == {"a": 298, "b": 120, "c": 200}
+    # 모든 그룹이 같은 구간 경계
+    assert out.groupby("g")["xmin"].apply(list).map(tuple).nunique() == 1
+
+
+def test_histogram_matches_numpy(groups):
+    out = aggregate.histogram(groups, "x", bins=20)
+    edges = aggregate.histogram_edges(groups["x"].to_numpy(), 20)
+    expected, _ = np.histogram(groups["x"], bins=edges)
+    assert out["count"].tolist() == expected.tolist()
+    # plotnine 처럼 양 끝 구간의 중심이 최솟값/최댓값
+    assert out["x"].iloc[0] == pytest.approx(groups["x"].min())
+    assert out["x"].iloc[-1] == pytest.approx(groups["x"].max())
+
+
+def test_histogram_constant_column():
+    out = aggregate.histogram(pd.DataFrame({"x": [2.0, 2.0]}), "x", bins=10)
+    assert out["count"].tolist() == [2]
+
+
+def test_kde_matches_gaussian_kde_with_nrd0_bandwidth(groups):
+    out = aggregate.kde(groups, "x", group="g")
+    for label, curve in out.groupby("g"):
+        values = groups.loc[groups["g"] == label, "x"].to_numpy()
+        bw = aggregate.bandwidth_nrd0(values)
+        reference = stats.gaussian_kde(values, bw_method=bw / values.std(ddof=1))(curve["x"])
+        # 구간 집계 근사: 최댓값의 1% 안
+        assert np.abs(curve["density"] - reference).max() <= 0.01 * reference.max()
+
+
+def test_bandwidth_nrd0_matches_r():
+    # R: bw.nrd0(c(1, 2, 3, 4, 10)) == 0.9 * min(sd, IQR/1.34) * 5^-0.2
+    values = np.array([1.0, 2.0, 3.0, 4.0, 10.0])
+    assert aggregate.bandwidth_nrd0(values) == pytest.approx(0.9 * (2.0 / 1.34) * 5 ** -0.2)
+
+
+def test_kde_trim_stays_inside_group_range(groups):
+    out = aggregate.kde(groups, "x", group="g", trim=True)
+    for label, curve in out.groupby("g"):
+        values = groups.loc[groups["g"] == label, "x"]
+        assert curve["x"].min() == pytest.approx(values.min())
+        assert curve["x"].max() == pytest.approx(values.max())
+    assert out["scaled"].max() == pytest.approx(1.0)
+
+
+def test_box_stats_matches_pandas(groups):
+    out = aggregate.box_stats(groups, "x", group="g").set_index("g")
+    for label, values in groups.groupby("g")["x"]:
+        q1, q2, q3 = values.quantile([0.25, 0.5, 0.75])
+        inside = values[(values >= q1 - 1.5 * (q3 - q1)) & (values <= q3 + 1.5 * (q3 - q1))]
+        row = out.loc[label]
+        assert (row["lower"], row["middle"], row["upper"]) == pytest.approx((q1, q2, q3))
+        assert (row["ymin"], row["ymax"]) == pytest.approx((inside.min(), inside.max()))
+        assert row["n"] == len(values)
+
+
+def test_thin_scatter_keeps_one_row_per_cell(groups):
+    big = pd.concat([groups] * 20, ignore_index=True)
+    out = aggregate.thin_scatter(big, "x", "y", group="g", grid=(10, 10))
+    assert len(out) <= 3 * 100
+    assert list(out.columns) == list(big.columns)
+    # 같은 행을 20번 반복했으므로 남은 점은 원본 점 수를 넘지 않음
+    assert len(out) <= len(groups)
+    assert out.index.is_monotonic_increasing
+
+
+def test_linear_fit_matches_least_squares(groups):
+    out = aggregate.linear_fit(groups, "x", "y", group="g", n=5)
+    for label, curve in out.groupby("g"):
+        sub = groups[groups["g"] == label]
+        slope, intercept = np.polyfit(sub["x"], sub["y"], 1)
+        np.testing.assert_allclose(curve["y"], intercept + slope * curve["x"], rtol=1e-9, atol=1e-9)
+        assert np.all(curve["ymin"] < curve["y"]) and np.all(curve["y"] < curve["ymax"])
@@ -0,0 +1,184 @@
+import base64
+import gzip
+
+import pytest
+from starlette.requests import Request
+
+from gallery import artifacts as artifacts_module
+from gallery.artifacts import CACHE_CONTROL, ArtifactStore
+
+SVG = b"<svg xmlns='http://www.w3.org/2000/svg'>" + b"<rect width='1' height='1'/>" * 100 + b"</svg>"
+
+
+def _request(**headers):
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+def _name(url):
+    return url[len(artifacts_module.PREFIX):]
+
+
+@pytest.fixture
+def store():
+    return ArtifactStore(max_bytes=1024 * 1024)
+
+
+def test_put_is_content_addressed(store):
+    first = store.put(b"png bytes", "png")
+    assert first.startswith("charts/") and first.endswith(".png")
+    assert store.put(b"png bytes", "png") == first
+    assert store.put(b"other bytes", "png") != first
+    assert store.stats()["published"] == 2
+
+
+def test_response_sets_immutable_cache_headers(store):
+    url = store.put(b"png bytes", "png")
+    response = store.response(_request(), _name(url))
+    assert response.status_code == 200
+    assert response.body == b"png bytes"
+    assert response.media_type == "image/png"
+    assert response.headers["cache-control"] == CACHE_CONTROL
+    assert response.headers["etag"] == f'"{_name(url).split(".")[0]}"'
+
+
+@pytest.mark.parametrize("weak", [False, True])
+def test_matching_etag_is_not_modified(store, weak):
+    url = store.put(b"png bytes", "png")
+    etag = store.response(_request(), _name(url)).headers["etag"]
+    response = store.response(_request(if_none_match=("W/" if weak else "") + etag), _name(url))
+    assert response.status_code == 304
+    assert response.body == b""
+    assert store.stats()["not_modified"] == 1
+
+
+def test_unknown_or_wrong_extension_is_404(store):
+    url = store.put(b"png bytes", "png")
+    assert store.response(_request(), "0" * 24 + ".png").status_code == 404
+    assert store.response(_request(), _name(url).replace(".png", ".svg")).status_code == 404
+
+
+def test_gzip_when_accepted(store):
+    url = store.put(SVG, "svg")
+    response = store.response(_request(accept_encoding="gzip, deflate"), _name(url))
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert gzip.decompress(response.body) == SVG
+
+
+@pytest.mark.parametrize("accept", ["", "deflate", "gzip;q=0", "br;q=0.0"])
+def test_identity_when_encoding_not_accepted(store, accept):
+    url = store.put(SVG, "svg")
+    response = store.response(_request(accept_encoding=accept), _name(url))
+    assert "content-encoding" not in response.headers
+    assert response.body == SVG
+
+
+def test_small_and_png_bodies_are_not_compressed(store):
+    small = store.put(b"{}", "json")
+    png = store.put(SVG, "png")
+    for url in (small, png):
+        response = store.response(_request(accept_encoding="gzip"), _name(url))
+        assert "content-encoding" not in response.headers
+
+
+class _FakeBrotli:
+    @staticmethod
+    def compress(data, quality):
+        return b"br:" + data
+
+
+def test_brotli_preferred_when_available(store, monkeypatch):
+    monkeypatch.setattr(artifacts_module, "brotli", _FakeBrotli)
+    url = store.put(SVG, "svg")
+    response = store.response(_request(accept_encoding="gzip, br"), _name(url))
+    assert response.headers["content-encoding"] == "br"
+    assert response.body == b"br:" + SVG
+    # br 을 받지 않는 클라이언트는 gzip
+    response = store.response(_request(accept_encoding="gzip"), _name(url))
+    assert response.headers["content-encoding"] == "gzip"
+
+
+@pytest.mark.skipif(artifacts_module.brotli is None, reason="brotli not installed")
+def test_brotli_round_trip(store):
+    url = store.put(SVG, "svg")
+    response = store.response(_request(accept_encoding="br"), _name(url))
+    assert artifacts_module.brotli.decompress(response.body) == SVG
+
+
+def test_byte_budget_evicts_oldest():
+    store = ArtifactStore(max_bytes=250)
+    urls = [store.put(bytes([i]) * 100, "png") for i in range(3)]
+    assert store.get(_name(urls[0]).split(".")[0]) is None
+    assert store.response(_request(), _name(urls[2])).status_code == 200
+
+
+def test_shared_directory_serves_other_processes(tmp_path):
+    writer = ArtifactStore(directory=str(tmp_path))
+    url = writer.put(SVG, "svg")
+    reader = ArtifactStore(directory=str(tmp_path))
+    response = reader.response(_request(accept_encoding="gzip"), _name(url))
+    assert gzip.decompress(response.body) == SVG
+    assert reader.stats()["disk_hits"] == 1
+
+
+def test_image_replaces_data_uri_with_url(store):
+    value = {"src": "data:image/png;base64," + base64.b64encode(b"png bytes").decode(), "width": 10}
+    published = store.image(value)
+    assert published["width"] == 10 and published["src"].startswith("charts/")
+    # 같은 값은 다시 해시하지 않음
+    assert store.image(value) is published
+    assert store.image({"src": "charts/abc.png"}) == {"src": "charts/abc.png"}
+
+
+def test_plotly_publishes_figure_and_template(store):
+    value = {"figure": {"data": []}, "template_id": "t1", "template": {"layout": {}}}
+    published = store.plotly(value)
+    assert published["template_id"] == "t1"
+    assert store.response(_request(), _name(published["url"])).body == b'{"data":[]}'
+    assert store.response(_request(), _name(published["template_url"])).body == b'{"layout":{}}'
+    assert store.plotly({**value, "template": None})["template_url"] is None
+
+
+def test_pinned_artifacts_survive_eviction():
+    store = ArtifactStore(max_bytes=250)
+    sent = store.put(b"a" * 100, "png")
+    store.pin(("session", "plot1"), [sent])
+    for i in range(3):
+        store.put(bytes([i]) * 100, "png")
+    assert store.response(_request(), _name(sent)).status_code == 200
+    # 같은 출력에 새 결과를 보내면 이전 것은 풀림
+    store.pin(("session", "plot1"), [store.put(b"b" * 100, "png")])
+    store.put(b"c" * 100, "png")
+    assert store.response(_request(), _name(sent)).status_code == 404
+
+
+def test_release_unpins_a_session():
+    store = ArtifactStore(max_bytes=250)
+    value = {"src": "data:image/png;base64," + base64.b64encode(b"a" * 100).decode()}
+    url = store.image(value, ("s1", "plot1"))["src"]
+    store.image(value, ("s2", "plot1"))
+    store.release("s1")
+    for i in range(3):
+        store.put(bytes([i]) * 100, "png")
+    # 다른 세션이 아직 고정하고 있음
+    assert store.response(_request(), _name(url)).status_code == 200
+    store.release("s2")
+    # 방금 받아 간 것이라 가장 최근 항목이므로 두 개를 더 넣어야 밀려남
+    store.put(b"d" * 100, "png")
+    store.put(b"e" * 100, "png")
+    assert store.response(_request(), _name(url)).status_code == 404
+    assert store.stats()["pinned"] == 0
+
+
+def test_plotly_figure_and_template_both_survive_a_tiny_budget():
+    store = ArtifactStore(max_bytes=0)
+    value = {"figure": {"data": [1] * 100}, "template_id": "t1", "template": {"layout": [2] * 100}}
+    published = store.plotly(value, ("session", "plotly1"))
+    store.put(b"other", "png")
+    for url in (published["url"], published["template_url"]):
+        assert store.response(_request(), _name(url)).status_code == 200
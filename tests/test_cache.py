@@ -0,0 +1,58 @@
+import pandas as pd
+
+from gallery.cache import RenderCache, data_fingerprint, frame_fingerprint
+
+
+def test_render_cache_evicts_least_recently_used():
+    cache = RenderCache(max_entries=2, max_bytes=1000)
+    cache.put("a", 1, 10)
+    cache.put("b", 2, 10)
+    # "a" 를 최근에 쓴 것으로 만들면 "b" 가 밀려남
+    assert cache.get("a") == 1
+    cache.put("c", 3, 10)
+    assert "b" not in cache
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_render_cache_byte_budget():
+    cache = RenderCache(max_entries=100, max_bytes=100)
+    for key in "abcd":
+        cache.put(key, key, 30)
+    # 120 바이트 > 100 이라 가장 오래된 "a" 만 밀려남
+    assert "a" not in cache
+    assert [key for key in "bcd" if key in cache] == ["b", "c", "d"]
+    assert cache.stats()["bytes"] == 90
+
+
+def test_render_cache_replacing_key_updates_bytes():
+    cache = RenderCache(max_entries=10, max_bytes=100)
+    cache.put("a", 1, 60)
+    cache.put("a", 2, 20)
+    assert cache.get("a") == 2
+    assert cache.stats()["bytes"] == 20
+
+
+def test_render_cache_skips_entries_larger_than_budget():
+    cache = RenderCache(max_entries=10, max_bytes=100)
+    cache.put("small", 1, 50)
+    cache.put("huge", 2, 101)
+    assert "huge" not in cache
+    assert cache.get("small") == 1
+
+
+def test_render_cache_counts_hits_and_misses():
+    cache = RenderCache()
+    assert cache.get("missing") is None
+    cache.put("a", 1, 1)
+    cache.get("a")
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_frame_fingerprint_follows_content():
+    df = pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+    same = df.copy()
+    assert frame_fingerprint(df) == frame_fingerprint(same)
+    assert frame_fingerprint(df) != frame_fingerprint(df.assign(a=[1, 2, 4]))
+    assert data_fingerprint(df, same) != data_fingerprint(df)
@@ -0,0 +1,142 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from gallery.crossfilter import CrossFilter, EmptySelection, _Categorical, _Range, applied
+
+
+def _rows(dim, condition):
+    return np.flatnonzero(np.unpackbits(dim.mask(condition), count=dim.rows)).tolist()
+
+
+def _categorical(values):
+    dim = _Categorical("species", "penguins", "species", "Species", "filter_species")
+    dim.build(np.asarray(values, dtype=object))
+    return dim
+
+
+def _range(values):
+    dim = _Range("price", "houses", "price", "Price", "filter_price")
+    dim.build(np.asarray(values, dtype=float))
+    return dim
+
+
+def test_categorical_mask_selects_chosen_labels():
+    dim = _categorical(["b", "a", "c", "a", None, "b", "c", "a", "b"])
+    assert dim.labels == ["a", "b", "c"]
+    assert _rows(dim, ("a",)) == [1, 3, 7]
+    assert _rows(dim, ("a", "c")) == [1, 2, 3, 6, 7]
+
+
+def test_categorical_empty_selection_is_all_zero():
+    dim = _categorical(["a", "b", "a"])
+    mask = dim.mask(())
+    assert mask.dtype == np.uint8 and len(mask) == 1
+    assert _rows(dim, ()) == []
+
+
+def test_categorical_normalize():
+    dim = _categorical(["a", "b", "c"])
+    # 전부 고르면 필터 없음
+    assert dim.normalize(["c", "a", "b"]) is None
+    assert dim.normalize(["c", "a"]) == ("a", "c")
+    assert dim.normalize([]) == ()
+    assert dim.normalize(None) == ()
+
+
+def test_categorical_missing_values_never_selected():
+    dim = _categorical([None, "a", np.nan])
+    assert _rows(dim, ("a",)) == [1]
+
+
+def test_range_mask_is_inclusive():
+    dim = _range([5.0, 1.0, 3.0, 3.0, 9.0, 7.0])
+    assert _rows(dim, (3.0, 7.0)) == [0, 2, 3, 5]
+    assert _rows(dim, (9.0, 9.0)) == [4]
+
+
+def test_range_empty_selection():
+    dim = _range([5.0, 1.0, 3.0])
+    # 점이 없는 구간, 뒤집힌 구간
+    assert _rows(dim, (3.5, 4.5)) == []
+    assert _rows(dim, (5.0, 1.0)) == []
+
+
+def test_range_excludes_nan():
+    dim = _range([np.nan, 2.0, np.nan, 4.0])
+    assert dim.bounds == (2, 4)
+    assert _rows(dim, (0.0, 10.0)) == [1, 3]
+
+
+def test_range_bounds_and_normalize():
+    dim = _range([1.5, 9.2])
+    assert dim.bounds == (1, 10)
+    assert dim.normalize((1, 10)) is None
+    assert dim.normalize((0, 11)) is None
+    assert dim.normalize((2, 10)) == (2.0, 10.0)
+
+
+def test_range_mask_many_rows_matches_boolean_filter():
+    values = np.random.default_rng(0).normal(size=1001)
+    dim = _range(values)
+    expected = np.flatnonzero((values >= -0.5) & (values <= 0.25)).tolist()
+    assert _rows(dim, (-0.5, 0.25)) == expected
+
+
+class _Datasets:
+    def __init__(self, **frames):
+        self.frames = frames
+
+    def load(self, name):
+        return self.frames[name]
+
+    def owner(self, frame):
+        for name, df in self.frames.items():
+            if df is frame:
+                return name
+        return None
+
+
+@pytest.fixture
+def penguins():
+    return pd.DataFrame({
+        "species": ["Adelie", "Gentoo", "Adelie", "Chinstrap", "Gentoo"],
+        "mass": [3700.0, 5000.0, 3400.0, 3800.0, 5500.0],
+    })
+
+
+@pytest.fixture
+def filters(penguins):
+    filters = CrossFilter(_Datasets(penguins=penguins))
+    filters.categorical("penguins", "species")
+    filters.range("penguins", "mass")
+    return filters
+
+
+def test_rows_intersects_dimensions(filters):
+    state = filters.normalize("penguins", {"species": ["Adelie", "Gentoo"], "mass": (3500, 5200)})
+    assert state == (("species", ("Adelie", "Gentoo")), ("mass", (3500.0, 5200.0)))
+    assert filters.rows("penguins", state).tolist() == [0, 1]
+    assert filters.rows("penguins", ()) is None
+
+
+def test_rows_are_cached(filters):
+    state = (("species", ("Gentoo",)),)
+    first = filters.rows("penguins", state)
+    assert filters.rows("penguins", state) is first
+    assert not first.flags.writeable
+    assert (filters.computations, filters.hits) == (1, 1)
+
+
+def test_view_applies_current_state(filters, penguins):
+    assert filters.view(penguins) is penguins
+    with applied((("penguins", (("species", ("Gentoo",)),)),)):
+        view = filters.view(penguins)
+        assert view["species"].tolist() == ["Gentoo", "Gentoo"]
+        assert filters.view(penguins) is view
+
+
+def test_view_empty_selection_raises(filters, penguins):
+    with applied((("penguins", (("species", ()),)),)):
+        with pytest.raises(EmptySelection):
+            filters.view(penguins)
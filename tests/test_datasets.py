@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from gallery.datasets import DatasetRegistry
+
+FRAME = pd.DataFrame({
+    "species": ["Adelie", "Gentoo", None, "Chinstrap"],
+    "mass": [3700.0, 5000.0, np.nan, 3800.0],
+    "year": [2007, 2008, 2009, 2009],
+})
+
+
+def _registry(directory=None, calls=None):
+    registry = DatasetRegistry(directory)
+
+    @registry.define("penguins")
+    def build():
+        if calls is not None:
+            calls.append(1)
+        return FRAME.copy()
+
+    return registry
+
+
+def test_builder_runs_once():
+    calls = []
+    registry = _registry(calls=calls)
+    assert registry.load("penguins") is registry.load("penguins")
+    assert len(calls) == 1
+    assert registry.stats()[0]["source"] == "builder"
+
+
+def test_duplicate_definition_is_rejected():
+    registry = _registry()
+    with pytest.raises(ValueError):
+        registry.define("penguins")(lambda: FRAME)
+
+
+def test_columns_are_projected_once():
+    registry = _registry()
+    view = registry.columns("penguins", ["mass", "year"])
+    assert list(view.columns) == ["mass", "year"]
+    assert registry.columns("penguins", ("mass", "year")) is view
+    assert registry.owner(view) == "penguins"
+    assert registry.owner(registry.load("penguins")) == "penguins"
+    assert registry.owner(FRAME) is None
+
+
+def test_arrow_file_is_memory_mapped(tmp_path):
+    _registry().export(str(tmp_path))
+    calls = []
+    registry = _registry(str(tmp_path), calls)
+    frame = registry.load("penguins")
+    assert calls == []
+    pd.testing.assert_frame_equal(frame, FRAME)
+    stats = registry.stats()[0]
+    assert stats["memory_mapped"] and stats["source"].endswith("penguins.arrow")
+    # 메모리 맵 버퍼를 그대로 쓰는 수치 열은 읽기 전용
+    assert not frame["mass"].to_numpy().flags.writeable
+
+
+def test_arrow_columns_come_from_the_mapped_table(tmp_path):
+    _registry().export(str(tmp_path))
+    registry = _registry(str(tmp_path))
+    view = registry.columns("penguins", ["year"])
+    pd.testing.assert_frame_equal(view, FRAME[["year"]])
+    assert registry.stats()[0]["views"] == [["year"]]
+
+
+def test_parquet_file_is_read(tmp_path):
+    FRAME.to_parquet(tmp_path / "penguins.parquet")
+    registry = _registry(str(tmp_path))
+    pd.testing.assert_frame_equal(registry.load("penguins"), FRAME)
+    pd.testing.assert_frame_equal(registry.columns("penguins", ["species"]), FRAME[["species"]])
+    assert not registry.stats()[0]["memory_mapped"]
+
+
+def test_arrow_file_takes_precedence_over_parquet(tmp_path):
+    FRAME.iloc[:1].to_parquet(tmp_path / "penguins.parquet")
+    _registry().export(str(tmp_path))
+    assert len(_registry(str(tmp_path)).load("penguins")) == len(FRAME)
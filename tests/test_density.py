@@ -0,0 +1,102 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import plotnine as pn
+import pytest
+
+from gallery.density import SEABORN, DensityEngine
+
+
+@pytest.fixture
+def groups():
+    rng = np.random.default_rng(1)
+    return pd.DataFrame({
+        "x": np.concatenate([rng.normal(0, 1, 300), rng.normal(4, 0.5, 120), rng.gamma(2, 1, 200) + 6]),
+        "g": ["a"] * 300 + ["b"] * 120 + ["c"] * 200,
+    })
+
+
+def _seaborn_curves(df, **kwargs):
+    import seaborn as sns
+
+    fig, ax = plt.subplots()
+    try:
+        sns.kdeplot(data=df, x="x", ax=ax, **kwargs)
+        return [line.get_xydata() for line in ax.get_lines()]
+    finally:
+        plt.close(fig)
+
+
+def _plotnine_layer(plot):
+    fig = plot.draw()
+    try:
+        return plot.layers[0].data
+    finally:
+        plt.close(fig)
+
+
+def _assert_close(grid, density, x, y, tolerance=0.01):
+    # 같은 격자
+    np.testing.assert_allclose(grid, x, rtol=0, atol=1e-9 * max(1.0, np.abs(x).max()))
+    # 구간 집계 근사: 최댓값의 1% 안
+    assert np.abs(density - y).max() <= tolerance * y.max()
+
+
+def test_kde_matches_geom_density(groups):
+    curves = DensityEngine().curves(groups, "x", group="g")
+    layer = _plotnine_layer(pn.ggplot(groups, pn.aes("x", color="g")) + pn.geom_density())
+    for (label, (grid, density)), (_, reference) in zip(sorted(curves.items()), layer.groupby("group")):
+        _assert_close(grid, density, reference["x"].to_numpy(), reference["density"].to_numpy())
+        assert len(grid) == 1024
+
+
+def test_violin_matches_geom_violin(groups):
+    out = DensityEngine().violin(groups, "x", group="g")
+    layer = _plotnine_layer(pn.ggplot(groups, pn.aes("g", "x")) + pn.geom_violin())
+    for (_, curve), (_, reference) in zip(out.groupby("g"), layer.groupby("group")):
+        _assert_close(curve["y"].to_numpy(), curve["density"].to_numpy(),
+                      reference["y"].to_numpy(), reference["density"].to_numpy())
+        _assert_close(curve["y"].to_numpy(), curve["violinwidth"].to_numpy(),
+                      reference["y"].to_numpy(), reference["violinwidth"].to_numpy())
+
+
+def test_kde_matches_seaborn_single_group(groups):
+    df = groups[groups["g"] == "a"]
+    ((grid, density),) = DensityEngine().curves(df, "x", **SEABORN).values()
+    (reference,) = _seaborn_curves(df)
+    _assert_close(grid, density, reference[:, 0], reference[:, 1])
+
+
+@pytest.mark.parametrize("common_norm", [False, True])
+def test_kde_matches_seaborn_per_group(groups, common_norm):
+    curves = DensityEngine().curves(groups, "x", group="g", common_norm=common_norm, **SEABORN)
+    lines = _seaborn_curves(groups, hue="g", hue_order=["a", "b", "c"], common_norm=common_norm)
+    # seaborn 은 hue 순서의 역순으로 선을 그림
+    for label, reference in zip(["c", "b", "a"], lines):
+        grid, density = curves[label]
+        _assert_close(grid, density, reference[:, 0], reference[:, 1])
+
+
+def test_engine_reuses_curves_per_data_and_options(groups):
+    engine = DensityEngine()
+    first = engine.kde(groups, "x", group="g")
+    assert engine.kde(groups, "x", group="g") is first
+    engine.kde(groups, "x", group="g", **SEABORN)
+    # 내용이 다른 데이터(예: 필터를 적용한 뷰)는 다시 계산
+    engine.kde(groups[groups["x"] > 0], "x", group="g")
+    assert engine.stats() == {"entries": 3, "hits": 1, "computations": 3}
+
+
+def test_engine_evicts_least_recently_used(groups):
+    engine = DensityEngine(max_entries=2)
+    engine.kde(groups, "x")
+    engine.kde(groups, "x", group="g")
+    engine.kde(groups, "x")
+    engine.violin(groups, "x", group="g")
+    assert engine.stats()["entries"] == 2
+    engine.kde(groups, "x")
+    assert engine.stats()["hits"] == 2
@@ -0,0 +1,92 @@
+import pandas as pd
+import pytest
+
+from gallery.derived import DerivedData
+
+
+@pytest.fixture
+def derived():
+    derived = DerivedData()
+    derived.set_source("df", pd.DataFrame({"a": [1.0, 2.0, 3.0], "b": [4.0, 5.0, 6.0], "c": ["x", "y", "x"]}))
+
+    @derived.define("df", columns=["a"])
+    def a_total(df):
+        return df["a"].sum()
+
+    @derived.define("df")
+    def counts(df):
+        return df["c"].value_counts()
+
+    @derived.define("df", columns=["a", "b"])
+    def matrix(df):
+        return df[["a", "b"]].to_numpy()
+
+    return derived
+
+
+def test_aggregates_are_computed_once(derived):
+    assert derived["a_total"] == 6.0
+    first = derived["counts"]
+    assert derived["counts"] is first
+    assert derived["a_total"] == 6.0
+    assert derived.computations == 2
+
+
+def test_unrelated_column_change_keeps_result(derived):
+    derived["a_total"]
+    source = derived.source("df")
+    derived.set_source("df", source.assign(b=[7.0, 8.0, 9.0]))
+    assert derived["a_total"] == 6.0
+    assert derived.computations == 1
+
+
+def test_used_column_change_recomputes(derived):
+    derived["a_total"]
+    derived.set_source("df", derived.source("df").assign(a=[1.0, 2.0, 4.0]))
+    assert derived["a_total"] == 7.0
+    assert derived.computations == 2
+
+
+def test_row_count_change_recomputes(derived):
+    derived["counts"]
+    source = derived.source("df")
+    derived.set_source("df", pd.concat([source, source.iloc[:1]], ignore_index=True))
+    assert derived["counts"]["x"] == 3
+    assert derived.computations == 2
+
+
+def test_without_columns_any_change_recomputes(derived):
+    derived["counts"]
+    derived.set_source("df", derived.source("df").assign(b=[0.0, 0.0, 0.0]))
+    derived["counts"]
+    assert derived.computations == 2
+
+
+def test_array_results_are_read_only(derived):
+    with pytest.raises(ValueError):
+        derived["matrix"][0, 0] = 10
+
+
+def test_view_caches_per_filter_state():
+    states = {"current": ()}
+
+    def view(frame):
+        state = states["current"]
+        return (frame[frame["a"] > 1] if state else frame), state
+
+    derived = DerivedData(view=view, max_filtered=1)
+    derived.set_source("df", pd.DataFrame({"a": [1.0, 2.0, 3.0]}))
+
+    @derived.define("df", columns=["a"])
+    def total(df):
+        return df["a"].sum()
+
+    assert derived["total"] == 6.0
+    states["current"] = (("a", (1.5, 3.0)),)
+    assert derived["total"] == 5.0
+    assert derived["total"] == 5.0
+    assert derived.computations == 2
+    # 걸러지지 않은 결과는 상태별 보관과 따로 유지
+    states["current"] = ()
+    assert derived["total"] == 6.0
+    assert derived.computations == 2
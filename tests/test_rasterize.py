@@ -0,0 +1,74 @@
+import base64
+import io
+
+import numpy as np
+import pandas as pd
+import plotnine as pn
+import pytest
+from PIL import Image
+from shiny.render._try_render_plot import PlotSizeInfo, try_render_plotnine
+
+from gallery import rasterize as rasterize_module
+from gallery.rasterize import PlotnineSkeletons, rasterize
+
+
+def _plot():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"x": rng.normal(size=200), "y": rng.normal(size=200), "g": rng.choice(list("abc"), 200)})
+    return (pn.ggplot(df, pn.aes("x", "y", color="g")) + pn.geom_point() + pn.geom_smooth(method="lm")
+            + pn.facet_wrap("g"))
+
+
+def _reference(obj, width, height, pixelratio):
+    size_info = PlotSizeInfo(
+        container_size_px_fn=(lambda: width, lambda: height),
+        user_specified_size_px=(None, None),
+        pixelratio=pixelratio,
+    )
+    ok, result = try_render_plotnine(obj, plot_size_info=size_info, alt=None)
+    assert ok
+    return dict(result)
+
+
+def _pixels(value):
+    return np.asarray(Image.open(io.BytesIO(base64.b64decode(value["src"].partition(",")[2]))).convert("RGB"))
+
+
+def _assert_same(value, expected):
+    assert (value["width"], value["height"]) == (expected["width"], expected["height"])
+    assert value["coordmap"] == expected["coordmap"]
+    np.testing.assert_array_equal(_pixels(value), _pixels(expected))
+
+
+@pytest.fixture
+def fresh_skeletons(monkeypatch):
+    store = PlotnineSkeletons()
+    monkeypatch.setattr(rasterize_module, "skeletons", store)
+    return store
+
+
+@pytest.mark.parametrize("size", [(640, 400, 1), (500, 300, 2)])
+def test_fast_path_matches_render_plot(size, fresh_skeletons):
+    _assert_same(rasterize(_plot(), *size), _reference(_plot(), *size))
+
+
+def test_skeleton_reuse_matches_render_plot(fresh_skeletons):
+    obj = _plot()
+    for size in [(640, 400, 1), (800, 500, 1), (640, 400, 2)]:
+        _assert_same(rasterize(obj, *size, key="chart"), _reference(obj, *size))
+    assert fresh_skeletons.stats() == {"entries": 1, "hits": 2, "builds": 1}
+
+
+def test_missing_plotnine_internals_disables_fast_path(monkeypatch, fresh_skeletons):
+    monkeypatch.setattr(rasterize_module, "plotnine_internals", lambda: False)
+    _assert_same(rasterize(_plot(), 640, 400, key="chart"), _reference(_plot(), 640, 400, 1))
+    assert fresh_skeletons.stats()["builds"] == 0
+
+
+def test_without_shiny_helpers_plots_are_not_rendered_offline(monkeypatch):
+    from gallery import render
+    from gallery.registry import ChartSpec
+
+    monkeypatch.setattr(render, "RASTERIZE", False)
+    spec = ChartSpec(id="p", kind="plot", fn=_plot, tab="t")
+    assert render.offline_render(spec, (640, 400, 1)) is None
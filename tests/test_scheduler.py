@@ -0,0 +1,60 @@
+import asyncio
+from concurrent.futures.process import BrokenProcessPool
+from types import SimpleNamespace
+
+import pytest
+
+from gallery.scheduler import RenderScheduler
+
+SPEC = SimpleNamespace(id="test_scheduler_chart")
+
+
+def _scheduler(monkeypatch, outcomes):
+    """``outcomes`` 차례대로 결과를 내거나 예외를 던지는 풀을 쓰는 스케줄러."""
+    scheduler = RenderScheduler(1, mode="thread")
+    executors = []
+
+    async def submit(executor, spec, size, filters):
+        executors.append(executor)
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome, {"build": 0.0}
+
+    monkeypatch.setattr(scheduler, "_submit", submit)
+    return scheduler, executors
+
+
+def test_broken_pool_is_rebuilt_and_render_retried(monkeypatch):
+    scheduler, executors = _scheduler(monkeypatch, [BrokenProcessPool("worker died"), {"src": "ok"}])
+    assert asyncio.run(scheduler.render(SPEC)) == {"src": "ok"}
+    assert len(executors) == 2 and executors[0] is not executors[1]
+    assert scheduler._executor is executors[1]
+    scheduler.shutdown()
+
+
+def test_broken_pool_twice_raises_but_next_render_gets_new_pool(monkeypatch):
+    scheduler, executors = _scheduler(
+        monkeypatch, [BrokenProcessPool("a"), BrokenProcessPool("b"), {"src": "ok"}]
+    )
+    with pytest.raises(BrokenProcessPool):
+        asyncio.run(scheduler.render(SPEC))
+    assert scheduler._executor is None
+    assert asyncio.run(scheduler.render(SPEC)) == {"src": "ok"}
+    assert len({id(executor) for executor in executors}) == 3
+    scheduler.shutdown()
+
+
+def test_other_errors_are_not_retried(monkeypatch):
+    scheduler, executors = _scheduler(monkeypatch, [ValueError("bad chart"), {"src": "ok"}])
+    with pytest.raises(ValueError):
+        asyncio.run(scheduler.render(SPEC))
+    assert len(executors) == 1
+    assert scheduler._executor is executors[0]
+    scheduler.shutdown()
+
+
+def test_disabled_without_workers():
+    assert not RenderScheduler(0).enabled
+    with pytest.raises(ValueError):
+        RenderScheduler(2, mode="process")
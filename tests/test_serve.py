@@ -0,0 +1,37 @@
+from gallery.serve import StickyProxy, _sticky_index, _with_cookie
+
+
+class _Worker:
+    def __init__(self, index, alive=True):
+        self.index = index
+        self.alive = alive
+
+
+def test_sticky_index_reads_cookie():
+    head = b"GET / HTTP/1.1\r\nHost: x\r\nCookie: a=1; gallery_worker=2\r\n\r\n"
+    assert _sticky_index(head) == 2
+    assert _sticky_index(b"GET / HTTP/1.1\r\nCookie: gallery_worker=x\r\n\r\n") is None
+    assert _sticky_index(b"GET / HTTP/1.1\r\nHost: x\r\n\r\n") is None
+
+
+def test_with_cookie_adds_header_before_blank_line():
+    head = _with_cookie(b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n", 3)
+    assert head.endswith(b"Set-Cookie: gallery_worker=3; Path=/; HttpOnly; SameSite=Lax\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n")
+
+
+def test_cookieless_clients_are_assigned_by_address():
+    proxy = StickyProxy([_Worker(i) for i in range(4)])
+    # 같은 주소의 동시 연결은 연결 수와 상관없이 같은 워커로
+    assert len({proxy.choose("10.0.0.7").index for _ in range(10)}) == 1
+    assert len({proxy.choose(f"10.0.0.{i}").index for i in range(50)}) > 1
+
+
+def test_dead_worker_is_skipped():
+    workers = [_Worker(i) for i in range(3)]
+    proxy = StickyProxy(workers)
+    chosen = proxy.choose("10.0.0.7")
+    chosen.alive = False
+    other = proxy.choose("10.0.0.7")
+    assert other is not chosen and other.alive
+    assert proxy.choose("10.0.0.7") is other
@@ -0,0 +1,158 @@
+import asyncio
+import multiprocessing
+import os
+import pickle
+import threading
+
+from gallery.cache import RenderCache, SharedStore
+
+
+def test_render_cache_reads_through_shared_store(tmp_path):
+    store = SharedStore(str(tmp_path))
+    writer, reader = RenderCache(), RenderCache()
+    writer.attach(store)
+    reader.attach(store)
+    writer.put(("chart", 1), {"src": "x"}, 10)
+    # 디스크 쓰기는 쓰기 스레드에서
+    writer.flush()
+    assert reader.get(("chart", 1)) == {"src": "x"}
+    # 디스크에서 읽은 값은 메모리에도 올라감
+    reader.attach(None)
+    assert reader.get(("chart", 1)) == {"src": "x"}
+
+
+def test_render_cache_unshared_put_stays_local(tmp_path):
+    store = SharedStore(str(tmp_path))
+    cache = RenderCache()
+    cache.attach(store)
+    cache.put("stream", 1, 1, shared=False)
+    cache.flush()
+    assert "stream" not in store
+
+
+def test_render_cache_aget_reads_store_off_the_loop(tmp_path, monkeypatch):
+    store = SharedStore(str(tmp_path))
+    store.put("k", "value", 5)
+    cache = RenderCache()
+    cache.attach(store)
+    loop_thread = threading.get_ident()
+    threads = []
+    original = store.get
+
+    def get(key):
+        threads.append(threading.get_ident())
+        return original(key)
+
+    monkeypatch.setattr(store, "get", get)
+    assert asyncio.run(cache.aget("k")) == "value"
+    assert asyncio.run(cache.aget("missing")) is None
+    assert threads and loop_thread not in threads
+    # 메모리에 올라간 뒤에는 디스크를 읽지 않음
+    threads.clear()
+    assert asyncio.run(cache.aget("k")) == "value"
+    assert threads == []
+    assert cache.get("missing", shared=False) is None and threads == []
+
+
+def _child_put(directory, namespace):
+    SharedStore(directory, namespace=namespace).put(("chart", "child"), {"src": "from child"}, 10)
+
+
+def test_shared_store_across_processes(tmp_path):
+    ctx = multiprocessing.get_context("spawn")
+    process = ctx.Process(target=_child_put, args=(str(tmp_path), "app"))
+    process.start()
+    process.join(60)
+    assert process.exitcode == 0
+    assert SharedStore(str(tmp_path), namespace="app").get(("chart", "child")) == ({"src": "from child"}, 10)
+
+
+def _tmp_files(directory):
+    return [name for _, _, names in os.walk(directory) for name in names if name.startswith(".tmp-")]
+
+
+def test_shared_store_round_trip_leaves_no_temp_files(tmp_path):
+    store = SharedStore(str(tmp_path))
+    store.put(("a", 1), [1, 2, 3], 24)
+    assert ("a", 1) in store
+    assert store.get(("a", 1)) == ([1, 2, 3], 24)
+    assert _tmp_files(tmp_path) == []
+    assert store.stats()["writes"] == 1
+
+
+def test_shared_store_does_not_overwrite_existing_file(tmp_path):
+    store = SharedStore(str(tmp_path))
+    store.put("k", "first", 5)
+    store.put("k", "second", 6)
+    assert store.get("k") == ("first", 5)
+
+
+def test_shared_store_failed_replace_cleans_up(tmp_path, monkeypatch):
+    store = SharedStore(str(tmp_path))
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail)
+    store.put("k", "value", 5)
+    monkeypatch.undo()
+    # 반쯤 쓴 파일이 보이거나 남지 않음
+    assert "k" not in store
+    assert store.get("k") is None
+    assert _tmp_files(tmp_path) == []
+
+
+def test_shared_store_ignores_unpicklable_values(tmp_path):
+    store = SharedStore(str(tmp_path))
+    store.put("k", lambda: None, 1)
+    assert "k" not in store
+
+
+def test_shared_store_corrupt_file_is_a_miss(tmp_path):
+    store = SharedStore(str(tmp_path))
+    store.put("k", "value", 5)
+    with open(store._path("k"), "wb") as f:
+        f.write(b"not a pickle")
+    assert store.get("k") is None
+    assert store.stats()["misses"] == 1
+
+
+def test_shared_store_namespaces_do_not_mix(tmp_path):
+    SharedStore(str(tmp_path), namespace="v1").put("k", "old", 3)
+    assert SharedStore(str(tmp_path), namespace="v2").get("k") is None
+
+
+def test_shared_store_sweep_removes_oldest_down_to_80_percent(tmp_path):
+    store = SharedStore(str(tmp_path), max_bytes=10_000, sweep_every=1000)
+    size = len(pickle.dumps((1000, b"x" * 1000), protocol=pickle.HIGHEST_PROTOCOL))
+    for i in range(12):
+        store.put(i, b"x" * 1000, 1000)
+        # 파일 시각을 달리해 오래된 순서를 고정
+        os.utime(store._path(i), (i, i))
+    assert store.sweep() > 0
+    remaining = [i for i in range(12) if i in store]
+    assert remaining == list(range(12 - len(remaining), 12))
+    assert len(remaining) * size <= 10_000 * 0.8
+    # 한도 안이면 지우지 않음
+    assert store.sweep() == 0
+
+
+def test_shared_store_sweeps_automatically(tmp_path):
+    store = SharedStore(str(tmp_path), max_bytes=3000, sweep_every=2)
+    for i in range(10):
+        store.put(i, b"x" * 1000, 1000)
+    # 마지막 put 에서 정리되었으므로 한도 안
+    assert store.stats()["bytes"] <= store.max_bytes
+
+
+def test_shared_store_stats_do_not_walk_the_directory(tmp_path, monkeypatch):
+    store = SharedStore(str(tmp_path), max_bytes=10_000, sweep_every=1000)
+    store.put("a", b"x" * 100, 100)
+
+    def walk(*args):
+        raise AssertionError("stats() walked the directory")
+
+    monkeypatch.setattr(store, "_files", walk)
+    stats = store.stats()
+    assert stats["entries"] == 1 and stats["bytes"] > 100
+    assert stats["writes"] == 1
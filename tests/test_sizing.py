@@ -0,0 +1,61 @@
+import asyncio
+
+from shiny import reactive
+
+from gallery import sizing
+from gallery.sizing import DEFAULT_BUCKETS, SizeWatch, _parse_buckets, snap_size
+
+
+def test_parse_buckets():
+    assert _parse_buckets(None) == ()
+    assert _parse_buckets("0") == ()
+    assert _parse_buckets("1") == DEFAULT_BUCKETS
+    assert _parse_buckets("1280, 480,800") == (480, 800, 1280)
+
+
+def test_without_buckets_size_is_unchanged():
+    assert snap_size(613, 401, 1.25, buckets=()) == (613, 401, 1.25)
+    assert snap_size(0, 400, 1, buckets=()) is None
+    assert snap_size(600, None, 1, buckets=()) is None
+
+
+def test_nearby_sizes_share_a_bucket(monkeypatch):
+    monkeypatch.setattr(sizing, "PLOT_FORMAT", "png")
+    buckets = (480, 800, 1280)
+    sizes = {snap_size(width, height, 1, buckets) for width in range(700, 900, 7) for height in range(380, 420, 3)}
+    assert sizes == {(800, 400, 2)}
+    # 너비는 비율로 가장 가까운 기준 너비, 높이는 HEIGHT_STEP 단위 (최소 한 단계)
+    assert snap_size(1000, 10, 1, buckets) == (800, 50, 2)
+    assert snap_size(1050, 430, 1, buckets) == (1280, 450, 2)
+    # pixelratio 는 2 이상 정수로 올림
+    assert snap_size(800, 400, 2.5, buckets) == (800, 400, 3)
+
+
+def test_svg_buckets_ignore_pixelratio(monkeypatch):
+    monkeypatch.setattr(sizing, "PLOT_FORMAT", "svg")
+    assert snap_size(790, 410, 3, (480, 800)) == (800, 400, 1)
+
+
+def test_size_watch_ignores_changes_within_a_bucket(monkeypatch):
+    monkeypatch.setattr(sizing, "PLOT_FORMAT", "png")
+    client = reactive.value((790, 410, 1))
+
+    def read_size():
+        return snap_size(*client(), buckets=(480, 800))
+
+    async def run():
+        watch = SizeWatch(read_size, delay=0)
+        seen = []
+
+        @reactive.effect
+        def _record():
+            seen.append(watch())
+
+        await reactive.flush()
+        client.set((810, 395, 1))
+        await reactive.flush()
+        client.set((500, 395, 1))
+        await reactive.flush()
+        return seen
+
+    assert asyncio.run(run()) == [(800, 400, 2), (480, 400, 2)]
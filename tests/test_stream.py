@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from gallery.stream import TimeSeriesSource, minmax_decimate
+
+
+@pytest.mark.parametrize("n, budget", [(0, 10), (1, 10), (10, 10), (9, 10), (5, None)])
+def test_decimate_keeps_everything_within_budget(n, budget):
+    values = np.arange(n, dtype=float)
+    assert minmax_decimate(values, budget).tolist() == list(range(n))
+
+
+@pytest.mark.parametrize("budget", [4, 5, 7, 10, 11, 999, 1000])
+def test_decimate_respects_budget_and_keeps_extremes(budget):
+    rng = np.random.default_rng(budget)
+    values = rng.standard_normal(3600).cumsum()
+    idx = minmax_decimate(values, budget)
+    assert len(idx) <= budget
+    # 시간 순서, 중복 없음
+    assert np.all(np.diff(idx) > 0)
+    # 첫/끝 점과 전체 최소/최대는 항상 남음
+    assert idx[0] == 0 and idx[-1] == len(values) - 1
+    assert values.argmin() in idx and values.argmax() in idx
+
+
+def test_decimate_keeps_every_bucket_extreme():
+    values = np.zeros(1000)
+    values[[100, 350, 600, 850]] = [5, -5, 7, -7]
+    idx = minmax_decimate(values, 22)
+    assert {100, 350, 600, 850} <= set(idx.tolist())
+
+
+def test_decimate_one_over_budget():
+    values = np.arange(11, dtype=float)
+    idx = minmax_decimate(values, 10)
+    assert len(idx) <= 10
+    assert idx[0] == 0 and idx[-1] == 10
+
+
+def _source(points, capacity):
+    source = TimeSeriesSource(["a", "b"], capacity=capacity)
+    start = pd.Timestamp("2024-01-01")
+    for i in range(points):
+        source.append(start + pd.Timedelta(seconds=i), [i, -i])
+    return source
+
+
+def test_source_window_wraps_in_time_order():
+    source = _source(7, capacity=5)
+    seq, t, values = source.window()
+    assert seq == 7
+    assert values[:, 0].tolist() == [2, 3, 4, 5, 6]
+    assert np.all(np.diff(t) > np.timedelta64(0))
+
+
+def test_source_since():
+    source = _source(7, capacity=5)
+    seq, _, values = source.since(5)
+    assert seq == 7 and values[:, 1].tolist() == [-5, -6]
+    # 이미 밀려난 위치
+    assert source.since(1) is None
+
+
+def test_source_frame_decimates_per_series():
+    source = _source(100, capacity=100)
+    frame = source.frame(max_points=10)
+    assert set(frame["category"]) == {"a", "b"}
+    assert frame.groupby("category").size().max() <= 10